@@ -1,14 +1,21 @@
 """記帳 API 端點"""
 
+import asyncio
+import contextlib
+import json
 import logging
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Query, Depends, HTTPException
+from fastapi import APIRouter, Query, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
+from app.database.engine import SessionLocal
 from app.database.crud import (
     get_user_sheet,
     get_google_token,
@@ -23,6 +30,11 @@ from app.database.crud import (
 from app.models.schemas import (
     AccountingRequest,
     AccountingResponse,
+    AccountingRecord,
+    BatchRecordRequest,
+    BatchRecordResponse,
+    BatchRecordResult,
+    FeedbackResponse,
     QueryRequest,
     QueryResponse,
     StatsResponse,
@@ -36,15 +48,57 @@ from app.models.schemas import (
     DailyTrend,
     BudgetStatus,
 )
-from app.services.openai_service import openai_service
+from app.services.feedback_tasks import feedback_tasks
+from app.services.openai_service import OpenAIServiceError, openai_service
 from app.services.user_sheets_service import create_user_sheets_service
+from app.services.write_behind_queue import sheet_write_queue
+from app.services.ledger_mirror import LedgerMirror
+from app.services.knowledge_cache import knowledge_cache
+from app.services.ledger_tools import LedgerTools
+from app.services.monthly_aggregates import MonthlyAggregateStore
+from app.services.parse_cache import parse_cache
+from app.services.prompt_cache_metrics import prompt_cache_metrics
 from app.services.oauth_service import oauth_service
 from app.utils.categories import DEFAULT_CATEGORIES
+from app.utils.query_intent import (
+    CONTEXT_MULTI_MONTH,
+    CONTEXT_RECENT,
+    CONTEXT_STATS,
+    INTENT_CONTEXT,
+    INTENT_KNOWLEDGE,
+    INTENT_UNKNOWN,
+    classify_query,
+)
+from app.utils.query_scope import (
+    MAX_RECENT_MONTHS,
+    QueryScope,
+    extract_query_scope,
+    months_between,
+)
+from app.utils.quick_answer import (
+    KIND_BUDGET,
+    parse_numeric_question,
+    render_numeric_answer,
+)
+from app.utils.quick_parser import quick_parse_many
 from app.utils.auth import get_current_user_optional
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# 回應標頭：本次請求呼叫 Google API 的次數
+UPSTREAM_CALLS_HEADER = "X-Sheets-Upstream-Calls"
+
+
+def set_upstream_calls_header(response: Response, sheets_service) -> None:
+    """在回應標頭中記錄本次請求呼叫 Google Sheets / Drive API 的次數"""
+    response.headers[UPSTREAM_CALLS_HEADER] = _upstream_calls(sheets_service)
+
+
+def _upstream_calls(sheets_service) -> str:
+    """本次請求呼叫 Google API 的次數（未使用 Sheets 服務時為 0）"""
+    return str(sheets_service.client.call_count if sheets_service else 0)
+
 
 async def get_sheets_service_for_user(
     current_user: Optional[dict],
@@ -119,13 +173,79 @@ async def get_sheets_service_for_user(
         refresh_token=google_token.refresh_token,
         expires_at=google_token.expires_at,
     )
+    if settings.LEDGER_MIRROR_ENABLED:
+        sheets_service.mirror = LedgerMirror(db, user_id, user_sheet.sheet_id)
+    if settings.MONTHLY_AGGREGATES_ENABLED:
+        sheets_service.aggregates = MonthlyAggregateStore(
+            db, user_id, user_sheet.sheet_id
+        )
 
     return sheets_service, user_sheet.sheet_id
 
 
+async def _parse_utterance(
+    user_id: str,
+    text: str,
+    db: Session,
+    now: Optional[datetime] = None,
+    llm_limit: Optional[asyncio.Semaphore] = None,
+) -> Tuple[List[AccountingRecord], str]:
+    """
+    解析記帳文字（常見語句以規則解析，重複語句使用快取，其餘使用 LLM）
+
+    Args:
+        user_id: 用戶 ID
+        text: 記帳文字
+        db: 資料庫 Session
+        now: 記帳時間（預設為現在）
+        llm_limit: 限制同時呼叫 LLM 的數量（批次記帳使用）
+
+    Returns:
+        (記錄列表, 解析路徑)
+    """
+    if settings.FAST_PARSER_ENABLED:
+        records = quick_parse_many(text, now)
+        if records is not None:
+            return records, "rule"
+    if settings.PARSE_CACHE_ENABLED:
+        records = parse_cache.get(user_id, text, db=db, now=now)
+        if records is not None:
+            return records, "cache"
+
+    async with llm_limit or contextlib.nullcontext():
+        records = await openai_service.parse_accounting_records(text, now=now)
+    if settings.PARSE_CACHE_ENABLED:
+        parse_cache.put(user_id, text, records, db=db)
+    return records, "llm"
+
+
+async def _generate_record_feedback(
+    user_sheets_service, sheet_id: str, records: List[AccountingRecord]
+) -> Optional[str]:
+    """
+    取得當月統計並生成理財回饋
+
+    回饋超過等待期限時在回應送出後才完成，請求的 db Session 已關閉，
+    因此讀取鏡像與月度統計時改用自己的 Session。
+    """
+    with SessionLocal() as session:
+        user_sheets_service.bind_session(session)
+        stats = await user_sheets_service.get_monthly_stats(sheet_id)
+    return await openai_service.generate_feedback(records, stats)
+
+
+def _record_message(records: List[AccountingRecord]) -> str:
+    """記帳完成訊息"""
+    items = "、".join(f"{r.名稱} {r.花費}{r.幣別}" for r in records)
+    if len(records) == 1:
+        return f"已記錄：{items}"
+    return f"已記錄 {len(records)} 筆：{items}"
+
+
 @router.post("/record", response_model=AccountingResponse)
 async def record_accounting(
     request: AccountingRequest,
+    response: Response,
     current_user: Optional[dict] = Depends(get_current_user_optional),
     db: Session = Depends(get_db),
 ):
@@ -133,171 +253,632 @@ async def record_accounting(
     記帳端點
 
     接收語音轉文字內容，使用 LLM 解析後寫入用戶專屬的 Google Sheet。
+    一句話可包含多筆消費（例如「早餐蛋餅45，午餐便當120」），
+    所有記錄依月份分頁批次寫入，回應中的 records 列出每一筆。
 
     需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
 
     使用條件：
     - 必須登入或使用已綁定用戶的 API Token
     - 必須已建立或連結 Google Sheet
+
+    理財回饋最多等待 feedback_deadline 秒；逾時則 feedback_status 為 pending，
+    可透過 GET /record/{record_id}/feedback 取得（record_id 為第一筆記錄的 ID）。
     """
     if not current_user:
         raise HTTPException(status_code=401, detail="需要認證")
 
     logger.info(f"Recording: {request.text}")
 
-    # 1. 使用 LLM 解析記帳文字
-    record = await openai_service.parse_accounting_text(request.text)
+    # 1. 解析記帳文字（常見語句以規則解析，重複語句使用快取，其餘使用 LLM）
+    user_id = current_user["user_id"]
+    records, parse_path = await _parse_utterance(user_id, request.text, db)
+    logger.info(f"Parsed {len(records)} record(s) via {parse_path}: {records}")
 
     # 2. 取得用戶的 Sheets 服務（會驗證所有必要條件）
     user_sheets_service, sheet_id = await get_sheets_service_for_user(current_user, db)
 
-    # 3. 寫入用戶專屬的 Google Sheet
-    await user_sheets_service.write_record(sheet_id, record)
-    logger.info(f"Written to user sheet: {sheet_id}")
-
-    # 4. 取得統計資料並生成理財回饋
-    try:
-        stats = await user_sheets_service.get_monthly_stats(sheet_id)
-        feedback = await openai_service.generate_feedback(record, stats)
-    except Exception as e:
-        logger.warning(f"Failed to generate feedback: {e}")
-        feedback = None
+    # 3. 寫入用戶專屬的 Google Sheet（write-behind 模式下先排入佇列，
+    #    本地鏡像與統計立即反映佇列中的記錄，寫入失敗時由佇列重試）
+    record_ids = [uuid.uuid4().hex for _ in records]
+    record_id = record_ids[0]
+    queued = settings.SHEETS_WRITE_BEHIND_ENABLED
+    if queued:
+        for record, queued_id in zip(records, record_ids):
+            await sheet_write_queue.enqueue(
+                user_id,
+                sheet_id,
+                record,
+                record_id=queued_id,
+            )
+            user_sheets_service.apply_local_write(sheet_id, record)
+    else:
+        await user_sheets_service.write_records(sheet_id, records)
+        logger.info(f"Written to user sheet: {sheet_id}")
+
+    # 4. 在背景生成理財回饋，最多等待期限內的結果
+    deadline = (
+        request.feedback_deadline
+        if request.feedback_deadline is not None
+        else settings.FEEDBACK_DEADLINE_SECONDS
+    )
+    feedback_tasks.start(
+        record_id,
+        user_id,
+        _generate_record_feedback(user_sheets_service, sheet_id, records),
+    )
+    feedback_status, feedback = await feedback_tasks.wait(record_id, deadline)
 
     # 5. 回傳結果
+    set_upstream_calls_header(response, user_sheets_service)
     return AccountingResponse(
         success=True,
-        record=record,
-        message=f"已記錄：{record.名稱} {record.花費}{record.幣別}",
+        record=records[0],
+        records=records,
+        message=_record_message(records),
         feedback=feedback,
+        record_id=record_id,
+        record_ids=record_ids,
+        queued=queued,
+        parse_path=parse_path,
+        feedback_status=feedback_status,
     )
 
 
-@router.get("/stats", response_model=StatsResponse)
-async def get_stats(
-    month: Optional[str] = Query(None, description="月份，格式：YYYY-MM"),
+def _client_time(recorded_at: Optional[str], tz: ZoneInfo) -> Optional[datetime]:
+    """解析用戶端記錄時間（有時區時轉換為用戶時區的當地時間）"""
+    if not recorded_at:
+        return None
+    value = datetime.fromisoformat(recorded_at.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(tz).replace(tzinfo=None)
+    return value
+
+
+@router.post("/records/batch", response_model=BatchRecordResponse)
+async def record_accounting_batch(
+    request: BatchRecordRequest,
+    response: Response,
     current_user: Optional[dict] = Depends(get_current_user_optional),
     db: Session = Depends(get_db),
 ):
     """
-    取得月度統計資料
+    批次記帳端點（離線佇列補傳）
 
-    如果未指定月份，則回傳當月統計
+    每個項目為原始語句（text，可附 recorded_at）或已結構化的記錄（record）。
+    語句以有限並行數同時解析，所有記錄依月份分頁合併，每個分頁只 append 一次。
+    回應中的 results 依項目順序列出各自的結果。
 
     需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
     """
     if not current_user:
         raise HTTPException(status_code=401, detail="需要認證")
+    if len(request.items) > settings.BATCH_RECORD_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"單次最多 {settings.BATCH_RECORD_MAX_ITEMS} 筆",
+        )
 
-    logger.info(f"Getting stats for month: {month or 'current'}")
+    logger.info(f"Batch recording: {len(request.items)} item(s)")
 
-    # 取得用戶的 Sheets 服務
+    # 先確認 Sheet 可寫入，避免白白解析
     user_sheets_service, sheet_id = await get_sheets_service_for_user(current_user, db)
-    stats = await user_sheets_service.get_monthly_stats(sheet_id, month)
+    user_id = current_user["user_id"]
+    _, tz = _user_timezone(db, user_id)
+    llm_limit = asyncio.Semaphore(settings.BATCH_PARSE_CONCURRENCY)
+
+    async def parse_item(item) -> Tuple[List[AccountingRecord], str]:
+        if item.record is not None:
+            return [item.record], "structured"
+        return await _parse_utterance(
+            user_id,
+            item.text,
+            db,
+            now=_client_time(item.recorded_at, tz),
+            llm_limit=llm_limit,
+        )
 
-    return StatsResponse(
-        success=True,
-        data=stats,
+    # 1. 同時解析所有項目（LLM 呼叫數受 llm_limit 限制）
+    parsed = await asyncio.gather(
+        *(parse_item(item) for item in request.items), return_exceptions=True
     )
 
+    results: List[BatchRecordResult] = []
+    to_write: List[AccountingRecord] = []
+    for index, (item, outcome) in enumerate(zip(request.items, parsed)):
+        result = BatchRecordResult(index=index, client_id=item.client_id, status="ok")
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Batch item {index} parse failed: {outcome}")
+            result.status = "error"
+            result.error = str(outcome)
+        else:
+            result.records, result.parse_path = outcome
+            result.record_ids = [uuid.uuid4().hex for _ in result.records]
+            to_write.extend(result.records)
+        results.append(result)
+
+    # 2. 依月份分頁合併寫入
+    month_errors = (
+        await user_sheets_service.write_records_by_month(sheet_id, to_write)
+        if to_write
+        else {}
+    )
+    for result in results:
+        errors = [
+            month_errors.get(user_sheets_service.extract_month_from_time(r.時間))
+            for r in result.records
+        ]
+        error = next((e for e in errors if e is not None), None)
+        if error is not None:
+            result.status = "error"
+            result.error = str(error)
+
+    written = sum(len(r.records) for r in results if r.status == "ok")
+    failed = sum(1 for r in results if r.status != "ok")
+    set_upstream_calls_header(response, user_sheets_service)
+    return BatchRecordResponse(
+        success=failed == 0, results=results, written=written, failed=failed
+    )
 
-@router.post("/query", response_model=QueryResponse)
-async def query_accounting(
-    request: QueryRequest,
+
+@router.get("/record/{record_id}/feedback", response_model=FeedbackResponse)
+async def get_record_feedback(
+    record_id: str,
+    wait: float = Query(0, ge=0, le=25, description="最多等待幾秒（long polling）"),
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+):
+    """
+    取得記帳後在背景產生的理財回饋
+
+    需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="需要認證")
+
+    result = await feedback_tasks.wait(
+        record_id, wait, user_id=current_user.get("user_id")
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail="找不到此記錄的理財回饋")
+
+    status, feedback = result
+    return FeedbackResponse(record_id=record_id, status=status, feedback=feedback)
+
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(
+    response: Response,
+    month: Optional[str] = Query(None, description="月份，格式：YYYY-MM"),
     current_user: Optional[dict] = Depends(get_current_user_optional),
     db: Session = Depends(get_db),
 ):
     """
-    智慧查詢端點（財務小助手）
+    取得月度統計資料
 
-    使用自然語言查詢帳務狀況、詢問理財知識，或進行日常對話
+    如果未指定月份，則回傳當月統計
 
     需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
     """
     if not current_user:
         raise HTTPException(status_code=401, detail="需要認證")
 
-    logger.info(f"Query: {request.query}")
+    logger.info(f"Getting stats for month: {month or 'current'}")
 
     # 取得用戶的 Sheets 服務
     user_sheets_service, sheet_id = await get_sheets_service_for_user(current_user, db)
+    stats = await user_sheets_service.get_monthly_stats(sheet_id, month)
+    set_upstream_calls_header(response, user_sheets_service)
 
-    # 取得用戶時區設定
-    user_id = current_user.get("user_id")
+    return StatsResponse(
+        success=True,
+        data=stats,
+    )
+
+
+def _user_timezone(db: Session, user_id: Optional[str]) -> Tuple[str, ZoneInfo]:
+    """取得用戶時區設定（無效時使用 Asia/Taipei）"""
     user_timezone = "Asia/Taipei"  # 預設值
     if user_id:
         user = get_user_by_id(db, user_id)
         if user and user.timezone:
             user_timezone = user.timezone
 
-    # 1. 取得當月統計資料
-    stats = await user_sheets_service.get_monthly_stats(sheet_id)
-
-    # 取得用戶時區的當前時間（用於日期計算）
     try:
-        tz = ZoneInfo(user_timezone)
+        return user_timezone, ZoneInfo(user_timezone)
     except Exception:
         logger.warning(
             f"Invalid timezone: {user_timezone}, falling back to Asia/Taipei"
         )
-        tz = ZoneInfo("Asia/Taipei")
+        return user_timezone, ZoneInfo("Asia/Taipei")
+
+
+async def _load_query_context(
+    user_sheets_service,
+    sheet_id: str,
+    user_id: Optional[str],
+    db: Session,
+    needs: frozenset = INTENT_CONTEXT[INTENT_UNKNOWN],
+    scope: Optional[QueryScope] = None,
+) -> Dict[str, Any]:
+    """
+    取得智慧查詢的上下文（時區、當月統計、近期明細、近三個月統計）
+
+    Args:
+        needs: 需要的上下文項目（見 app.utils.query_intent），其餘項目不讀取
+        scope: 問題指定的時間範圍與類別；提供時改為只讀取該範圍
+
+    Returns:
+        Dict[str, Any]: openai_service.answer_query 的關鍵字參數
+    """
+    # 取得用戶時區設定
+    user_timezone, tz = _user_timezone(db, user_id)
+
+    if scope is not None:
+        return await _load_scoped_context(
+            user_sheets_service, sheet_id, user_timezone, tz, needs, scope
+        )
+
+    # 1. 取得當月統計資料
+    stats = None
+    if CONTEXT_STATS in needs:
+        stats = await user_sheets_service.get_monthly_stats(sheet_id)
+
+    # 取得用戶時區的當前時間（用於日期計算）
     now_in_user_tz = datetime.now(tz)
 
     # 2. 取得近期消費明細（最近 7 天，基於用戶時區）
     # 使用 days-1 確保範圍正確：今天 + 前 6 天 = 7 天
     recent_records = None
-    try:
-        today = now_in_user_tz.strftime("%Y-%m-%d")
-        week_ago = (now_in_user_tz - timedelta(days=6)).strftime("%Y-%m-%d")
-        recent_records = await user_sheets_service.get_records_by_date_range(
-            sheet_id, week_ago, today
-        )
-    except Exception as e:
-        logger.warning(f"Failed to get recent records: {e}")
+    if CONTEXT_RECENT in needs:
+        try:
+            today = now_in_user_tz.strftime("%Y-%m-%d")
+            week_ago = (now_in_user_tz - timedelta(days=6)).strftime("%Y-%m-%d")
+            recent_records = await user_sheets_service.get_records_by_date_range(
+                sheet_id, week_ago, today
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get recent records: {e}")
 
     # 3. 取得近三個月統計資料（用於趨勢分析，基於用戶時區）
     multi_month_stats = None
-    try:
-        # 正確計算前幾個月（避免使用 timedelta(days=30) 導致月份邊界錯誤）
-        months = []
-        current_year = now_in_user_tz.year
-        current_month = now_in_user_tz.month
-        for i in range(3):
-            # 計算往前 i 個月的年月
-            target_month = current_month - i
-            target_year = current_year
-            while target_month <= 0:
-                target_month += 12
-                target_year -= 1
-            months.append(f"{target_year:04d}-{target_month:02d}")
-        multi_month_stats = await user_sheets_service.get_multi_month_stats(
-            sheet_id, months
+    if CONTEXT_MULTI_MONTH in needs:
+        try:
+            # 正確計算前幾個月（避免使用 timedelta(days=30) 導致月份邊界錯誤）
+            months = []
+            current_year = now_in_user_tz.year
+            current_month = now_in_user_tz.month
+            for i in range(3):
+                # 計算往前 i 個月的年月
+                target_month = current_month - i
+                target_year = current_year
+                while target_month <= 0:
+                    target_month += 12
+                    target_year -= 1
+                months.append(f"{target_year:04d}-{target_month:02d}")
+            multi_month_stats = await user_sheets_service.get_multi_month_stats(
+                sheet_id, months
+            )
+        except Exception as e:
+            logger.warning(f"Failed to get multi-month stats: {e}")
+
+    return {
+        "stats": stats,
+        "user_timezone": user_timezone,
+        "recent_records": recent_records,
+        "multi_month_stats": multi_month_stats,
+    }
+
+
+async def _load_scoped_context(
+    user_sheets_service,
+    sheet_id: str,
+    user_timezone: str,
+    tz: ZoneInfo,
+    needs: frozenset,
+    scope: QueryScope,
+) -> Dict[str, Any]:
+    """
+    取得問題指定範圍的上下文（範圍內的明細；趨勢問題另加各月份統計）
+
+    需要的分頁以單次批次讀取取得。
+    """
+    months: List[str] = []
+    if CONTEXT_MULTI_MONTH in needs:
+        # 趨勢問題比較範圍起點到本月的各月份
+        today = datetime.now(tz).date()
+        months = months_between(scope.start, today)[-MAX_RECENT_MONTHS:]
+        if len(months) < 2:
+            months = []
+
+    records, multi_month_stats = await user_sheets_service.get_range_records_and_stats(
+        sheet_id, scope.start.isoformat(), scope.end.isoformat(), months
+    )
+    if scope.category:
+        records = [r for r in records if r.get("類別") == scope.category]
+
+    return {
+        "user_timezone": user_timezone,
+        "recent_records": records,
+        "multi_month_stats": multi_month_stats or None,
+        "time_range": scope.describe(),
+    }
+
+
+async def _route_query(
+    current_user: dict, db: Session, query: str
+) -> Tuple[Dict[str, Any], Optional[Any]]:
+    """
+    依問題意圖取得智慧查詢的上下文
+
+    知識與閒聊問題不需要帳務資料，不建立 Sheets 服務也不讀取 Sheet；
+    問題指定了時間範圍或類別時，只讀取該範圍的資料。
+
+    Returns:
+        (openai_service.answer_query 的關鍵字參數, Sheets 服務或 None)
+    """
+    if settings.QUERY_INTENT_ROUTING_ENABLED:
+        intent, keyword = classify_query(query)
+    else:
+        intent, keyword = INTENT_UNKNOWN, None
+    needs = INTENT_CONTEXT[intent]
+
+    user_id = current_user.get("user_id")
+    user_timezone, tz = _user_timezone(db, user_id)
+    scope = None
+    if needs and settings.QUERY_INTENT_ROUTING_ENABLED:
+        scope = extract_query_scope(query, datetime.now(tz).date())
+    logger.info(
+        f"Query routed: intent={intent} keyword={keyword!r} "
+        f"context={','.join(sorted(needs)) or '-'} "
+        f"scope={scope.describe() if scope else '-'} query={query!r}"
+    )
+
+    if not needs:
+        return {"user_timezone": user_timezone}, None
+
+    user_sheets_service, sheet_id = await get_sheets_service_for_user(current_user, db)
+    if settings.QUERY_TOOLS_ENABLED:
+        # 工具模式：由模型呼叫工具取得需要的資料
+        tools = LedgerTools(user_sheets_service, sheet_id)
+        return {"user_timezone": user_timezone, "tools": tools}, user_sheets_service
+
+    context = await _load_query_context(
+        user_sheets_service, sheet_id, user_id, db, needs, scope
+    )
+    return context, user_sheets_service
+
+
+async def _scope_totals(
+    user_sheets_service, sheet_id: str, scope: QueryScope, today
+) -> Tuple[float, int]:
+    """
+    計算範圍內（指定類別時為該類別）的總支出與筆數
+
+    範圍為完整月份（或本月至今）時使用月度統計，其餘範圍讀取明細加總。
+    """
+    whole_months = scope.start.day == 1 and (
+        scope.end == today or (scope.end + timedelta(days=1)).day == 1
+    )
+    if whole_months:
+        stats_list = await user_sheets_service.get_multi_month_stats(
+            sheet_id, scope.months
         )
+        if scope.category:
+            return (
+                sum(s.by_category.get(scope.category, 0) for s in stats_list),
+                sum(s.by_category_count.get(scope.category, 0) for s in stats_list),
+            )
+        return sum(s.total for s in stats_list), sum(s.record_count for s in stats_list)
+
+    records = await user_sheets_service.get_records_by_date_range(
+        sheet_id, scope.start.isoformat(), scope.end.isoformat()
+    )
+    if scope.category:
+        records = [r for r in records if r.get("類別") == scope.category]
+    total = sum(
+        r["花費"] for r in records if isinstance(r.get("花費"), (int, float))
+    )
+    return total, len(records)
+
+
+async def _quick_answer(
+    current_user: dict, db: Session, query: str
+) -> Optional[Tuple[str, Any]]:
+    """
+    以彙總資料直接回答純數字帳務問題（例如「這個月花了多少」）
+
+    Returns:
+        (回答, Sheets 服務)；無法直接回答時回傳 None，交給 LLM
+    """
+    if not settings.QUICK_ANSWER_ENABLED:
+        return None
+
+    user_id = current_user.get("user_id")
+    _, tz = _user_timezone(db, user_id)
+    today = datetime.now(tz).date()
+    question = parse_numeric_question(query, today)
+    if question is None:
+        return None
+
+    user_sheets_service, sheet_id = await get_sheets_service_for_user(current_user, db)
+    total, count = await _scope_totals(
+        user_sheets_service, sheet_id, question.scope, today
+    )
+    budget = (
+        get_user_budget(db, user_id)
+        if question.kind == KIND_BUDGET and user_id
+        else None
+    )
+    logger.info(
+        f"Query answered locally: kind={question.kind} "
+        f"scope={question.scope.describe()} query={query!r}"
+    )
+    return render_numeric_answer(question, total, count, budget), user_sheets_service
+
+
+def _is_knowledge_query(query: str) -> bool:
+    """是否為回答可跨用戶快取的理財知識問題（與帳務無關）"""
+    return (
+        settings.KNOWLEDGE_CACHE_ENABLED
+        and settings.QUERY_INTENT_ROUTING_ENABLED
+        and classify_query(query)[0] == INTENT_KNOWLEDGE
+    )
+
+
+def _save_query_history(
+    db: Session, user_id: Optional[str], query: str, answer: str
+) -> None:
+    """儲存查詢記錄（失敗時只記錄警告）"""
+    if not user_id:
+        return
+    try:
+        create_query_history(db, user_id, query, answer)
+        logger.info(f"Query history saved for user {user_id}")
     except Exception as e:
-        logger.warning(f"Failed to get multi-month stats: {e}")
+        logger.warning(f"Failed to save query history: {e}")
 
-    # 4. 使用 LLM 回答問題（帶入完整上下文）
-    response = await openai_service.answer_query(
-        query=request.query,
-        stats=stats,
-        user_timezone=user_timezone,
-        recent_records=recent_records,
-        multi_month_stats=multi_month_stats,
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """組成一則 Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _answer_events(answer: str) -> AsyncIterator[str]:
+    """已有完整回答時（本地回答或快取命中）整段送出"""
+    yield _sse_event("delta", {"text": answer})
+    yield _sse_event("done", {"response": answer})
+
+
+def _sse_response(events: AsyncIterator[str], sheets_service) -> StreamingResponse:
+    """以 text/event-stream 回應 Server-Sent Events"""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 避免反向代理緩衝串流內容
+            UPSTREAM_CALLS_HEADER: _upstream_calls(sheets_service),
+        },
     )
 
-    # 5. 儲存查詢記錄到資料庫
-    if user_id:
-        try:
-            create_query_history(db, user_id, request.query, response)
-            logger.info(f"Query history saved for user {user_id}")
-        except Exception as e:
-            logger.warning(f"Failed to save query history: {e}")
+
+@router.post("/query", response_model=QueryResponse)
+async def query_accounting(
+    request: QueryRequest,
+    response: Response,
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db),
+):
+    """
+    智慧查詢端點（財務小助手）
+
+    使用自然語言查詢帳務狀況、詢問理財知識，或進行日常對話
+
+    需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="需要認證")
+
+    logger.info(f"Query: {request.query}")
+
+    user_id = current_user.get("user_id")
+    quick = await _quick_answer(current_user, db, request.query)
+    knowledge = quick is None and _is_knowledge_query(request.query)
+    cached = knowledge_cache.get(request.query) if knowledge else None
+    if quick is not None:
+        # 純數字問題直接以彙總資料回答
+        answer, user_sheets_service = quick
+    elif cached is not None:
+        # 理財知識問題命中跨用戶快取
+        answer, user_sheets_service = cached, None
+    else:
+        # 1. 依問題意圖取得查詢上下文
+        context, user_sheets_service = await _route_query(
+            current_user, db, request.query
+        )
+
+        # 2. 使用 LLM 回答問題（帶入完整上下文）
+        answer = await openai_service.answer_query(query=request.query, **context)
+        if knowledge:
+            knowledge_cache.put(request.query, answer)
+
+    # 3. 儲存查詢記錄到資料庫
+    _save_query_history(db, user_id, request.query, answer)
+
+    set_upstream_calls_header(response, user_sheets_service)
 
     return QueryResponse(
         success=True,
-        response=response,
+        response=answer,
     )
 
 
+@router.post("/query/stream")
+async def query_accounting_stream(
+    request: QueryRequest,
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+    db: Session = Depends(get_db),
+):
+    """
+    智慧查詢端點（串流版，Server-Sent Events）
+
+    與 /query 相同的查詢，但回答以 text/event-stream 逐段送出：
+    - delta：{"text": "..."}，回答片段
+    - done：{"response": "..."}，完整回答（查詢記錄已儲存）
+    - error：{"code": "...", "message": "..."}，回答過程中發生錯誤
+
+    需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="需要認證")
+
+    logger.info(f"Query (stream): {request.query}")
+
+    # 上下文在開始串流前取得，錯誤仍以一般 HTTP 錯誤回應
+    user_id = current_user.get("user_id")
+    quick = await _quick_answer(current_user, db, request.query)
+    if quick is not None:
+        # 純數字問題直接以彙總資料回答
+        answer, user_sheets_service = quick
+        _save_query_history(db, user_id, request.query, answer)
+        return _sse_response(_answer_events(answer), user_sheets_service)
+
+    knowledge = _is_knowledge_query(request.query)
+    cached = knowledge_cache.get(request.query) if knowledge else None
+    if cached is not None:
+        # 理財知識問題命中跨用戶快取
+        _save_query_history(db, user_id, request.query, cached)
+        return _sse_response(_answer_events(cached), None)
+
+    context, user_sheets_service = await _route_query(current_user, db, request.query)
+
+    async def events() -> AsyncIterator[str]:
+        # 請求的 db Session 在回應開始送出前就已關閉，串流期間另開 Session
+        with SessionLocal() as session:
+            if "tools" in context:
+                # 工具模式在串流期間才讀取帳務資料
+                user_sheets_service.bind_session(session)
+
+            parts = []
+            try:
+                async for delta in openai_service.stream_answer_query(
+                    query=request.query, **context
+                ):
+                    parts.append(delta)
+                    yield _sse_event("delta", {"text": delta})
+            except OpenAIServiceError as e:
+                yield _sse_event("error", {"code": e.code, "message": e.message})
+                return
+
+            answer = "".join(parts).strip()
+            if knowledge:
+                knowledge_cache.put(request.query, answer)
+            _save_query_history(session, user_id, request.query, answer)
+        yield _sse_event("done", {"response": answer})
+
+    return _sse_response(events(), user_sheets_service)
+
+
 @router.get("/query/history", response_model=QueryHistoryResponse)
 async def get_query_history_endpoint(
     limit: int = Query(20, ge=1, le=100, description="每頁筆數"),
@@ -355,8 +936,43 @@ async def get_query_history_endpoint(
     )
 
 
+async def _run_summary_section(
+    name: str,
+    coro: Awaitable[Any],
+    timeout: float,
+    section_status: Dict[str, str],
+    required: bool = False,
+) -> Any:
+    """
+    在時限內執行 Dashboard 的單一區塊
+
+    逾時或失敗時記錄區塊狀態並回傳 None，讓其他區塊照常回傳。
+
+    Args:
+        name: 區塊名稱
+        coro: 取得區塊資料的 coroutine
+        timeout: 時限（秒）
+        section_status: 各區塊狀態（會被更新）
+        required: 失敗時是否拋出例外（逾時仍回傳 None）
+    """
+    try:
+        result = await asyncio.wait_for(coro, timeout=timeout)
+        section_status[name] = "ok"
+        return result
+    except asyncio.TimeoutError:
+        logger.warning(f"Dashboard section '{name}' timed out after {timeout}s")
+        section_status[name] = "timeout"
+    except Exception as e:
+        section_status[name] = "error"
+        if required:
+            raise
+        logger.warning(f"Failed to get {name} for dashboard: {e}")
+    return None
+
+
 @router.get("/summary", response_model=DashboardSummaryResponse)
 async def get_dashboard_summary(
+    response: Response,
     current_user: Optional[dict] = Depends(get_current_user_optional),
     db: Session = Depends(get_db),
 ):
@@ -369,6 +985,9 @@ async def get_dashboard_summary(
     - 過去 7 天每日消費趨勢
     - 預算狀態
 
+    各區塊並行取得且各有時限（SUMMARY_SECTION_TIMEOUT_SECONDS），逾時或失敗的
+    區塊回傳空資料，並在 section_status 標示 ok / timeout / error。
+
     需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
     """
     if not current_user:
@@ -381,42 +1000,16 @@ async def get_dashboard_summary(
     user_id = current_user.get("user_id")
 
     # 取得用戶時區設定
-    user_timezone = "Asia/Taipei"  # 預設值
-    if user_id:
-        user = get_user_by_id(db, user_id)
-        if user and user.timezone:
-            user_timezone = user.timezone
-
-    # 1. 取得本月統計
-    stats = await user_sheets_service.get_monthly_stats(sheet_id)
-
-    # 計算前三大類別
-    top_categories = []
-    if stats.by_category:
-        sorted_categories = sorted(
-            stats.by_category.items(), key=lambda x: x[1], reverse=True
-        )[:3]
-        for category, amount in sorted_categories:
-            percentage = (amount / stats.total * 100) if stats.total > 0 else 0
-            top_categories.append(
-                CategorySummary(
-                    category=category, total=amount, percentage=round(percentage, 1)
-                )
-            )
+    user_timezone, _ = _user_timezone(db, user_id)
 
-    month_summary = MonthSummary(
-        total=stats.total,
-        record_count=stats.record_count,
-        top_categories=top_categories,
-    )
+    timeout = settings.SUMMARY_SECTION_TIMEOUT_SECONDS
+    section_status = {}
 
-    # 2. 取得最近記帳記錄（使用用戶時區）
-    recent_records = []
-    try:
+    async def load_recent_records():
         recent_records_raw = await user_sheets_service.get_recent_records(
             sheet_id, limit=5, user_timezone=user_timezone
         )
-        recent_records = [
+        return [
             RecentRecord(
                 時間=r.get("時間", ""),
                 名稱=r.get("名稱", ""),
@@ -425,38 +1018,80 @@ async def get_dashboard_summary(
             )
             for r in recent_records_raw
         ]
-    except Exception as e:
-        logger.warning(f"Failed to get recent records for dashboard: {e}")
 
-    # 3. 取得每日消費趨勢（使用用戶時區）
-    daily_trend = []
-    try:
+    async def load_daily_trend():
         daily_trend_raw = await user_sheets_service.get_daily_trend(
             sheet_id, days=7, user_timezone=user_timezone
         )
-        daily_trend = [
-            DailyTrend(date=d["date"], total=d["total"]) for d in daily_trend_raw
-        ]
-    except Exception as e:
-        logger.warning(f"Failed to get daily trend for dashboard: {e}")
+        return [DailyTrend(date=d["date"], total=d["total"]) for d in daily_trend_raw]
+
+    # 1~3. 並行取得本月統計、最近記帳記錄與每日消費趨勢（使用用戶時區），
+    # 回應時間取決於最慢的區塊，且不超過區塊時限
+    stats, recent_records, daily_trend = await asyncio.gather(
+        _run_summary_section(
+            "month_summary",
+            user_sheets_service.get_monthly_stats(sheet_id),
+            timeout,
+            section_status,
+            required=True,
+        ),
+        _run_summary_section(
+            "recent_records", load_recent_records(), timeout, section_status
+        ),
+        _run_summary_section(
+            "daily_trend", load_daily_trend(), timeout, section_status
+        ),
+    )
+    recent_records = recent_records or []
+    daily_trend = daily_trend or []
+
+    # 計算前三大類別（本月統計逾時則回傳空摘要）
+    top_categories = []
+    if stats is not None and stats.by_category:
+        sorted_categories = sorted(
+            stats.by_category.items(), key=lambda x: x[1], reverse=True
+        )[:3]
+        for category, amount in sorted_categories:
+            percentage = (amount / stats.total * 100) if stats.total > 0 else 0
+            top_categories.append(
+                CategorySummary(
+                    category=category, total=amount, percentage=round(percentage, 1)
+                )
+            )
+
+    month_summary = (
+        MonthSummary(
+            total=stats.total,
+            record_count=stats.record_count,
+            top_categories=top_categories,
+        )
+        if stats is not None
+        else MonthSummary()
+    )
 
-    # 4. 取得預算狀態
+    # 4. 取得預算狀態（已花費金額來自本月統計，統計未完成時不計算使用比例）
     monthly_limit = get_user_budget(db, user_id) if user_id else None
     # Use "is not None" to distinguish between "not set" (None) and "set to 0"
     has_budget = monthly_limit is not None
-    budget = BudgetStatus(
-        monthly_limit=monthly_limit,
-        spent=stats.total,
-        remaining=(monthly_limit - stats.total) if has_budget else None,
-        percentage=(
-            # Handle division by zero: if limit is 0 and spent > 0, it's infinitely over budget (cap at 100%)
-            round(stats.total / monthly_limit * 100, 1)
-            if has_budget and monthly_limit > 0
-            else (
-                100.0 if has_budget and stats.total > 0 else 0.0 if has_budget else None
-            )
-        ),
-    )
+    if stats is not None:
+        budget = BudgetStatus(
+            monthly_limit=monthly_limit,
+            spent=stats.total,
+            remaining=(monthly_limit - stats.total) if has_budget else None,
+            percentage=(
+                # Handle division by zero: if limit is 0 and spent > 0, it's infinitely over budget (cap at 100%)
+                round(stats.total / monthly_limit * 100, 1)
+                if has_budget and monthly_limit > 0
+                else (
+                    100.0
+                    if has_budget and stats.total > 0
+                    else 0.0 if has_budget else None
+                )
+            ),
+        )
+    else:
+        budget = BudgetStatus(monthly_limit=monthly_limit)
+    section_status["budget"] = section_status["month_summary"]
 
     # 組合回傳
     dashboard = DashboardSummary(
@@ -464,13 +1099,52 @@ async def get_dashboard_summary(
         recent_records=recent_records,
         daily_trend=daily_trend,
         budget=budget,
+        section_status=section_status,
     )
 
-    logger.info(f"Dashboard summary: total={stats.total}, records={stats.record_count}")
+    logger.info(
+        f"Dashboard summary: total={month_summary.total}, "
+        f"records={month_summary.record_count}, sections={section_status}"
+    )
+    set_upstream_calls_header(response, user_sheets_service)
 
     return DashboardSummaryResponse(success=True, data=dashboard)
 
 
+@router.get("/parse-cache/stats")
+async def get_parse_cache_stats(
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+):
+    """
+    取得解析結果快取的命中率
+
+    需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="需要認證")
+
+    return {
+        "success": True,
+        "user": parse_cache.stats(current_user["user_id"]),
+        "overall": parse_cache.stats(),
+    }
+
+
+@router.get("/prompt-cache/stats")
+async def get_prompt_cache_stats(
+    current_user: Optional[dict] = Depends(get_current_user_optional),
+):
+    """
+    取得 OpenAI prompt 前綴快取的命中率與估計節省的延遲（依呼叫類型）
+
+    需要在 Authorization header 提供 Bearer Token（JWT 或已綁定用戶的 API Token）
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="需要認證")
+
+    return {"success": True, **prompt_cache_metrics.stats()}
+
+
 @router.get("/categories")
 async def get_categories():
     """
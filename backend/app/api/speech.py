@@ -3,11 +3,13 @@
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
+from app.config import settings
 from app.services.openai_service import openai_service
+from app.services.tts_cache import tts_cache, tts_cache_key
 from app.utils.auth import verify_token
 
 logger = logging.getLogger(__name__)
@@ -28,12 +30,38 @@ class TTSRequest(BaseModel):
         ge=0.25,
         le=4.0,
     )
+    stream: bool = Field(
+        default=False,
+        description="串流模式：收到音訊區塊就立即回傳，不等待完整合成",
+    )
+    split_sentences: bool = Field(
+        default=True,
+        description="串流模式下依句子分段管線式合成，第一句合成後即可開始播放",
+    )
+
+
+def _cached_audio_headers(key: str) -> dict:
+    """快取音訊的回應標頭（內容由雜湊決定，ETag 即為雜湊）"""
+    return {
+        "Content-Disposition": "inline; filename=speech.mp3",
+        "ETag": f'"{key}"',
+        "Cache-Control": f"private, max-age={settings.TTS_CACHE_MAX_AGE_SECONDS}",
+    }
+
+
+def _etag_matches(if_none_match: Optional[str], key: str) -> bool:
+    """If-None-Match 是否包含此音訊的 ETag"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or f'"{key}"' in tags
 
 
 @router.post("/synthesize")
 async def synthesize_speech(
     request: TTSRequest,
     token_valid: bool = Depends(verify_token),
+    if_none_match: Optional[str] = Header(default=None),
 ):
     """
     文字轉語音 (TTS)
@@ -42,11 +70,36 @@ async def synthesize_speech(
 
     需要在 Authorization header 提供 Bearer Token
 
+    相同文字、聲音與語速的合成結果會快取在本地磁碟，命中時直接以檔案回應，
+    並支援 If-None-Match（304）。
+
     Returns:
-        音訊檔案 (MP3 格式)
+        音訊檔案 (MP3 格式)；stream=true 且未命中快取時以 chunked 傳輸逐段回傳
     """
     logger.info(f"TTS request: {request.text[:50]}...")
 
+    if settings.TTS_CACHE_ENABLED:
+        voice = request.voice or "nova"
+        speed = request.speed or 1.0
+        key = tts_cache_key(request.text, voice, speed)
+        if _etag_matches(if_none_match, key):
+            return Response(status_code=304, headers=_cached_audio_headers(key))
+
+        path = tts_cache.get(key)
+        if path is None and not request.stream:
+            try:
+                path = await tts_cache.synthesize(request.text, voice, speed)
+            except Exception as e:
+                logger.error(f"TTS error: {e}")
+                raise HTTPException(status_code=500, detail=f"語音合成失敗: {str(e)}")
+        if path is not None:
+            return FileResponse(
+                path, media_type="audio/mpeg", headers=_cached_audio_headers(key)
+            )
+
+    if request.stream:
+        return await _stream_speech(request)
+
     try:
         audio_data = await openai_service.text_to_speech(
             text=request.text,
@@ -67,6 +120,48 @@ async def synthesize_speech(
         raise HTTPException(status_code=500, detail=f"語音合成失敗: {str(e)}")
 
 
+async def _stream_speech(request: TTSRequest) -> StreamingResponse:
+    """串流回傳合成音訊（第一個音訊區塊取得後才開始回應，合成失敗仍可回傳錯誤）"""
+    synthesize = (
+        openai_service.stream_sentences_to_speech
+        if request.split_sentences
+        else openai_service.stream_text_to_speech
+    )
+    chunks = synthesize(
+        text=request.text,
+        voice=request.voice or "nova",
+        speed=request.speed or 1.0,
+    )
+
+    try:
+        first_chunk = await anext(chunks, b"")
+    except Exception as e:
+        logger.error(f"TTS error: {e}")
+        raise HTTPException(status_code=500, detail=f"語音合成失敗: {str(e)}")
+
+    async def body():
+        yield first_chunk
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            # 回應已開始傳送，只能中斷串流
+            logger.error(f"TTS stream interrupted: {e}")
+        finally:
+            # 用戶端中斷連線時也要關閉合成（取消預先合成的句子）
+            await chunks.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type="audio/mpeg",
+        headers={
+            "Content-Disposition": "inline; filename=speech.mp3",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.get("/voices")
 async def get_available_voices():
     """
@@ -12,6 +12,108 @@ class Settings:
     # OpenAI
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    OPENAI_TIMEOUT_SECONDS: float = float(
+        os.getenv("OPENAI_TIMEOUT_SECONDS", "30")
+    )  # 單次 API 呼叫的逾時
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+    OPENAI_RETRY_BASE_DELAY_SECONDS: float = float(
+        os.getenv("OPENAI_RETRY_BASE_DELAY_SECONDS", "0.5")
+    )
+    OPENAI_RETRY_MAX_DELAY_SECONDS: float = float(
+        os.getenv("OPENAI_RETRY_MAX_DELAY_SECONDS", "8")
+    )  # 退避等待上限（包含 Retry-After）
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+
+    # 語音合成串流
+    TTS_STREAM_CHUNK_BYTES: int = int(os.getenv("TTS_STREAM_CHUNK_BYTES", "4096"))
+    TTS_PIPELINE_DEPTH: int = int(
+        os.getenv("TTS_PIPELINE_DEPTH", "2")
+    )  # 分句合成時預先合成的句數
+
+    # 語音合成快取（本地磁碟）
+    # Cloud Run 的檔案系統位於記憶體中，未明確指定 TTS_CACHE_DIR 時預設停用
+    TTS_CACHE_ENABLED: bool = (
+        os.getenv(
+            "TTS_CACHE_ENABLED", "true" if os.getenv("TTS_CACHE_DIR") else "false"
+        ).lower()
+        == "true"
+    )
+    TTS_CACHE_DIR: str = os.getenv(
+        "TTS_CACHE_DIR",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "tts_cache"),
+    )
+    TTS_CACHE_MAX_BYTES: int = int(
+        os.getenv("TTS_CACHE_MAX_BYTES", str(20 * 1024 * 1024))
+    )
+    TTS_CACHE_MAX_AGE_SECONDS: int = int(
+        os.getenv("TTS_CACHE_MAX_AGE_SECONDS", "86400")
+    )  # 回應的 Cache-Control max-age
+    TTS_CACHE_PREWARM_PHRASES: list = [
+        phrase.strip()
+        for phrase in os.getenv("TTS_CACHE_PREWARM_PHRASES", "").split("|")
+        if phrase.strip()
+    ]  # 啟動時預先合成的語句（以 | 分隔）
+    TTS_CACHE_PREWARM_VOICE: str = os.getenv("TTS_CACHE_PREWARM_VOICE", "nova")
+
+    # 智慧查詢
+    QUERY_INTENT_ROUTING_ENABLED: bool = (
+        os.getenv("QUERY_INTENT_ROUTING_ENABLED", "true").lower() == "true"
+    )  # 依問題意圖只讀取需要的帳務資料
+    QUICK_ANSWER_ENABLED: bool = (
+        os.getenv("QUICK_ANSWER_ENABLED", "true").lower() == "true"
+    )  # 純數字帳務問題直接以彙總資料回答，不呼叫 LLM
+    QUERY_TOOLS_ENABLED: bool = (
+        os.getenv("QUERY_TOOLS_ENABLED", "false").lower() == "true"
+    )  # 帳務資料改由模型呼叫工具取得，不預先放入 prompt
+    QUERY_TOOL_MAX_CALLS: int = int(os.getenv("QUERY_TOOL_MAX_CALLS", "6"))
+    QUERY_TOOL_TIME_BUDGET_SECONDS: float = float(
+        os.getenv("QUERY_TOOL_TIME_BUDGET_SECONDS", "10")
+    )  # 每個查詢的工具總執行時間上限
+
+    KNOWLEDGE_CACHE_ENABLED: bool = (
+        os.getenv("KNOWLEDGE_CACHE_ENABLED", "true").lower() == "true"
+    )  # 理財知識問題的回答跨用戶快取
+    KNOWLEDGE_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("KNOWLEDGE_CACHE_MAX_ENTRIES", "500")
+    )
+    KNOWLEDGE_CACHE_TTL_SECONDS: int = int(
+        os.getenv("KNOWLEDGE_CACHE_TTL_SECONDS", "604800")
+    )  # 預設 7 天
+    KNOWLEDGE_CACHE_SIMILARITY: float = float(
+        os.getenv("KNOWLEDGE_CACHE_SIMILARITY", "0.8")
+    )  # 相似問題命中的 cosine 相似度門檻
+
+    # 記帳解析
+    FAST_PARSER_ENABLED: bool = (
+        os.getenv("FAST_PARSER_ENABLED", "true").lower() == "true"
+    )  # 常見語句以規則解析，不呼叫 LLM
+    PARSE_CACHE_ENABLED: bool = (
+        os.getenv("PARSE_CACHE_ENABLED", "true").lower() == "true"
+    )  # 重複的語句使用先前的 LLM 解析結果
+    PARSE_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("PARSE_CACHE_MAX_ENTRIES", "200")
+    )  # 每位用戶的快取筆數上限
+    PARSE_CACHE_TTL_SECONDS: int = int(
+        os.getenv("PARSE_CACHE_TTL_SECONDS", "2592000")
+    )  # 預設 30 天
+    PARSE_CACHE_MAX_USERS: int = int(os.getenv("PARSE_CACHE_MAX_USERS", "1000"))
+    PARSE_CACHE_PERSIST: bool = (
+        os.getenv("PARSE_CACHE_PERSIST", "true").lower() == "true"
+    )  # 同時保存在資料庫，重啟後仍可命中
+
+    # 批次記帳（離線補傳）
+    BATCH_RECORD_MAX_ITEMS: int = int(os.getenv("BATCH_RECORD_MAX_ITEMS", "100"))
+    BATCH_PARSE_CONCURRENCY: int = int(
+        os.getenv("BATCH_PARSE_CONCURRENCY", "4")
+    )  # 同時呼叫 LLM 解析的語句數
+
+    # 記帳後的理財回饋
+    FEEDBACK_DEADLINE_SECONDS: float = float(
+        os.getenv("FEEDBACK_DEADLINE_SECONDS", "3")
+    )  # /record 最多等待回饋幾秒，逾時改為背景產生（0 表示不等待）
+    FEEDBACK_RESULT_TTL_SECONDS: int = int(
+        os.getenv("FEEDBACK_RESULT_TTL_SECONDS", "600")
+    )  # 背景產生的回饋保留多久供輪詢
 
     # Server
     HOST: str = os.getenv("HOST", "0.0.0.0")
@@ -61,5 +163,61 @@ class Settings:
     # Frontend URL (for OAuth redirect)
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
+    # Google Sheets 快取
+    SHEETS_WORKSHEET_CACHE_TTL_SECONDS: int = int(
+        os.getenv("SHEETS_WORKSHEET_CACHE_TTL_SECONDS", "300")
+    )  # 分頁列表快取時間
+
+    # Google API HTTP 連線池
+    GOOGLE_API_TIMEOUT_SECONDS: float = float(
+        os.getenv("GOOGLE_API_TIMEOUT_SECONDS", "15")
+    )
+    GOOGLE_API_MAX_CONNECTIONS: int = int(os.getenv("GOOGLE_API_MAX_CONNECTIONS", "50"))
+    GOOGLE_API_KEEPALIVE_SECONDS: float = float(
+        os.getenv("GOOGLE_API_KEEPALIVE_SECONDS", "60")
+    )
+
+    # Google Sheets write-behind 佇列
+    SHEETS_WRITE_BEHIND_ENABLED: bool = (
+        os.getenv("SHEETS_WRITE_BEHIND_ENABLED", "false").lower() == "true"
+    )
+    SHEETS_WRITE_BEHIND_WINDOW_SECONDS: float = float(
+        os.getenv("SHEETS_WRITE_BEHIND_WINDOW_SECONDS", "2")
+    )
+    SHEETS_WRITE_BEHIND_MAX_BATCH: int = int(
+        os.getenv("SHEETS_WRITE_BEHIND_MAX_BATCH", "20")
+    )
+    # 寫入失敗後的重試間隔（每次加倍）與次數上限
+    SHEETS_WRITE_BEHIND_RETRY_SECONDS: float = float(
+        os.getenv("SHEETS_WRITE_BEHIND_RETRY_SECONDS", "30")
+    )
+    SHEETS_WRITE_BEHIND_MAX_RETRIES: int = int(
+        os.getenv("SHEETS_WRITE_BEHIND_MAX_RETRIES", "6")
+    )
+
+    # 記帳記錄本地鏡像
+    LEDGER_MIRROR_ENABLED: bool = (
+        os.getenv("LEDGER_MIRROR_ENABLED", "true").lower() == "true"
+    )
+    LEDGER_MIRROR_FRESHNESS_SECONDS: int = int(
+        os.getenv("LEDGER_MIRROR_FRESHNESS_SECONDS", "60")
+    )  # 期限內直接使用本地資料，不檢查 Drive
+    LEDGER_MIRROR_RESYNC_SECONDS: int = int(
+        os.getenv("LEDGER_MIRROR_RESYNC_SECONDS", "3600")
+    )  # 強制完整校正的間隔
+
+    # 月度統計物化結果
+    MONTHLY_AGGREGATES_ENABLED: bool = (
+        os.getenv("MONTHLY_AGGREGATES_ENABLED", "true").lower() == "true"
+    )
+    MONTHLY_AGGREGATE_RECONCILE_SECONDS: int = int(
+        os.getenv("MONTHLY_AGGREGATE_RECONCILE_SECONDS", "900")
+    )  # 以完整資料重新計算的間隔
+
+    # Dashboard 摘要
+    SUMMARY_SECTION_TIMEOUT_SECONDS: float = float(
+        os.getenv("SUMMARY_SECTION_TIMEOUT_SECONDS", "5")
+    )  # 每個區塊的最長等待時間，逾時的區塊回傳空資料
+
 
 settings = Settings()
@@ -8,6 +8,11 @@ from app.database.models import (
     UserSheet,
     RefreshToken,
     OAuthLoginCode,
+    PendingSheetWrite,
+    LedgerEntry,
+    LedgerSyncState,
+    MonthlyAggregate,
+    ParseCacheEntry,
 )
 
 __all__ = [
@@ -20,4 +25,9 @@ __all__ = [
     "RefreshToken",
     "OAuthLoginCode",
     "UserSheet",
+    "PendingSheetWrite",
+    "LedgerEntry",
+    "LedgerSyncState",
+    "MonthlyAggregate",
+    "ParseCacheEntry",
 ]
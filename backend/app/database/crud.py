@@ -17,6 +17,11 @@ from app.database.models import (
     RefreshToken,
     OAuthLoginCode,
     QueryHistory,
+    PendingSheetWrite,
+    LedgerEntry,
+    LedgerSyncState,
+    MonthlyAggregate,
+    ParseCacheEntry,
 )
 
 logger = logging.getLogger(__name__)
@@ -572,3 +577,267 @@ def get_query_history_count(
 
     result = db.execute(stmt)
     return result.scalar() or 0
+
+
+# =========================
+# PendingSheetWrite CRUD
+# =========================
+
+
+def create_pending_sheet_write(
+    db: Session,
+    record_id: str,
+    user_id: str,
+    sheet_id: str,
+    month: str,
+    row: str,
+) -> PendingSheetWrite:
+    """建立待寫入記錄"""
+    pending = PendingSheetWrite(
+        id=record_id,
+        user_id=user_id,
+        sheet_id=sheet_id,
+        month=month,
+        row=row,
+    )
+    db.add(pending)
+    db.commit()
+    db.refresh(pending)
+    return pending
+
+
+def get_pending_sheet_writes(
+    db: Session, sheet_id: Optional[str] = None
+) -> list[PendingSheetWrite]:
+    """取得待寫入記錄（依建立時間排序）"""
+    stmt = select(PendingSheetWrite)
+    if sheet_id is not None:
+        stmt = stmt.where(PendingSheetWrite.sheet_id == sheet_id)
+    stmt = stmt.order_by(PendingSheetWrite.created_at, PendingSheetWrite.id)
+    result = db.execute(stmt)
+    return list(result.scalars().all())
+
+
+def delete_pending_sheet_writes(db: Session, record_ids: list[str]) -> int:
+    """刪除已寫入的待寫入記錄"""
+    from sqlalchemy import delete
+
+    if not record_ids:
+        return 0
+    result = db.execute(
+        delete(PendingSheetWrite).where(PendingSheetWrite.id.in_(record_ids))
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+# =========================
+# Ledger mirror CRUD
+# =========================
+
+
+def get_ledger_sync_state(
+    db: Session, user_id: str, sheet_id: str
+) -> Optional[LedgerSyncState]:
+    """取得本地鏡像的同步狀態"""
+    result = db.execute(
+        select(LedgerSyncState).where(
+            LedgerSyncState.user_id == user_id,
+            LedgerSyncState.sheet_id == sheet_id,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+def save_ledger_sync_state(
+    db: Session, user_id: str, sheet_id: str, **fields
+) -> LedgerSyncState:
+    """建立或更新本地鏡像的同步狀態"""
+    state = get_ledger_sync_state(db, user_id, sheet_id)
+    if state is None:
+        state = LedgerSyncState(user_id=user_id, sheet_id=sheet_id)
+        db.add(state)
+    for key, value in fields.items():
+        setattr(state, key, value)
+    db.commit()
+    db.refresh(state)
+    return state
+
+
+def get_ledger_entries(
+    db: Session, user_id: str, sheet_id: str, months: list[str]
+) -> list[LedgerEntry]:
+    """取得指定月份的鏡像記錄（依月份、分頁順序排序）"""
+    result = db.execute(
+        select(LedgerEntry)
+        .where(
+            LedgerEntry.user_id == user_id,
+            LedgerEntry.sheet_id == sheet_id,
+            LedgerEntry.month.in_(months),
+        )
+        .order_by(LedgerEntry.month, LedgerEntry.position)
+    )
+    return list(result.scalars().all())
+
+
+def replace_ledger_month(
+    db: Session, user_id: str, sheet_id: str, month: str, rows: list[dict]
+) -> None:
+    """以新的資料列取代某月份的鏡像記錄（不 commit）"""
+    from sqlalchemy import delete
+
+    db.execute(
+        delete(LedgerEntry).where(
+            LedgerEntry.user_id == user_id,
+            LedgerEntry.sheet_id == sheet_id,
+            LedgerEntry.month == month,
+        )
+    )
+    db.add_all(
+        LedgerEntry(
+            user_id=user_id, sheet_id=sheet_id, month=month, position=position, **row
+        )
+        for position, row in enumerate(rows)
+    )
+
+
+def add_ledger_entries(
+    db: Session, user_id: str, sheet_id: str, month: str, rows: list[dict]
+) -> None:
+    """在某月份的鏡像記錄末端新增資料列"""
+    from sqlalchemy import func
+
+    last_position = db.execute(
+        select(func.max(LedgerEntry.position)).where(
+            LedgerEntry.user_id == user_id,
+            LedgerEntry.sheet_id == sheet_id,
+            LedgerEntry.month == month,
+        )
+    ).scalar()
+    start = 0 if last_position is None else last_position + 1
+    db.add_all(
+        LedgerEntry(
+            user_id=user_id, sheet_id=sheet_id, month=month, position=start + i, **row
+        )
+        for i, row in enumerate(rows)
+    )
+    db.commit()
+
+
+# =========================
+# MonthlyAggregate CRUD
+# =========================
+
+
+def get_monthly_aggregate(
+    db: Session, user_id: str, sheet_id: str, month: str
+) -> Optional[MonthlyAggregate]:
+    """取得月度統計物化結果"""
+    result = db.execute(
+        select(MonthlyAggregate).where(
+            MonthlyAggregate.user_id == user_id,
+            MonthlyAggregate.sheet_id == sheet_id,
+            MonthlyAggregate.month == month,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+def save_monthly_aggregate(
+    db: Session, user_id: str, sheet_id: str, month: str, **fields
+) -> MonthlyAggregate:
+    """建立或更新月度統計物化結果"""
+    aggregate = get_monthly_aggregate(db, user_id, sheet_id, month)
+    if aggregate is None:
+        aggregate = MonthlyAggregate(user_id=user_id, sheet_id=sheet_id, month=month)
+        db.add(aggregate)
+    for key, value in fields.items():
+        setattr(aggregate, key, value)
+    aggregate.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(aggregate)
+    return aggregate
+
+
+def delete_monthly_aggregates(
+    db: Session, user_id: str, sheet_id: str, months: list[str]
+) -> int:
+    """刪除月度統計物化結果（資料變動需重新計算時）"""
+    from sqlalchemy import delete
+
+    if not months:
+        return 0
+    result = db.execute(
+        delete(MonthlyAggregate).where(
+            MonthlyAggregate.user_id == user_id,
+            MonthlyAggregate.sheet_id == sheet_id,
+            MonthlyAggregate.month.in_(months),
+        )
+    )
+    db.commit()
+    return result.rowcount or 0
+
+
+# =========================
+# ParseCacheEntry CRUD
+# =========================
+
+
+def get_parse_cache_entry(
+    db: Session, user_id: str, text_key: str
+) -> Optional[ParseCacheEntry]:
+    """取得解析結果快取"""
+    result = db.execute(
+        select(ParseCacheEntry).where(
+            ParseCacheEntry.user_id == user_id,
+            ParseCacheEntry.text_key == text_key,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+def save_parse_cache_entry(
+    db: Session, user_id: str, text_key: str, fields: str, max_entries: int
+) -> ParseCacheEntry:
+    """
+    建立或更新解析結果快取
+
+    每位用戶最多保留 max_entries 筆，超過時刪除最舊的項目。
+    """
+    from sqlalchemy import delete, func
+
+    entry = get_parse_cache_entry(db, user_id, text_key)
+    if entry is None:
+        entry = ParseCacheEntry(user_id=user_id, text_key=text_key)
+        db.add(entry)
+    entry.fields = fields
+    entry.created_at = datetime.utcnow()
+    db.flush()
+
+    count = db.execute(
+        select(func.count(ParseCacheEntry.id)).where(
+            ParseCacheEntry.user_id == user_id
+        )
+    ).scalar()
+    if count > max_entries:
+        oldest = (
+            select(ParseCacheEntry.id)
+            .where(ParseCacheEntry.user_id == user_id)
+            .order_by(ParseCacheEntry.created_at, ParseCacheEntry.id)
+            .limit(count - max_entries)
+        )
+        db.execute(
+            delete(ParseCacheEntry).where(
+                ParseCacheEntry.id.in_(oldest.scalar_subquery())
+            )
+        )
+    db.commit()
+    return entry
+
+
+def delete_parse_cache_entry(db: Session, user_id: str, text_key: str) -> None:
+    """刪除解析結果快取（已過期時）"""
+    entry = get_parse_cache_entry(db, user_id, text_key)
+    if entry is not None:
+        db.delete(entry)
+        db.commit()
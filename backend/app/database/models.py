@@ -3,7 +3,17 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import String, Boolean, DateTime, ForeignKey, Text, Integer
+from sqlalchemy import (
+    String,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Text,
+    Integer,
+    Float,
+    Index,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.engine import Base
@@ -199,3 +209,127 @@ class QueryHistory(Base):
 
     # 關聯
     user: Mapped["User"] = relationship(back_populates="query_history")
+
+
+class PendingSheetWrite(Base):
+    """待寫入 Google Sheet 的記帳記錄（write-behind 佇列）"""
+
+    __tablename__ = "pending_sheet_writes"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)  # record_id
+    user_id: Mapped[str] = mapped_column(
+        String(255),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sheet_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    month: Mapped[str] = mapped_column(String(7), nullable=False)  # YYYY-MM
+    row: Mapped[str] = mapped_column(Text, nullable=False)  # JSON 格式的資料列
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+
+class LedgerEntry(Base):
+    """Google Sheet 記帳記錄的本地鏡像"""
+
+    __tablename__ = "ledger_entries"
+    __table_args__ = (
+        Index("idx_ledger_entries_user_sheet_month", "user_id", "sheet_id", "month"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String(255),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sheet_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    month: Mapped[str] = mapped_column(String(7), nullable=False)  # 分頁名稱 YYYY-MM
+    position: Mapped[int] = mapped_column(Integer, nullable=False)  # 分頁中的順序
+    # 以下欄位保留 Sheet 儲存格原始文字
+    time: Mapped[str] = mapped_column(String(32), default="", nullable=False)
+    name: Mapped[str] = mapped_column(String(255), default="", nullable=False)
+    category: Mapped[str] = mapped_column(String(50), default="", nullable=False)
+    amount: Mapped[str] = mapped_column(String(50), default="", nullable=False)
+    currency: Mapped[str] = mapped_column(String(10), default="", nullable=False)
+    payment_method: Mapped[str] = mapped_column(
+        String(50), default="", nullable=False
+    )
+
+
+class LedgerSyncState(Base):
+    """本地鏡像的同步狀態"""
+
+    __tablename__ = "ledger_sync_state"
+    __table_args__ = (UniqueConstraint("user_id", "sheet_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String(255),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sheet_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    worksheets: Mapped[str] = mapped_column(
+        Text, default="[]", nullable=False
+    )  # JSON 格式的分頁名稱列表
+    drive_modified_time: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True
+    )  # 上次同步時 Drive 的 modifiedTime
+    checked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    self_write_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )  # 本服務最後一次寫入 Sheet 的時間
+
+
+class MonthlyAggregate(Base):
+    """每月消費統計的物化結果"""
+
+    __tablename__ = "monthly_aggregates"
+    __table_args__ = (UniqueConstraint("user_id", "sheet_id", "month"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String(255),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sheet_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    month: Mapped[str] = mapped_column(String(7), nullable=False)  # YYYY-MM
+    total: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    record_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    by_category: Mapped[str] = mapped_column(
+        Text, default="{}", nullable=False
+    )  # JSON：各類別金額
+    by_category_count: Mapped[str] = mapped_column(
+        Text, default="{}", nullable=False
+    )  # JSON：各類別筆數
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    reconciled_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )  # 上次以完整資料重新計算的時間
+
+
+class ParseCacheEntry(Base):
+    """記帳語句解析結果快取（依正規化後的語句）"""
+
+    __tablename__ = "parse_cache_entries"
+    __table_args__ = (UniqueConstraint("user_id", "text_key"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String(255),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    text_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    fields: Mapped[str] = mapped_column(
+        Text, nullable=False
+    )  # JSON：名稱、類別、花費、幣別、支付方式（不含時間）
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
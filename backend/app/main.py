@@ -1,5 +1,6 @@
 """FastAPI 應用程式入口"""
 
+import asyncio
 import logging
 
 from fastapi import FastAPI, Request
@@ -10,8 +11,12 @@ from app.config import settings
 from app.api import health, accounting, auth, speech, sheets
 from app.database import init_db, close_db
 from app.utils.exceptions import AppException
-from app.services.openai_service import OpenAIServiceError
+from app.services.openai_service import OpenAIServiceError, openai_service
 from app.services.user_sheets_service import GoogleSheetsError
+from app.services.google_api_client import close_http_client
+from app.services.feedback_tasks import feedback_tasks
+from app.services.tts_cache import tts_cache
+from app.services.write_behind_queue import sheet_write_queue
 
 # 設定日誌
 logging.basicConfig(
@@ -33,6 +38,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[accounting.UPSTREAM_CALLS_HEADER],
 )
 
 
@@ -141,10 +147,34 @@ async def startup_event():
     init_db()
     logger.info("Database initialized")
 
+    # 補寫上次關閉前未寫入 Sheet 的記錄
+    app.state.write_behind_recovery = asyncio.create_task(
+        sheet_write_queue.flush_all()
+    )
+
+    # 背景預先合成常用語句（不阻塞啟動）
+    if settings.TTS_CACHE_ENABLED and settings.TTS_CACHE_PREWARM_PHRASES:
+        app.state.tts_prewarm = asyncio.create_task(
+            tts_cache.prewarm(
+                settings.TTS_CACHE_PREWARM_PHRASES, settings.TTS_CACHE_PREWARM_VOICE
+            )
+        )
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """應用程式關閉時執行"""
+    flushed = await sheet_write_queue.flush_all()
+    logger.info(f"Write-behind queue flushed: {flushed} record(s)")
+
+    await feedback_tasks.close()
+
+    await close_http_client()
+    logger.info("Google API connection pool closed")
+
+    await openai_service.close()
+    logger.info("OpenAI connection pool closed")
+
     close_db()
     logger.info("Database connection closed")
 
@@ -1,7 +1,7 @@
 """Pydantic 資料模型"""
 
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 # =========================
@@ -13,6 +13,12 @@ class AccountingRequest(BaseModel):
     """記帳請求"""
 
     text: str = Field(..., description="語音轉文字內容", example="中午吃排骨便當120元")
+    feedback_deadline: Optional[float] = Field(
+        default=None,
+        ge=0,
+        le=30,
+        description="最多等待理財回饋幾秒，逾時則改為背景產生（未提供時使用預設值，0 表示不等待）",
+    )
 
 
 class AccountingRecord(BaseModel):
@@ -32,9 +38,79 @@ class AccountingResponse(BaseModel):
     """記帳回應"""
 
     success: bool = True
-    record: AccountingRecord
+    record: AccountingRecord = Field(..., description="第一筆記錄")
+    records: List[AccountingRecord] = Field(
+        default_factory=list, description="本次建立的所有記錄（一句話可包含多筆）"
+    )
     message: str
     feedback: Optional[str] = Field(default=None, description="理財回饋建議")
+    record_id: Optional[str] = Field(default=None, description="第一筆記錄的 ID")
+    record_ids: List[str] = Field(default_factory=list, description="所有記錄的 ID")
+    queued: bool = Field(
+        default=False, description="是否已排入 write-behind 佇列（尚未寫入 Sheet）"
+    )
+    parse_path: str = Field(
+        default="llm", description="解析路徑：rule（規則快速解析）、cache（解析快取）或 llm"
+    )
+    feedback_status: str = Field(
+        default="ready",
+        description="理財回饋狀態：ready、pending（背景產生中，可輪詢）或 failed",
+    )
+
+
+class BatchRecordItem(BaseModel):
+    """批次記帳項目：原始語句或已結構化的記錄（二擇一）"""
+
+    client_id: Optional[str] = Field(default=None, description="用戶端的項目 ID")
+    text: Optional[str] = Field(default=None, description="語音轉文字內容")
+    record: Optional[AccountingRecord] = Field(default=None, description="已結構化的記錄")
+    recorded_at: Optional[str] = Field(
+        default=None,
+        description="用戶端記錄時間（ISO 8601），解析 text 時作為記帳時間",
+        example="2026-02-01T12:30:00+08:00",
+    )
+
+    @model_validator(mode="after")
+    def _check_one_source(self):
+        if (self.text is None) == (self.record is None):
+            raise ValueError("text 與 record 必須提供其中一個")
+        return self
+
+
+class BatchRecordRequest(BaseModel):
+    """批次記帳請求（離線佇列補傳）"""
+
+    items: List[BatchRecordItem] = Field(..., min_length=1)
+
+
+class BatchRecordResult(BaseModel):
+    """批次記帳項目結果"""
+
+    index: int
+    client_id: Optional[str] = None
+    status: str = Field(..., description="ok 或 error")
+    records: List[AccountingRecord] = Field(default_factory=list)
+    record_ids: List[str] = Field(default_factory=list)
+    parse_path: Optional[str] = Field(default=None, description="rule、cache、llm 或 structured")
+    error: Optional[str] = None
+
+
+class BatchRecordResponse(BaseModel):
+    """批次記帳回應"""
+
+    success: bool = True
+    results: List[BatchRecordResult]
+    written: int = Field(..., description="成功寫入的記錄筆數")
+    failed: int = Field(..., description="失敗的項目數")
+
+
+class FeedbackResponse(BaseModel):
+    """理財回饋查詢回應"""
+
+    success: bool = True
+    record_id: str
+    status: str = Field(..., description="ready、pending 或 failed")
+    feedback: Optional[str] = None
 
 
 # =========================
@@ -168,6 +244,10 @@ class DashboardSummary(BaseModel):
     recent_records: List[RecentRecord] = Field(default_factory=list)
     daily_trend: List[DailyTrend] = Field(default_factory=list)
     budget: BudgetStatus
+    section_status: Dict[str, str] = Field(
+        default_factory=dict,
+        description="各區塊狀態：ok / timeout / error",
+    )
 
 
 class DashboardSummaryResponse(BaseModel):
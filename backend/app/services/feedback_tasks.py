@@ -0,0 +1,119 @@
+"""記帳後理財回饋的背景產生
+
+理財回饋需要讀取當月統計並呼叫一次 LLM，是記帳回應中最慢的部分。
+/record 寫入記錄後即在背景開始產生回饋，最多只等待一段期限；逾時則先回應
+記帳結果，用戶端再以記錄 ID 輪詢回饋。
+
+結果只保存在記憶體中一段時間（輪詢需送到同一個程序）。
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Dict, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_PENDING = "pending"
+STATUS_READY = "ready"
+STATUS_FAILED = "failed"
+
+
+class _FeedbackTask:
+    __slots__ = ("user_id", "task", "created_at")
+
+    def __init__(self, user_id: str, task: asyncio.Task):
+        self.user_id = user_id
+        self.task = task
+        self.created_at = time.monotonic()
+
+
+class FeedbackTasks:
+    """以記錄 ID 追蹤背景產生中的理財回饋"""
+
+    def __init__(self, ttl_seconds: float):
+        """
+        初始化
+
+        Args:
+            ttl_seconds: 回饋產生後保留多久供輪詢
+        """
+        self.ttl_seconds = ttl_seconds
+        self._tasks: Dict[str, _FeedbackTask] = {}
+
+    def _prune(self) -> None:
+        """移除已完成且超過保留時間的項目"""
+        now = time.monotonic()
+        expired = [
+            record_id
+            for record_id, entry in self._tasks.items()
+            if entry.task.done() and now - entry.created_at > self.ttl_seconds
+        ]
+        for record_id in expired:
+            del self._tasks[record_id]
+
+    def start(
+        self, record_id: str, user_id: str, feedback: Awaitable[Optional[str]]
+    ) -> None:
+        """
+        在背景開始產生回饋
+
+        Args:
+            record_id: 記錄 ID
+            user_id: 用戶 ID（輪詢時驗證）
+            feedback: 產生回饋的 coroutine
+        """
+        self._prune()
+        task = asyncio.ensure_future(feedback)
+        task.add_done_callback(lambda t: self._log_failure(record_id, t))
+        self._tasks[record_id] = _FeedbackTask(user_id, task)
+
+    @staticmethod
+    def _log_failure(record_id: str, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Failed to generate feedback for {record_id}: {task.exception()}")
+
+    @staticmethod
+    def _result(task: asyncio.Task) -> Tuple[str, Optional[str]]:
+        if not task.done():
+            return STATUS_PENDING, None
+        if task.cancelled() or task.exception() is not None:
+            return STATUS_FAILED, None
+        feedback = task.result()
+        return (STATUS_READY, feedback) if feedback else (STATUS_FAILED, None)
+
+    async def wait(
+        self, record_id: str, timeout: float, user_id: Optional[str] = None
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        等待回饋產生（逾時不會取消背景產生）
+
+        Args:
+            record_id: 記錄 ID
+            timeout: 最多等待秒數（0 表示只查詢目前狀態）
+            user_id: 提供時只回傳該用戶的記錄
+
+        Returns:
+            Optional[Tuple[str, Optional[str]]]: (狀態, 回饋)；記錄不存在時回傳 None
+        """
+        entry = self._tasks.get(record_id)
+        if entry is None or (user_id is not None and entry.user_id != user_id):
+            return None
+        if timeout > 0 and not entry.task.done():
+            await asyncio.wait({entry.task}, timeout=timeout)
+        return self._result(entry.task)
+
+    async def close(self) -> None:
+        """取消尚未完成的回饋（應用程式關閉時呼叫）"""
+        pending = [entry.task for entry in self._tasks.values() if not entry.task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+        self._tasks.clear()
+
+
+# 單例模式
+feedback_tasks = FeedbackTasks(ttl_seconds=settings.FEEDBACK_RESULT_TTL_SECONDS)
@@ -0,0 +1,293 @@
+"""Google Sheets / Drive 非同步 REST 客戶端
+
+直接以 httpx 呼叫 Google REST API，取代 googleapiclient 的同步 `.execute()`，
+避免 Sheets 回應緩慢時阻塞整個事件迴圈。所有用戶共用同一個 keep-alive
+連線池，每次請求只需建立輕量的 GoogleAPIClient（不需再執行 build()）。
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import httpx
+from google.oauth2.credentials import Credentials
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
+
+
+class GoogleAPIError(Exception):
+    """Google API 呼叫錯誤"""
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(f"<HTTP {status_code}> {message}")
+
+
+# 跨請求共用的 HTTP 連線池
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """取得共用的 httpx AsyncClient（延遲建立）"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.GOOGLE_API_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.GOOGLE_API_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GOOGLE_API_MAX_CONNECTIONS,
+                keepalive_expiry=settings.GOOGLE_API_KEEPALIVE_SECONDS,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """關閉共用的連線池（應用程式關閉時呼叫）"""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+def _encode_range(range_: str) -> str:
+    """將 A1 range 編碼為 URL path 片段"""
+    return quote(range_, safe="")
+
+
+def _render_params(
+    value_render_option: Optional[str], date_time_render_option: Optional[str]
+) -> Dict[str, str]:
+    """values.get / batchGet 的呈現方式參數（未指定則使用 API 預設值）"""
+    params = {}
+    if value_render_option:
+        params["valueRenderOption"] = value_render_option
+    if date_time_render_option:
+        params["dateTimeRenderOption"] = date_time_render_option
+    return params
+
+
+class GoogleAPIClient:
+    """以用戶 OAuth Credentials 呼叫 Google Sheets / Drive REST API"""
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        初始化客戶端
+
+        Args:
+            credentials: 用戶的 Google OAuth Credentials
+            http_client: 自訂 httpx AsyncClient（預設使用共用連線池）
+        """
+        self.credentials = credentials
+        self._http_client = http_client
+        self._refresh_lock = asyncio.Lock()
+        self.call_count = 0
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        return self._http_client or get_http_client()
+
+    async def _refresh_token(self) -> None:
+        """
+        使用 Refresh Token 取得新的 Access Token
+
+        Raises:
+            GoogleAPIError: 刷新失敗時拋出（status 401）
+        """
+        from app.services.oauth_service import oauth_service
+
+        async with self._refresh_lock:
+            if self.credentials.token and not self.credentials.expired:
+                return
+            try:
+                access_token, expires_at = await oauth_service.refresh_access_token(
+                    self.credentials.refresh_token
+                )
+            except (ValueError, KeyError, httpx.HTTPError) as e:
+                # Refresh Token 被撤銷或過期：以 401 回報，讓呼叫端統一處理
+                raise GoogleAPIError(401, f"Token refresh failed: {e}")
+            self.credentials.token = access_token
+            self.credentials.expiry = expires_at
+            logger.info("Refreshed Google access token for API client")
+
+    async def _ensure_token(self) -> None:
+        """確保 Access Token 可用，過期則自動刷新"""
+        if self.credentials.token and not self.credentials.expired:
+            return
+        if not self.credentials.refresh_token:
+            raise GoogleAPIError(401, "Access token expired and no refresh token")
+        await self._refresh_token()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        發送 API 請求
+
+        Args:
+            method: HTTP 方法
+            url: 完整 API URL
+            params: Query 參數
+            json: Request body
+
+        Returns:
+            Dict: 解析後的 JSON 回應
+
+        Raises:
+            GoogleAPIError: API 回傳錯誤狀態碼時拋出
+        """
+        await self._ensure_token()
+
+        for attempt in range(2):
+            self.call_count += 1
+            try:
+                response = await self.http_client.request(
+                    method,
+                    url,
+                    params=params,
+                    json=json,
+                    headers={"Authorization": f"Bearer {self.credentials.token}"},
+                )
+            except httpx.HTTPError as e:
+                raise GoogleAPIError(503, f"Connection error: {e}")
+
+            # Token 被撤銷或提前失效：刷新一次後重試
+            if (
+                response.status_code == 401
+                and attempt == 0
+                and self.credentials.refresh_token
+            ):
+                self.credentials.expiry = None
+                self.credentials.token = None
+                await self._refresh_token()
+                continue
+            break
+
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("error", {}).get("message", "")
+            except ValueError:
+                message = response.text
+            raise GoogleAPIError(response.status_code, message or response.reason_phrase)
+
+        if not response.content:
+            return {}
+        return response.json()
+
+    # =========================
+    # Sheets API
+    # =========================
+
+    async def spreadsheets_get(self, sheet_id: str, fields: str) -> Dict[str, Any]:
+        """spreadsheets.get"""
+        return await self.request(
+            "GET", f"{SHEETS_API_URL}/{sheet_id}", params={"fields": fields}
+        )
+
+    async def spreadsheets_create(self, body: Dict, fields: str) -> Dict[str, Any]:
+        """spreadsheets.create"""
+        return await self.request(
+            "POST", SHEETS_API_URL, params={"fields": fields}, json=body
+        )
+
+    async def spreadsheets_batch_update(
+        self, sheet_id: str, body: Dict
+    ) -> Dict[str, Any]:
+        """spreadsheets.batchUpdate"""
+        return await self.request(
+            "POST", f"{SHEETS_API_URL}/{sheet_id}:batchUpdate", json=body
+        )
+
+    async def values_get(
+        self,
+        sheet_id: str,
+        range_: str,
+        value_render_option: Optional[str] = None,
+        date_time_render_option: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """spreadsheets.values.get"""
+        return await self.request(
+            "GET",
+            f"{SHEETS_API_URL}/{sheet_id}/values/{_encode_range(range_)}",
+            params=_render_params(value_render_option, date_time_render_option),
+        )
+
+    async def values_batch_get(
+        self,
+        sheet_id: str,
+        ranges: List[str],
+        value_render_option: Optional[str] = None,
+        date_time_render_option: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """spreadsheets.values.batchGet"""
+        params: Dict[str, Any] = {"ranges": ranges}
+        params.update(_render_params(value_render_option, date_time_render_option))
+        return await self.request(
+            "GET",
+            f"{SHEETS_API_URL}/{sheet_id}/values:batchGet",
+            params=params,
+        )
+
+    async def values_append(
+        self,
+        sheet_id: str,
+        range_: str,
+        body: Dict,
+        value_input_option: str = "USER_ENTERED",
+        insert_data_option: str = "INSERT_ROWS",
+    ) -> Dict[str, Any]:
+        """spreadsheets.values.append"""
+        return await self.request(
+            "POST",
+            f"{SHEETS_API_URL}/{sheet_id}/values/{_encode_range(range_)}:append",
+            params={
+                "valueInputOption": value_input_option,
+                "insertDataOption": insert_data_option,
+            },
+            json=body,
+        )
+
+    async def values_update(
+        self,
+        sheet_id: str,
+        range_: str,
+        body: Dict,
+        value_input_option: str = "RAW",
+    ) -> Dict[str, Any]:
+        """spreadsheets.values.update"""
+        return await self.request(
+            "PUT",
+            f"{SHEETS_API_URL}/{sheet_id}/values/{_encode_range(range_)}",
+            params={"valueInputOption": value_input_option},
+            json=body,
+        )
+
+    # =========================
+    # Drive API
+    # =========================
+
+    async def files_list(self, **params: Any) -> Dict[str, Any]:
+        """drive.files.list"""
+        params = {key: value for key, value in params.items() if value is not None}
+        return await self.request("GET", f"{DRIVE_API_URL}/files", params=params)
+
+    async def files_get(self, file_id: str, fields: str) -> Dict[str, Any]:
+        """drive.files.get"""
+        return await self.request(
+            "GET", f"{DRIVE_API_URL}/files/{file_id}", params={"fields": fields}
+        )
@@ -0,0 +1,201 @@
+"""理財知識問答快取（跨用戶共用）
+
+「什麼是定期定額」、「信用卡循環利息怎麼算」這類知識問題與用戶的帳務無關，
+不同用戶經常問同樣的問題。意圖分類為 knowledge 的問題，回答以正規化後的
+問題為 key 快取，所有用戶共用：
+
+- 正規化時移除「請問」、「什麼是」、「是什麼」等問句框架，
+  「什麼是 ETF」與「ETF 是什麼？」為同一個 key，直接命中
+- 否則以字元 bigram 的 TF-IDF 向量在本地計算 cosine 相似度，相似度達門檻
+  的最相近問題視為同一問題（例如「循環利息怎麼算」與「信用卡循環利息怎麼算」）
+- LRU 淘汰，筆數有上限，項目超過 TTL 即失效
+"""
+
+import logging
+import math
+import re
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from app.config import settings
+from app.services.parse_cache import MAX_KEY_LENGTH, normalize_utterance
+
+logger = logging.getLogger(__name__)
+
+# 不影響問題主題的問句框架（在 normalize_utterance 之後移除）
+_QUESTION_FRAME = re.compile(
+    r"請問|什麼是|是什麼|什麼意思|意思|介紹一下|解釋一下|一下|的|嗎|呢|啊|呀"
+)
+
+
+def question_key(query: str) -> str:
+    """快取 key：正規化後移除問句框架"""
+    return _QUESTION_FRAME.sub("", normalize_utterance(query))
+
+
+def char_ngrams(text: str, n: int = 2) -> Counter:
+    """字元 n-gram 的出現次數（短於 n 的文字以整段為一個 gram）"""
+    if len(text) < n:
+        return Counter([text]) if text else Counter()
+    return Counter(text[i : i + n] for i in range(len(text) - n + 1))
+
+
+class _Entry:
+    """快取項目"""
+
+    __slots__ = ("answer", "stored_at", "grams")
+
+    def __init__(self, answer: str, stored_at: float, grams: Counter):
+        self.answer = answer
+        self.stored_at = stored_at
+        self.grams = grams
+
+
+class KnowledgeAnswerCache:
+    """以 LRU + TTL 管理、支援相似問題命中的知識問答快取"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int, similarity: float):
+        """
+        初始化快取
+
+        Args:
+            max_entries: 最多快取幾個問題
+            ttl_seconds: 快取項目有效時間
+            similarity: 相似問題命中的 cosine 相似度門檻（1 為只接受相同問題）
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # gram -> 含有該 gram 的問題（也用來計算 IDF 的 document frequency）
+        self._index: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def _expired(self, entry: _Entry) -> bool:
+        return time.time() - entry.stored_at > self.ttl_seconds
+
+    def _idf(self, gram: str) -> float:
+        # 平滑 IDF：快取中越少問題出現的 gram 權重越高
+        df = len(self._index.get(gram, ()))
+        return math.log((1 + len(self._entries)) / (1 + df)) + 1
+
+    def _norm(self, grams: Counter) -> float:
+        return math.sqrt(sum((tf * self._idf(g)) ** 2 for g, tf in grams.items()))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        for gram in entry.grams:
+            keys = self._index[gram]
+            keys.discard(key)
+            if not keys:
+                del self._index[gram]
+
+    def _most_similar(self, grams: Counter) -> Tuple[Optional[str], float]:
+        """找出與問題最相似的快取問題與相似度"""
+        candidates = set()
+        for gram in grams:
+            candidates |= self._index.get(gram, set())
+        if not candidates:
+            return None, 0.0
+
+        query_norm = self._norm(grams)
+        best_key, best_score = None, 0.0
+        for key in candidates:
+            entry = self._entries[key]
+            dot = sum(
+                tf * entry.grams[g] * self._idf(g) ** 2
+                for g, tf in grams.items()
+                if g in entry.grams
+            )
+            score = dot / (query_norm * self._norm(entry.grams))
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+    def get(self, query: str) -> Optional[str]:
+        """
+        查詢快取
+
+        Args:
+            query: 用戶的問題
+
+        Returns:
+            Optional[str]: 命中時回傳快取的回答
+        """
+        key = question_key(query)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return None
+
+        entry = self._entries.get(key)
+        matched = key
+        if entry is None:
+            matched, score = self._most_similar(char_ngrams(key))
+            if matched is not None and score >= self.similarity:
+                entry = self._entries[matched]
+                logger.info(
+                    f"Knowledge cache similar hit: {query!r} ~ {matched!r} ({score:.2f})"
+                )
+
+        if entry is not None and self._expired(entry):
+            self._remove(matched)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(matched)
+        self.hits += 1
+        if matched != key:
+            self.similar_hits += 1
+        return entry.answer
+
+    def put(self, query: str, answer: str) -> None:
+        """
+        保存回答
+
+        Args:
+            query: 用戶的問題
+            answer: LLM 的回答
+        """
+        key = question_key(query)
+        if not key or len(key) > MAX_KEY_LENGTH or not answer:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        grams = char_ngrams(key)
+        self._entries[key] = _Entry(answer, time.time(), grams)
+        for gram in grams:
+            self._index.setdefault(gram, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def stats(self) -> Dict:
+        """命中率統計"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        """清除快取與統計"""
+        self._entries.clear()
+        self._index.clear()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+
+# 單例模式
+knowledge_cache = KnowledgeAnswerCache(
+    max_entries=settings.KNOWLEDGE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.KNOWLEDGE_CACHE_TTL_SECONDS,
+    similarity=settings.KNOWLEDGE_CACHE_SIMILARITY,
+)
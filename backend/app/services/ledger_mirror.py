@@ -0,0 +1,242 @@
+"""記帳記錄本地鏡像
+
+將用戶 Google Sheet 的記帳記錄鏡像到本地資料庫，讓統計、摘要與查詢
+不必每次都重新下載整個月份分頁。
+
+同步策略：
+- 寫入記錄時同步寫入鏡像（write-through）
+- 超過新鮮度期限時，以 Drive modifiedTime 判斷 Sheet 是否被外部修改；
+  有變更才重新讀取，且只改寫內容有差異的月份
+- 每隔一段時間強制完整校正一次
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.crud import (
+    add_ledger_entries,
+    get_ledger_entries,
+    get_ledger_sync_state,
+    get_pending_sheet_writes,
+    replace_ledger_month,
+    save_ledger_sync_state,
+)
+from app.database.models import LedgerEntry, LedgerSyncState
+from app.services.ledger_rows import DEFAULT_DECODER, LedgerRow
+
+logger = logging.getLogger(__name__)
+
+# Drive modifiedTime 與本地時間的容許誤差
+OWN_WRITE_SKEW = timedelta(seconds=5)
+
+
+def _row_to_columns(row: LedgerRow) -> Dict[str, str]:
+    """將解碼後的記錄轉換為鏡像欄位（時間與金額使用正規化文字）"""
+    return {
+        "time": row.time_text,
+        "name": row.name,
+        "category": row.category,
+        "amount": row.amount_text,
+        "currency": row.currency,
+        "payment_method": row.payment_method,
+    }
+
+
+def _entry_to_row(entry: LedgerEntry) -> LedgerRow:
+    """將鏡像記錄轉換為與 Sheet 讀取結果相同的 LedgerRow"""
+    return LedgerRow(
+        entry.time,
+        entry.name,
+        entry.category,
+        entry.amount,
+        entry.currency,
+        entry.payment_method,
+    )
+
+
+def _parse_drive_time(value: Optional[str]) -> Optional[datetime]:
+    """解析 Drive modifiedTime（RFC 3339，UTC）為 naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+    except ValueError:
+        return None
+
+
+class LedgerMirror:
+    """單一用戶、單一 Sheet 的本地鏡像"""
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: str,
+        sheet_id: str,
+        freshness_seconds: int = settings.LEDGER_MIRROR_FRESHNESS_SECONDS,
+        resync_seconds: int = settings.LEDGER_MIRROR_RESYNC_SECONDS,
+    ):
+        """
+        初始化鏡像
+
+        Args:
+            db: 資料庫 Session
+            user_id: 用戶 ID
+            sheet_id: Google Sheet ID
+            freshness_seconds: 上次檢查後多久內直接使用本地資料
+            resync_seconds: 多久強制完整校正一次
+        """
+        self.db = db
+        self.user_id = user_id
+        self.sheet_id = sheet_id
+        self.freshness = timedelta(seconds=freshness_seconds)
+        self.resync_interval = timedelta(seconds=resync_seconds)
+
+    def _state(self) -> Optional[LedgerSyncState]:
+        return get_ledger_sync_state(self.db, self.user_id, self.sheet_id)
+
+    def is_fresh(self) -> bool:
+        """是否在新鮮度期限內（不需檢查 Drive）"""
+        state = self._state()
+        if state is None or state.synced_at is None or state.checked_at is None:
+            return False
+        return datetime.utcnow() - state.checked_at < self.freshness
+
+    def needs_resync(self, modified_time: Optional[str]) -> bool:
+        """
+        根據 Drive modifiedTime 判斷是否需要重新同步
+
+        Sheet 最後一次修改若來自本服務的寫入（已 write-through），則不需重新同步。
+        """
+        state = self._state()
+        if state is None or state.synced_at is None:
+            return True
+        if datetime.utcnow() - state.synced_at > self.resync_interval:
+            return True
+        if modified_time == state.drive_modified_time:
+            return False
+
+        modified_at = _parse_drive_time(modified_time)
+        return not (
+            modified_at is not None
+            and state.self_write_at is not None
+            and modified_at <= state.self_write_at + OWN_WRITE_SKEW
+        )
+
+    def mark_checked(self, modified_time: Optional[str]) -> None:
+        """記錄已確認鏡像為最新"""
+        save_ledger_sync_state(
+            self.db,
+            self.user_id,
+            self.sheet_id,
+            drive_modified_time=modified_time,
+            checked_at=datetime.utcnow(),
+        )
+
+    def worksheets(self) -> List[str]:
+        """鏡像中的分頁名稱列表"""
+        state = self._state()
+        return json.loads(state.worksheets) if state else []
+
+    def read_months(self, months: List[str]) -> Dict[str, List[LedgerRow]]:
+        """
+        讀取鏡像中的月份記錄
+
+        Returns:
+            Dict[str, List[LedgerRow]]: 與 UserSheetsService 讀取結果相同格式，
+            不存在的分頁不會出現在結果中
+        """
+        existing = set(self.worksheets())
+        wanted = [month for month in months if month in existing]
+        records_by_month: Dict[str, List[LedgerRow]] = {month: [] for month in wanted}
+        for entry in get_ledger_entries(self.db, self.user_id, self.sheet_id, wanted):
+            records_by_month[entry.month].append(_entry_to_row(entry))
+        return records_by_month
+
+    def _pending_rows(self) -> Dict[str, List[Dict]]:
+        """尚在 write-behind 佇列中、未寫入 Sheet 的記錄"""
+        pending: Dict[str, List[Dict]] = {}
+        for item in get_pending_sheet_writes(self.db, sheet_id=self.sheet_id):
+            row = DEFAULT_DECODER.decode(json.loads(item.row))
+            pending.setdefault(item.month, []).append(_row_to_columns(row))
+        return pending
+
+    def replace_all(
+        self,
+        worksheets: List[str],
+        records_by_month: Dict[str, List[LedgerRow]],
+        modified_time: Optional[str],
+    ) -> List[str]:
+        """
+        以 Sheet 內容校正鏡像，只改寫有差異的月份
+
+        Args:
+            worksheets: Sheet 中的分頁名稱
+            records_by_month: 各分頁的記錄（讀取失敗的分頁不在其中，保留原鏡像）
+            modified_time: 同步時的 Drive modifiedTime
+
+        Returns:
+            List[str]: 內容有變動的月份
+        """
+        pending = self._pending_rows()
+        months = list(dict.fromkeys(list(records_by_month) + list(pending)))
+        local = self.read_months(months)
+
+        changed = []
+        for month in months:
+            rows = [
+                _row_to_columns(r) for r in records_by_month.get(month, [])
+            ] + pending.get(month, [])
+            if [_row_to_columns(r) for r in local.get(month, [])] == rows:
+                continue
+            replace_ledger_month(self.db, self.user_id, self.sheet_id, month, rows)
+            changed.append(month)
+
+        # 刪除 Sheet 中已不存在的月份
+        for month in set(self.worksheets()) - set(worksheets) - set(pending):
+            replace_ledger_month(self.db, self.user_id, self.sheet_id, month, [])
+            changed.append(month)
+
+        now = datetime.utcnow()
+        save_ledger_sync_state(
+            self.db,
+            self.user_id,
+            self.sheet_id,
+            worksheets=json.dumps(sorted(set(worksheets) | set(pending))),
+            drive_modified_time=modified_time,
+            checked_at=now,
+            synced_at=now,
+        )
+        logger.info(
+            f"Ledger mirror synced for sheet {self.sheet_id}: {len(changed)} month(s) changed"
+        )
+        return changed
+
+    def add_records(self, month: str, records: List[LedgerRow]) -> None:
+        """寫入記錄後同步更新鏡像（write-through）"""
+        state = self._state()
+        if state is None or state.synced_at is None:
+            # 尚未完整同步過，下次讀取時會完整同步
+            return
+
+        add_ledger_entries(
+            self.db,
+            self.user_id,
+            self.sheet_id,
+            month,
+            [_row_to_columns(r) for r in records],
+        )
+        worksheets = self.worksheets()
+        if month not in worksheets:
+            worksheets = sorted(worksheets + [month])
+        save_ledger_sync_state(
+            self.db,
+            self.user_id,
+            self.sheet_id,
+            worksheets=json.dumps(worksheets),
+            self_write_at=datetime.utcnow(),
+        )
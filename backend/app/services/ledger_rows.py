@@ -0,0 +1,154 @@
+"""記帳資料列解碼
+
+Sheet 讀取時使用 UNFORMATTED_VALUE 與 SERIAL_NUMBER，金額為數字、時間為
+試算表序列值（自 1899-12-30 起的天數）。每列只在讀取時解碼一次為
+LedgerRow，預先解析時間、日期與金額，統計、趨勢、篩選與排序直接使用
+解碼後的欄位，不再重複 float() 與字串切片。
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SHEET_HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+
+# Sheet 讀取時的值呈現方式
+VALUE_RENDER_OPTION = "UNFORMATTED_VALUE"
+DATE_TIME_RENDER_OPTION = "SERIAL_NUMBER"
+
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+# Google Sheets 序列日期的起點
+SERIAL_EPOCH = datetime(1899, 12, 30)
+
+
+def parse_time(value: Any) -> Tuple[Optional[datetime], str]:
+    """
+    解析時間欄位
+
+    Returns:
+        (timestamp, 正規化文字)：無法解析時 timestamp 為 None，文字保留原值
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        timestamp = SERIAL_EPOCH + timedelta(seconds=round(value * 86400))
+    else:
+        text = "" if value is None else str(value).strip()
+        try:
+            timestamp = datetime.fromisoformat(text)
+        except ValueError:
+            return None, text
+    if timestamp.second:
+        return timestamp, timestamp.strftime(f"{TIME_FORMAT}:%S")
+    return timestamp, timestamp.strftime(TIME_FORMAT)
+
+
+def parse_amount(value: Any) -> Tuple[Optional[float], str]:
+    """
+    解析金額欄位
+
+    Returns:
+        (amount, 正規化文字)：無法解析時 amount 為 None，文字保留原值
+    """
+    try:
+        amount = float(value)
+    except (ValueError, TypeError):
+        return None, "" if value is None else str(value)
+    if amount.is_integer():
+        return amount, str(int(amount))
+    return amount, repr(amount)
+
+
+class LedgerRow:
+    """解碼後的單筆記帳記錄"""
+
+    __slots__ = (
+        "timestamp",
+        "time_text",
+        "date",
+        "name",
+        "category",
+        "amount",
+        "amount_text",
+        "currency",
+        "payment_method",
+    )
+
+    def __init__(
+        self,
+        time: Any,
+        name: str = "",
+        category: str = "",
+        amount: Any = "",
+        currency: str = "",
+        payment_method: str = "",
+    ):
+        self.timestamp, self.time_text = parse_time(time)
+        self.date = (
+            self.timestamp.strftime("%Y-%m-%d")
+            if self.timestamp is not None
+            else self.time_text[:10]
+        )
+        self.name = name
+        self.category = category
+        self.amount, self.amount_text = parse_amount(amount)
+        self.currency = currency
+        self.payment_method = payment_method
+
+    @property
+    def amount_value(self):
+        """金額（整數金額以 int 呈現，無法解析時為原始文字）"""
+        if self.amount is None:
+            return self.amount_text
+        return int(self.amount) if self.amount.is_integer() else self.amount
+
+    def to_dict(self) -> Dict:
+        """轉換為以 Sheet 標題為 key 的 dict（API 與 LLM 上下文使用）"""
+        return {
+            "時間": self.time_text,
+            "名稱": self.name,
+            "類別": self.category,
+            "花費": self.amount_value,
+            "幣別": self.currency,
+            "支付方式": self.payment_method,
+        }
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+class RowDecoder:
+    """依分頁標題列預先決定欄位位置的資料列解碼器"""
+
+    def __init__(self, headers: Sequence[Any] = SHEET_HEADERS):
+        positions = {_text(header).strip(): i for i, header in enumerate(headers)}
+        self._positions = [positions.get(header) for header in SHEET_HEADERS]
+
+    def decode(self, row: Sequence[Any]) -> LedgerRow:
+        """解碼單一資料列（缺少的欄位視為空白）"""
+        size = len(row)
+        time, name, category, amount, currency, payment_method = (
+            row[i] if i is not None and i < size else "" for i in self._positions
+        )
+        return LedgerRow(
+            time,
+            _text(name),
+            _text(category),
+            amount,
+            _text(currency),
+            _text(payment_method),
+        )
+
+    def decode_rows(self, rows: Sequence[Sequence[Any]]) -> List[LedgerRow]:
+        """解碼多列資料，略過空白列"""
+        return [self.decode(row) for row in rows if row]
+
+
+# 依 SHEET_HEADERS 欄位順序的解碼器（無標題列的尾端讀取、鏡像與佇列使用）
+DEFAULT_DECODER = RowDecoder()
+
+
+def decode_values(values: List[List[Any]]) -> List[LedgerRow]:
+    """解碼整個分頁的資料（第一列為標題）"""
+    if len(values) <= 1:  # 只有標題或沒有資料
+        return []
+    return RowDecoder(values[0]).decode_rows(values[1:])
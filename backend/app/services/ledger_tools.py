@@ -0,0 +1,286 @@
+"""財務小助手的帳務查詢工具（function calling）
+
+工具模式不再把當月統計、近期明細與多月趨勢全部塞進 prompt，而是提供
+查詢工具讓模型自行取得需要的資料：
+
+- sum_by_category：日期範圍內各類別的支出合計
+- list_records：日期範圍內的記錄（可依類別、名稱篩選）
+- compare_months：比較兩個月份的統計
+
+工具透過 UserSheetsService 讀取（鏡像與月度統計可用時不呼叫 Sheets API）。
+每個請求的工具呼叫次數與總執行時間都有上限，超過後工具回傳錯誤，
+模型必須以已取得的資料回答。
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 單次查詢的日期範圍上限
+MAX_RANGE_DAYS = 366
+# list_records 單次最多回傳幾筆
+MAX_LIST_RECORDS = 50
+
+_MONTH = re.compile(r"^\d{4}-\d{2}$")
+
+_DATE_RANGE_PROPERTIES = {
+    "start_date": {"type": "string", "description": "開始日期（YYYY-MM-DD，含）"},
+    "end_date": {"type": "string", "description": "結束日期（YYYY-MM-DD，含）"},
+}
+
+TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "sum_by_category",
+            "description": "計算日期範圍內的總支出、筆數與各類別支出",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    **_DATE_RANGE_PROPERTIES,
+                    "category": {
+                        "type": "string",
+                        "description": "只計算此類別（可選）",
+                    },
+                },
+                "required": ["start_date", "end_date"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_records",
+            "description": "列出日期範圍內的消費記錄",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    **_DATE_RANGE_PROPERTIES,
+                    "category": {"type": "string", "description": "類別（可選）"},
+                    "keyword": {
+                        "type": "string",
+                        "description": "名稱包含的關鍵字（可選）",
+                    },
+                    "order": {
+                        "type": "string",
+                        "enum": ["recent", "largest"],
+                        "description": "recent：最新的在前；largest：金額大的在前",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": f"最多回傳幾筆（預設 20，上限 {MAX_LIST_RECORDS}）",
+                    },
+                },
+                "required": ["start_date", "end_date"],
+            },
+        },
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compare_months",
+            "description": "比較兩個月份的總支出與各類別支出",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "month_a": {"type": "string", "description": "月份（YYYY-MM）"},
+                    "month_b": {"type": "string", "description": "月份（YYYY-MM）"},
+                },
+                "required": ["month_a", "month_b"],
+            },
+        },
+    },
+]
+
+
+class ToolError(Exception):
+    """工具參數錯誤（回傳給模型，不中斷查詢）"""
+
+
+def _parse_date(value: Any, field: str) -> date:
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise ToolError(f"{field} 必須是 YYYY-MM-DD 格式")
+
+
+def _date_range(arguments: Dict[str, Any]) -> Tuple[str, str]:
+    start = _parse_date(arguments.get("start_date"), "start_date")
+    end = _parse_date(arguments.get("end_date"), "end_date")
+    if start > end:
+        raise ToolError("start_date 不可晚於 end_date")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ToolError(f"日期範圍最多 {MAX_RANGE_DAYS} 天")
+    return start.isoformat(), end.isoformat()
+
+
+def _amount(record: Dict) -> float:
+    amount = record.get("花費")
+    return amount if isinstance(amount, (int, float)) else 0
+
+
+class LedgerTools:
+    """單一請求的帳務查詢工具（限制呼叫次數與總執行時間）"""
+
+    definitions = TOOL_DEFINITIONS
+
+    def __init__(
+        self,
+        sheets_service,
+        sheet_id: str,
+        max_calls: int = settings.QUERY_TOOL_MAX_CALLS,
+        time_budget_seconds: float = settings.QUERY_TOOL_TIME_BUDGET_SECONDS,
+    ):
+        """
+        初始化
+
+        Args:
+            sheets_service: 用戶的 UserSheetsService
+            sheet_id: Google Sheet ID
+            max_calls: 每個請求最多呼叫幾次工具
+            time_budget_seconds: 每個請求的工具總執行時間上限
+        """
+        self.sheets_service = sheets_service
+        self.sheet_id = sheet_id
+        self.max_calls = max_calls
+        self.time_budget = time_budget_seconds
+        self.calls = 0
+        self._elapsed = 0.0
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict]]] = {
+            "sum_by_category": self.sum_by_category,
+            "list_records": self.list_records,
+            "compare_months": self.compare_months,
+        }
+
+    @property
+    def exhausted(self) -> bool:
+        """是否已用完本次請求的工具額度"""
+        return self.calls >= self.max_calls or self._elapsed >= self.time_budget
+
+    async def call(self, name: str, arguments: str) -> str:
+        """
+        執行工具
+
+        Args:
+            name: 工具名稱
+            arguments: 模型產生的 JSON 參數
+
+        Returns:
+            str: JSON 結果（失敗時為 {"error": "..."}，交給模型處理）
+        """
+        if self.exhausted:
+            return self._error("已達本次查詢的工具使用上限，請以已取得的資料回答")
+        self.calls += 1
+
+        handler = self._handlers.get(name)
+        if handler is None:
+            return self._error(f"未知的工具：{name}")
+        try:
+            parsed = json.loads(arguments or "{}")
+        except json.JSONDecodeError:
+            parsed = None
+        if not isinstance(parsed, dict):
+            return self._error("參數不是有效的 JSON 物件")
+
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                handler(parsed), timeout=max(self.time_budget - self._elapsed, 0.01)
+            )
+        except ToolError as e:
+            return self._error(str(e))
+        except asyncio.TimeoutError:
+            logger.warning(f"Ledger tool {name} timed out")
+            return self._error("查詢逾時")
+        except Exception as e:
+            logger.warning(f"Ledger tool {name} failed: {e}")
+            return self._error("讀取帳務資料失敗")
+        finally:
+            self._elapsed += time.monotonic() - started
+
+        logger.info(f"Ledger tool {name}({parsed}) took {time.monotonic() - started:.2f}s")
+        return json.dumps(result, ensure_ascii=False)
+
+    @staticmethod
+    def _error(message: str) -> str:
+        return json.dumps({"error": message}, ensure_ascii=False)
+
+    async def _records(self, arguments: Dict[str, Any]) -> Tuple[str, str, List[Dict]]:
+        start_date, end_date = _date_range(arguments)
+        records = await self.sheets_service.get_records_by_date_range(
+            self.sheet_id, start_date, end_date
+        )
+        category = arguments.get("category")
+        if category:
+            records = [r for r in records if r.get("類別") == category]
+        return start_date, end_date, records
+
+    async def sum_by_category(self, arguments: Dict[str, Any]) -> Dict:
+        """日期範圍內的總支出、筆數與各類別支出"""
+        start_date, end_date, records = await self._records(arguments)
+        by_category: Dict[str, Dict[str, float]] = {}
+        for record in records:
+            entry = by_category.setdefault(record.get("類別", ""), {"total": 0, "count": 0})
+            entry["total"] += _amount(record)
+            entry["count"] += 1
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "total": sum(entry["total"] for entry in by_category.values()),
+            "record_count": len(records),
+            "by_category": by_category,
+        }
+
+    async def list_records(self, arguments: Dict[str, Any]) -> Dict:
+        """日期範圍內的記錄（可依類別、名稱篩選）"""
+        _, _, records = await self._records(arguments)
+        keyword = arguments.get("keyword")
+        if keyword:
+            records = [r for r in records if keyword in str(r.get("名稱", ""))]
+
+        if arguments.get("order") == "largest":
+            records = sorted(records, key=_amount, reverse=True)
+        else:
+            records = sorted(records, key=lambda r: str(r.get("時間", "")), reverse=True)
+
+        try:
+            limit = int(arguments.get("limit") or 20)
+        except (TypeError, ValueError):
+            limit = 20
+        limit = max(1, min(limit, MAX_LIST_RECORDS))
+        return {
+            "records": records[:limit],
+            "matched": len(records),
+            "truncated": len(records) > limit,
+        }
+
+    async def compare_months(self, arguments: Dict[str, Any]) -> Dict:
+        """比較兩個月份的統計"""
+        months = [str(arguments.get("month_a", "")), str(arguments.get("month_b", ""))]
+        if not all(_MONTH.match(month) for month in months):
+            raise ToolError("month_a 與 month_b 必須是 YYYY-MM 格式")
+
+        stats_a, stats_b = await self.sheets_service.get_multi_month_stats(
+            self.sheet_id, months
+        )
+        categories = sorted(set(stats_a.by_category) | set(stats_b.by_category))
+        return {
+            "month_a": stats_a.model_dump(),
+            "month_b": stats_b.model_dump(),
+            "difference": {
+                "total": stats_b.total - stats_a.total,
+                "by_category": {
+                    category: stats_b.by_category.get(category, 0)
+                    - stats_a.by_category.get(category, 0)
+                    for category in categories
+                },
+            },
+        }
@@ -0,0 +1,122 @@
+"""月度統計物化結果
+
+將每位用戶每月的總額、筆數與各類別統計存放在資料庫中。寫入記錄時以 O(1)
+累加更新，讓「寫入後立即查詢當月統計」（例如記帳後的理財回饋）不必重新
+讀取整個月份。物化結果會定期以完整資料重新計算，鏡像同步發現資料變動時
+則直接作廢。
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.crud import (
+    delete_monthly_aggregates,
+    get_monthly_aggregate,
+    save_monthly_aggregate,
+)
+from app.models.schemas import AccountingRecord, MonthlyStats
+
+logger = logging.getLogger(__name__)
+
+
+class MonthlyAggregateStore:
+    """單一用戶、單一 Sheet 的月度統計物化結果"""
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: str,
+        sheet_id: str,
+        reconcile_seconds: int = settings.MONTHLY_AGGREGATE_RECONCILE_SECONDS,
+    ):
+        """
+        初始化
+
+        Args:
+            db: 資料庫 Session
+            user_id: 用戶 ID
+            sheet_id: Google Sheet ID
+            reconcile_seconds: 多久以完整資料重新計算一次
+        """
+        self.db = db
+        self.user_id = user_id
+        self.sheet_id = sheet_id
+        self.reconcile_interval = timedelta(seconds=reconcile_seconds)
+
+    def get(self, month: str) -> Optional[MonthlyStats]:
+        """取得月度統計，不存在或需要重新計算時回傳 None"""
+        aggregate = get_monthly_aggregate(self.db, self.user_id, self.sheet_id, month)
+        if aggregate is None:
+            return None
+        if datetime.utcnow() - aggregate.reconciled_at > self.reconcile_interval:
+            return None
+        return MonthlyStats(
+            month=month,
+            total=aggregate.total,
+            record_count=aggregate.record_count,
+            by_category=json.loads(aggregate.by_category),
+            by_category_count=json.loads(aggregate.by_category_count),
+        )
+
+    def save(self, stats: MonthlyStats) -> None:
+        """以完整資料計算出的統計覆寫物化結果"""
+        aggregate = get_monthly_aggregate(
+            self.db, self.user_id, self.sheet_id, stats.month
+        )
+        if aggregate is not None and (
+            round(aggregate.total, 2) != round(stats.total, 2)
+            or aggregate.record_count != stats.record_count
+        ):
+            logger.warning(
+                f"Monthly aggregate drift for {self.sheet_id}/{stats.month}: "
+                f"total {aggregate.total} -> {stats.total}, "
+                f"count {aggregate.record_count} -> {stats.record_count}"
+            )
+
+        save_monthly_aggregate(
+            self.db,
+            self.user_id,
+            self.sheet_id,
+            stats.month,
+            total=stats.total,
+            record_count=stats.record_count,
+            by_category=json.dumps(stats.by_category, ensure_ascii=False),
+            by_category_count=json.dumps(stats.by_category_count, ensure_ascii=False),
+            reconciled_at=datetime.utcnow(),
+        )
+
+    def apply_record(self, month: str, record: AccountingRecord) -> None:
+        """
+        寫入一筆記錄後累加更新物化結果
+
+        尚未有物化結果的月份不處理，下次查詢時會以完整資料計算。
+        """
+        aggregate = get_monthly_aggregate(self.db, self.user_id, self.sheet_id, month)
+        if aggregate is None:
+            return
+
+        by_category = json.loads(aggregate.by_category)
+        by_category_count = json.loads(aggregate.by_category_count)
+        by_category[record.類別] = by_category.get(record.類別, 0) + record.花費
+        by_category_count[record.類別] = by_category_count.get(record.類別, 0) + 1
+
+        save_monthly_aggregate(
+            self.db,
+            self.user_id,
+            self.sheet_id,
+            month,
+            total=aggregate.total + record.花費,
+            record_count=aggregate.record_count + 1,
+            by_category=json.dumps(by_category, ensure_ascii=False),
+            by_category_count=json.dumps(by_category_count, ensure_ascii=False),
+        )
+
+    def invalidate(self, months: List[str]) -> None:
+        """作廢指定月份的物化結果（資料被外部修改時）"""
+        if delete_monthly_aggregates(self.db, self.user_id, self.sheet_id, months):
+            logger.info(f"Invalidated monthly aggregates for {self.sheet_id}: {months}")
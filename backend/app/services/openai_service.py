@@ -1,18 +1,114 @@
 """OpenAI LLM 服務"""
 
+import asyncio
+import contextlib
 import json
 import logging
+import random
+import time
+from collections import deque
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from typing import Optional, Dict, Any
-
-from openai import OpenAI, APIError, RateLimitError, APIConnectionError
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Dict, Any, TypeVar
+
+import httpx
+from openai import (
+    AsyncOpenAI,
+    APIError,
+    APIStatusError,
+    RateLimitError,
+    APIConnectionError,
+    InternalServerError,
+)
 
 from app.config import settings
 from app.models.schemas import AccountingRecord, MonthlyStats
+from app.services.ledger_tools import LedgerTools
+from app.services.prompt_cache_metrics import prompt_cache_metrics
+from app.utils.sentences import split_sentences
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+TTS_MODEL = "gpt-4o-mini-tts"
+
+# 單一語句最多解析出幾筆記錄
+MAX_RECORDS_PER_UTTERANCE = 10
+
+# 以下 system prompt 為固定內容（不含時間等變動資料），讓每次請求的開頭完全相同，
+# 可命中 OpenAI 的 prompt 前綴快取；變動資料一律放在用戶訊息。
+
+# 記帳解析 system prompt
+PARSE_SYSTEM_PROMPT = """你是我的記帳小助手，我會給你一串訊息，訊息中可能包含一筆或多筆消費。
+請找出每一筆消費，並整理出以下資訊：
+- "時間"：當下時間戳（格式：YYYY-MM-DD HH:MM）
+- "名稱"：花費內容名稱
+- "類別"：屬於哪一種類（飲食、交通、娛樂、購物、居住、醫療、教育、其他）
+- "花費"：金額（數字）
+- "幣別"：哪一種貨幣，若未提供默認為 TWD
+- "支付方式"：支付方式（現金、信用卡、悠遊卡等），若未提供可為 null
+
+請用 JSON 格式回答：{"records": [每一筆消費的物件]}，
+依訊息中出現的順序排列，不要包含其他說明文字。"""
+
+# 記帳回饋 system prompt
+FEEDBACK_SYSTEM_PROMPT = """你是一個友善的理財小助手。根據用戶的消費記錄和統計資料，給出簡短的理財建議。
+回覆要求：
+- 簡短（1-2 句話）
+- 友善且正面
+- 如果有統計資料，可以提及消費佔比或趨勢
+- 不要過度說教"""
+
+# 財務小助手 system prompt
+QUERY_SYSTEM_PROMPT = """你是「財務小助手」，一個友善且專業的個人理財 AI 助理。
+
+你的能力包括：
+1. **帳務查詢**：根據用戶的消費統計資料和明細記錄回答問題
+2. **趨勢分析**：比較不同月份的消費變化，分析消費趨勢
+3. **消費建議**：根據用戶的消費模式，提供個人化的省錢建議
+4. **預算規劃**：根據過往消費模式，建議合理的月度預算分配
+5. **財經知識**：解答儲蓄、投資、信用卡、貸款、稅務、保險等基礎理財知識
+6. **日常閒聊**：友善回應問候、感謝等日常對話，並適時引導用戶使用記帳功能
+
+回覆原則：
+- 使用繁體中文，語氣友善自然
+- 帳務問題請根據提供的統計資料和明細回答，提供具體數字
+- 趨勢分析時，請計算變化幅度並給出簡要解讀
+- 消費建議請針對用戶的高消費類別給出具體可行的建議
+- 預算規劃時，請根據歷史消費數據建議各類別的預算金額，並說明如何追蹤
+- 財經知識問題請給出簡潔易懂的解釋
+- 涉及投資建議時，請加入免責聲明：「以上僅供參考，不構成投資建議，建議諮詢專業理財顧問」
+- 不要提供具體的股票、基金推薦或買賣時機建議
+- 閒聊時保持親切，可以適時提醒用戶記帳的重要性
+- 請根據用戶問題的類型適當回答"""
+
+# 工具模式附加的說明（帳務資料由模型呼叫工具取得）
+QUERY_TOOLS_PROMPT = """
+
+查詢帳務資料：
+- 帳務問題請呼叫工具取得需要的資料，不要猜測數字
+- 日期以用戶時區計算（目前時間見用戶訊息），例如「這個月」為本月 1 日到今天
+- 只查詢回答需要的範圍；財經知識與閒聊不需要呼叫工具"""
+
+# 可重試的錯誤：速率限制、連線錯誤（含逾時）、伺服器錯誤
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """從錯誤回應的 Retry-After（或 retry-after-ms）標頭取得建議等待秒數"""
+    if not isinstance(error, APIStatusError):
+        return None
+    headers = error.response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
 
 class OpenAIServiceError(Exception):
     """OpenAI 服務錯誤"""
@@ -26,51 +122,73 @@ class OpenAIServiceError(Exception):
 class OpenAIService:
     """OpenAI 服務類別"""
 
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        """
+        初始化服務
+
+        Args:
+            client: 自訂 AsyncOpenAI 客戶端（預設使用共用 keep-alive 連線池）
+        """
+        # 重試由 _with_retry 處理，關閉 SDK 內建重試以免重複等待
+        self.client = client or AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+                ),
+            ),
+        )
         self.model = settings.OPENAI_MODEL
-        self.max_retries = 3
+        self.timeout = settings.OPENAI_TIMEOUT_SECONDS
+        self.max_retries = settings.OPENAI_MAX_RETRIES
+        self.retry_base_delay = settings.OPENAI_RETRY_BASE_DELAY_SECONDS
+        self.retry_max_delay = settings.OPENAI_RETRY_MAX_DELAY_SECONDS
+
+    async def close(self) -> None:
+        """關閉連線池（應用程式關閉時呼叫）"""
+        await self.client.close()
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """
+        計算重試前的等待秒數
+
+        優先使用伺服器提供的 Retry-After；否則使用指數退避加上 full jitter，
+        避免多個請求同時重試。
+        """
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            return min(retry_after, self.retry_max_delay)
+        return random.uniform(
+            0, min(self.retry_max_delay, self.retry_base_delay * 2**attempt)
+        )
 
-    def _call_with_retry(self, messages: list, response_format: dict = None) -> str:
+    async def _with_retry(self, operation: Callable[[], Awaitable[T]]) -> T:
         """
-        帶重試機制的 API 呼叫
+        帶重試機制的 API 呼叫（以 asyncio.sleep 等待，不阻塞事件迴圈）
 
         Args:
-            messages: 訊息列表
-            response_format: 回應格式
+            operation: 執行單次 API 呼叫的 coroutine function
 
         Returns:
-            str: API 回應內容
+            API 回應
         """
         last_error = None
 
         for attempt in range(self.max_retries):
             try:
-                kwargs = {
-                    "model": self.model,
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 512,
-                }
-                if response_format:
-                    kwargs["response_format"] = response_format
-
-                response = self.client.chat.completions.create(**kwargs)
-                return response.choices[0].message.content
+                return await operation()
 
-            except RateLimitError as e:
+            except RETRYABLE_ERRORS as e:
                 logger.warning(
-                    f"Rate limit hit, attempt {attempt + 1}/{self.max_retries}"
+                    f"OpenAI call failed ({type(e).__name__}), "
+                    f"attempt {attempt + 1}/{self.max_retries}"
                 )
                 last_error = e
                 if attempt < self.max_retries - 1:
-                    import time
-
-                    time.sleep(2**attempt)  # 指數退避
-
-            except APIConnectionError as e:
-                logger.error(f"API connection error: {e}")
-                last_error = e
+                    await asyncio.sleep(self._retry_delay(attempt, e))
 
             except APIError as e:
                 logger.error(f"API error: {e}")
@@ -80,36 +198,128 @@ class OpenAIService:
             "RETRY_EXHAUSTED", f"重試次數已達上限：{str(last_error)}"
         )
 
-    async def parse_accounting_text(self, text: str) -> AccountingRecord:
+    async def _call_with_retry(
+        self,
+        messages: list,
+        response_format: dict = None,
+        max_tokens: int = 512,
+        kind: str = "chat",
+    ) -> str:
+        """
+        帶重試機制的 Chat Completions 呼叫
+
+        Args:
+            messages: 訊息列表
+            response_format: 回應格式
+            max_tokens: 回應長度上限
+            kind: 呼叫類型（記錄 prompt 快取統計用）
+
+        Returns:
+            str: API 回應內容
+        """
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": max_tokens,
+            "timeout": self.timeout,
+        }
+        if response_format:
+            kwargs["response_format"] = response_format
+
+        async def create():
+            started = time.monotonic()
+            response = await self.client.chat.completions.create(**kwargs)
+            prompt_cache_metrics.record(kind, response.usage, time.monotonic() - started)
+            return response
+
+        response = await self._with_retry(create)
+        return response.choices[0].message.content
+
+    async def _stream_chunks(self, kwargs: dict, kind: str) -> AsyncIterator[Any]:
+        """
+        建立串流並輸出有內容的 chunk
+
+        只有建立串流時會重試；開始輸出內容後中斷則直接拋出錯誤，
+        避免已送出的內容重複。串流結束時以最後一個 chunk 的 usage 與
+        第一個 chunk 的延遲記錄 prompt 快取統計。
+
+        Args:
+            kwargs: Chat Completions 參數（不含 stream 設定）
+            kind: 呼叫類型（記錄 prompt 快取統計用）
+
+        Yields:
+            Chat Completions chunk（略過只有 usage 的 chunk）
+        """
+        kwargs = {**kwargs, "stream": True, "stream_options": {"include_usage": True}}
+        started = time.monotonic()
+
+        async def create():
+            nonlocal started
+            started = time.monotonic()
+            return await self.client.chat.completions.create(**kwargs)
+
+        stream = await self._with_retry(create)
+        latency = None
+        usage = None
+        async for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            if latency is None:
+                latency = time.monotonic() - started
+            yield chunk
+
+        if latency is None:
+            latency = time.monotonic() - started
+        prompt_cache_metrics.record(kind, usage, latency)
+
+    async def _stream_with_retry(
+        self, messages: list, kind: str = "chat_stream"
+    ) -> AsyncIterator[str]:
+        """
+        帶重試機制的串流 Chat Completions 呼叫
+
+        Args:
+            messages: 訊息列表
+            kind: 呼叫類型（記錄 prompt 快取統計用）
+
+        Yields:
+            str: 回應內容片段
+        """
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": 512,
+            "timeout": self.timeout,
+        }
+        async for chunk in self._stream_chunks(kwargs, kind):
+            if chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def parse_accounting_records(
+        self, text: str, now: Optional[datetime] = None
+    ) -> List[AccountingRecord]:
         """
-        解析記帳文字，提取結構化資料
+        解析記帳文字，提取結構化資料（一句話可包含多筆消費）
 
         Args:
-            text: 使用者輸入的記帳文字，如 "中午吃排骨便當120元"
+            text: 使用者輸入的記帳文字，如 "中午吃排骨便當120元"、
+                "早餐蛋餅45，午餐便當120，晚上捷運30"
+            now: 記帳時間（預設為現在；離線補傳時為用戶端記錄的時間）
 
         Returns:
-            AccountingRecord: 結構化的記帳記錄
+            List[AccountingRecord]: 結構化的記帳記錄（依語句中出現的順序）
 
         Raises:
             OpenAIServiceError: 解析失敗時拋出
         """
-        current_time = datetime.now()
+        current_time = now or datetime.now()
 
         messages = [
-            {
-                "role": "system",
-                "content": """
-                    你是我的記帳小助手，我會給你一串訊息，根據訊息幫我整理出以下資訊：
-                    - "時間"：當下時間戳（格式：YYYY-MM-DD HH:MM）
-                    - "名稱"：花費內容名稱
-                    - "類別"：屬於哪一種類（飲食、交通、娛樂、購物、居住、醫療、教育、其他）
-                    - "花費"：金額（數字）
-                    - "幣別"：哪一種貨幣，若未提供默認為 TWD
-                    - "支付方式"：支付方式（現金、信用卡、悠遊卡等），若未提供可為 null
-
-                    請用 JSON 格式回答，不要包含其他說明文字。
-                """,
-            },
+            {"role": "system", "content": PARSE_SYSTEM_PROMPT},
             {
                 "role": "user",
                 "content": f"current_time: {current_time}, user_content: {text}",
@@ -117,56 +327,66 @@ class OpenAIService:
         ]
 
         try:
-            content = self._call_with_retry(messages, {"type": "json_object"})
+            # 多筆記錄的 JSON 較長，放寬回應長度上限
+            content = await self._call_with_retry(
+                messages, {"type": "json_object"}, max_tokens=1024, kind="parse"
+            )
             data = json.loads(content)
             logger.info(f"Parsed accounting: {data}")
-            return AccountingRecord(**data)
+            # 相容只回傳單一物件的回應
+            items = data.get("records", [data])
+            if not isinstance(items, list) or not items:
+                raise OpenAIServiceError("PARSE_ERROR", "無法從內容中找到記帳資料")
+            return [
+                AccountingRecord(**item) for item in items[:MAX_RECORDS_PER_UTTERANCE]
+            ]
 
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error: {e}")
             raise OpenAIServiceError("PARSE_ERROR", "無法解析 LLM 回應")
 
+        except OpenAIServiceError:
+            raise
+
         except Exception as e:
             logger.error(f"Unexpected error: {e}")
             raise OpenAIServiceError("UNKNOWN_ERROR", f"解析失敗：{str(e)}")
 
     async def generate_feedback(
-        self, record: AccountingRecord, stats: Optional[MonthlyStats] = None
+        self, records: List[AccountingRecord], stats: Optional[MonthlyStats] = None
     ) -> str:
         """
         生成理財回饋建議
 
         Args:
-            record: 剛記錄的消費
+            records: 剛記錄的消費（同一句話中的所有記錄）
             stats: 月度統計資料（可選）
 
         Returns:
             str: 理財建議文字
         """
+        categories = list(dict.fromkeys(record.類別 for record in records))
         stats_info = ""
         if stats:
-            category_amount = stats.by_category.get(record.類別, 0)
+            category_lines = "\n".join(
+                f"- {category}類別已花費：{stats.by_category.get(category, 0)} 元"
+                for category in categories
+            )
             stats_info = f"""
 本月統計：
 - 總支出：{stats.total} 元
-- {record.類別}類別已花費：{category_amount} 元
+{category_lines}
 - 記錄筆數：{stats.record_count} 筆"""
 
+        recorded = "、".join(
+            f"{record.類別} - {record.名稱} {record.花費}{record.幣別}" for record in records
+        )
+
         messages = [
-            {
-                "role": "system",
-                "content": """
-                    你是一個友善的理財小助手。根據用戶的消費記錄和統計資料，給出簡短的理財建議。
-                    回覆要求：
-                    - 簡短（1-2 句話）
-                    - 友善且正面
-                    - 如果有統計資料，可以提及消費佔比或趨勢
-                    - 不要過度說教
-                """,
-            },
+            {"role": "system", "content": FEEDBACK_SYSTEM_PROMPT},
             {
                 "role": "user",
-                "content": f"""用戶剛記錄：{record.類別} - {record.名稱} {record.花費}{record.幣別}
+                "content": f"""用戶剛記錄：{recorded}
 {stats_info}
 
 請給出簡短的理財回饋。""",
@@ -174,11 +394,13 @@ class OpenAIService:
         ]
 
         try:
-            feedback = self._call_with_retry(messages)
+            feedback = await self._call_with_retry(messages, kind="feedback")
             return feedback.strip()
         except Exception as e:
             logger.warning(f"Failed to generate feedback: {e}")
-            return f"已記錄 {record.名稱} {record.花費}{record.幣別}"
+            return "已記錄 " + "、".join(
+                f"{record.名稱} {record.花費}{record.幣別}" for record in records
+            )
 
     async def text_to_speech(
         self, text: str, voice: str = "nova", speed: float = 1.0
@@ -196,11 +418,14 @@ class OpenAIService:
         """
         try:
             # 使用 gpt-4o-mini-tts 模型，對多語言（包括中文）有更好的支援
-            response = self.client.audio.speech.create(
-                model="gpt-4o-mini-tts",
-                voice=voice,
-                input=text,
-                speed=speed,
+            response = await self._with_retry(
+                lambda: self.client.audio.speech.create(
+                    model=TTS_MODEL,
+                    voice=voice,
+                    input=text,
+                    speed=speed,
+                    timeout=self.timeout,
+                )
             )
             return response.content
 
@@ -208,35 +433,92 @@ class OpenAIService:
             logger.error(f"TTS error: {e}")
             raise OpenAIServiceError("TTS_ERROR", f"語音合成失敗：{str(e)}")
 
-    async def answer_query(
-        self,
-        query: str,
-        stats: MonthlyStats,
-        user_timezone: str = "Asia/Taipei",
-        recent_records: Optional[list] = None,
-        multi_month_stats: Optional[list] = None,
-    ) -> str:
+    async def stream_text_to_speech(
+        self, text: str, voice: str = "nova", speed: float = 1.0
+    ) -> AsyncIterator[bytes]:
         """
-        回答用戶查詢（財務小助手）
+        串流文字轉語音：收到音訊區塊就立即轉送，不在記憶體中組合完整 MP3
 
-        支援多種查詢模式：
-        - 帳務統計查詢：根據統計資料回答消費相關問題
-        - 歷史明細查詢：根據明細記錄回答特定消費問題
-        - 趨勢分析：根據多月統計比較消費變化
-        - 財經知識問答：回答理財、投資、儲蓄等基礎知識
-        - 消費建議：根據消費模式提供個人化建議
-        - 日常閒聊：友善回應問候和一般對話
+        只有建立連線時會重試；開始輸出音訊後中斷則直接拋出錯誤。
 
         Args:
-            query: 用戶的問題
-            stats: 當月統計資料
-            user_timezone: 用戶時區（IANA 格式，如 "Asia/Taipei"）
-            recent_records: 近期消費明細記錄（可選）
-            multi_month_stats: 多月統計資料（可選，用於趨勢分析）
+            text: 要轉換的文字
+            voice: 聲音選擇
+            speed: 語速 (0.25 到 4.0)
 
-        Returns:
-            str: 回答內容
+        Yields:
+            bytes: MP3 音訊區塊
         """
+        try:
+            async with contextlib.AsyncExitStack() as stack:
+                response = await self._with_retry(
+                    lambda: stack.enter_async_context(
+                        self.client.audio.speech.with_streaming_response.create(
+                            model=TTS_MODEL,
+                            voice=voice,
+                            input=text,
+                            speed=speed,
+                            timeout=self.timeout,
+                        )
+                    )
+                )
+                async for chunk in response.iter_bytes(settings.TTS_STREAM_CHUNK_BYTES):
+                    yield chunk
+
+        except Exception as e:
+            logger.error(f"TTS stream error: {e}")
+            raise OpenAIServiceError("TTS_ERROR", f"語音合成失敗：{str(e)}")
+
+    async def stream_sentences_to_speech(
+        self, text: str, voice: str = "nova", speed: float = 1.0
+    ) -> AsyncIterator[bytes]:
+        """
+        分句管線式語音合成
+
+        長文字依句子切分：第一句以串流合成立即輸出，同時預先合成後續最多
+        TTS_PIPELINE_DEPTH 句；各句音訊依原順序接續輸出（MP3 可直接串接播放）。
+
+        Args:
+            text: 要轉換的文字
+            voice: 聲音選擇
+            speed: 語速 (0.25 到 4.0)
+
+        Yields:
+            bytes: MP3 音訊區塊
+        """
+        sentences = split_sentences(text) or [text]
+        pending: deque = deque()
+        next_index = 1
+
+        def schedule() -> None:
+            nonlocal next_index
+            while (
+                next_index < len(sentences)
+                and len(pending) < settings.TTS_PIPELINE_DEPTH
+            ):
+                pending.append(
+                    asyncio.create_task(
+                        self.text_to_speech(sentences[next_index], voice, speed)
+                    )
+                )
+                next_index += 1
+
+        try:
+            schedule()
+            async for chunk in self.stream_text_to_speech(sentences[0], voice, speed):
+                yield chunk
+            while pending:
+                audio = await pending.popleft()
+                schedule()
+                yield audio
+        finally:
+            # 用戶端中斷或合成失敗時，取消尚未使用的預先合成
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    def _current_time_text(user_timezone: str) -> str:
+        """用戶時區的目前時間（放入查詢訊息）"""
         try:
             tz = ZoneInfo(user_timezone)
         except Exception:
@@ -246,85 +528,260 @@ class OpenAIService:
             tz = ZoneInfo("Asia/Taipei")
 
         current_time = datetime.now(tz)
-        current_time_text = (
-            f"{current_time.strftime('%Y-%m-%d %H:%M %z')} ({user_timezone})"
-        )
-
-        # 財務小助手 system prompt
-        system_prompt = """你是「財務小助手」，一個友善且專業的個人理財 AI 助理。
-
-你的能力包括：
-1. **帳務查詢**：根據用戶的消費統計資料和明細記錄回答問題
-2. **趨勢分析**：比較不同月份的消費變化，分析消費趨勢
-3. **消費建議**：根據用戶的消費模式，提供個人化的省錢建議
-4. **預算規劃**：根據過往消費模式，建議合理的月度預算分配
-5. **財經知識**：解答儲蓄、投資、信用卡、貸款、稅務、保險等基礎理財知識
-6. **日常閒聊**：友善回應問候、感謝等日常對話，並適時引導用戶使用記帳功能
+        return f"{current_time.strftime('%Y-%m-%d %H:%M %z')} ({user_timezone})"
 
-回覆原則：
-- 使用繁體中文，語氣友善自然
-- 帳務問題請根據提供的統計資料和明細回答，提供具體數字
-- 趨勢分析時，請計算變化幅度並給出簡要解讀
-- 消費建議請針對用戶的高消費類別給出具體可行的建議
-- 預算規劃時，請根據歷史消費數據建議各類別的預算金額，並說明如何追蹤
-- 財經知識問題請給出簡潔易懂的解釋
-- 涉及投資建議時，請加入免責聲明：「以上僅供參考，不構成投資建議，建議諮詢專業理財顧問」
-- 不要提供具體的股票、基金推薦或買賣時機建議
-- 閒聊時保持親切，可以適時提醒用戶記帳的重要性"""
+    def _build_query_messages(
+        self,
+        query: str,
+        stats: Optional[MonthlyStats],
+        user_timezone: str,
+        recent_records: Optional[list],
+        multi_month_stats: Optional[list],
+        time_range: Optional[str] = None,
+    ) -> list:
+        """
+        組合財務小助手的訊息（參數同 answer_query）
 
-        # 組合用戶訊息，包含查詢和上下文資料
-        user_content = f"""用戶問題：{query}
+        system prompt 固定不變；用戶訊息依變動頻率排列：歷史月份統計最穩定放最前，
+        其次是當月統計與明細，目前時間與問題每次都不同放在最後。同一用戶連續
+        查詢時，較長的共同前綴可命中 prompt 快取。
+        """
+        sections = []
 
-目前時間：{current_time_text}
+        # 多月統計資料（如果有）
+        if multi_month_stats:
+            trend_text = "\n".join(
+                [
+                    f"  - {s.month}: 總支出 {s.total} 元，{s.record_count} 筆"
+                    for s in multi_month_stats
+                ]
+            )
+            sections.append(f"【歷史月份統計】\n{trend_text}")
 
-【當月統計資料】
+        # 當月統計資料（知識與閒聊問題不會提供）
+        if stats is not None:
+            sections.append(
+                f"""【當月統計資料】
 - 月份：{stats.month}
 - 總支出：{stats.total} 元
 - 記錄筆數：{stats.record_count} 筆
 - 各類別支出：{json.dumps(stats.by_category, ensure_ascii=False)}"""
+            )
 
-        # 加入近期消費明細（如果有）
+        # 問題指定範圍的統計（依範圍內全部記錄計算）
+        if time_range is not None:
+            range_total = 0.0
+            range_by_category: Dict[str, float] = {}
+            for r in recent_records or []:
+                amount = r.get("花費")
+                if isinstance(amount, (int, float)):
+                    range_total += amount
+                    category = r.get("類別", "")
+                    range_by_category[category] = (
+                        range_by_category.get(category, 0) + amount
+                    )
+            sections.append(
+                f"""【查詢範圍】{time_range}
+- 總支出：{range_total:g} 元
+- 記錄筆數：{len(recent_records or [])} 筆
+- 各類別支出：{json.dumps(range_by_category, ensure_ascii=False)}"""
+            )
+
+        # 近期消費明細（如果有）
         if recent_records:
+            # 記錄依 Sheet 順序（舊到新），改為新到舊後最多顯示 20 筆
+            latest = sorted(
+                recent_records, key=lambda r: str(r.get("時間", "")), reverse=True
+            )[:20]
             records_text = "\n".join(
                 [
                     f"  - {r.get('時間', 'N/A')}: {r.get('名稱', 'N/A')} ({r.get('類別', 'N/A')}) {r.get('花費', 0)} 元"
-                    for r in recent_records[:20]  # 最多顯示 20 筆
+                    for r in latest
                 ]
             )
-            user_content += f"""
+            if time_range is not None:
+                records_header = f"【查詢範圍消費明細】（共 {len(recent_records)} 筆）"
+            else:
+                records_header = f"【近期消費明細】（最近 {len(recent_records)} 筆）"
+            sections.append(f"{records_header}\n{records_text}")
+
+        sections.append(f"目前時間：{self._current_time_text(user_timezone)}")
+        sections.append(f"用戶問題：{query}")
+
+        return [
+            {"role": "system", "content": QUERY_SYSTEM_PROMPT},
+            {"role": "user", "content": "\n\n".join(sections)},
+        ]
 
-【近期消費明細】（最近 {len(recent_records)} 筆）
-{records_text}"""
+    async def _stream_tool_answer(
+        self, query: str, user_timezone: str, tools: LedgerTools
+    ) -> AsyncIterator[str]:
+        """
+        工具模式的回答（串流）
 
-        # 加入多月統計資料（如果有）
-        if multi_month_stats:
-            trend_text = "\n".join(
-                [
-                    f"  - {s.month}: 總支出 {s.total} 元，{s.record_count} 筆"
-                    for s in multi_month_stats
-                ]
-            )
-            user_content += f"""
+        每一回合以串流呼叫模型：回答內容直接輸出；模型要求呼叫工具時執行
+        工具並將結果加入訊息，再進行下一回合。工具額度用完後該回合不允許
+        再呼叫工具，模型必須以已取得的資料回答。
 
-【歷史月份統計】
-{trend_text}"""
+        Yields:
+            str: 回答內容片段
+        """
+        messages = [
+            {"role": "system", "content": QUERY_SYSTEM_PROMPT + QUERY_TOOLS_PROMPT},
+            {
+                "role": "user",
+                "content": f"目前時間：{self._current_time_text(user_timezone)}\n\n"
+                f"用戶問題：{query}",
+            },
+        ]
 
-        user_content += """
+        while True:
+            final = tools.exhausted
+            kwargs = {
+                "model": self.model,
+                "messages": messages,
+                "temperature": 0.7,
+                "max_tokens": 512,
+                "timeout": self.timeout,
+                "tools": tools.definitions,
+                "tool_choice": "none" if final else "auto",
+            }
+
+            # 工具呼叫以片段串流，依 index 組合
+            calls: Dict[int, Dict[str, str]] = {}
+            async for chunk in self._stream_chunks(kwargs, "query_tools"):
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    yield delta.content
+                for call in delta.tool_calls or []:
+                    entry = calls.setdefault(
+                        call.index, {"id": "", "name": "", "arguments": ""}
+                    )
+                    entry["id"] = call.id or entry["id"]
+                    if call.function is not None:
+                        entry["name"] += call.function.name or ""
+                        entry["arguments"] += call.function.arguments or ""
+
+            if not calls or final:
+                return
+
+            tool_calls = [calls[index] for index in sorted(calls)]
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": call["id"],
+                            "type": "function",
+                            "function": {
+                                "name": call["name"],
+                                "arguments": call["arguments"],
+                            },
+                        }
+                        for call in tool_calls
+                    ],
+                }
+            )
+            results = await asyncio.gather(
+                *(tools.call(call["name"], call["arguments"]) for call in tool_calls)
+            )
+            messages.extend(
+                {"role": "tool", "tool_call_id": call["id"], "content": result}
+                for call, result in zip(tool_calls, results)
+            )
 
-請根據用戶問題的類型適當回答。"""
+    async def answer_query(
+        self,
+        query: str,
+        stats: Optional[MonthlyStats] = None,
+        user_timezone: str = "Asia/Taipei",
+        recent_records: Optional[list] = None,
+        multi_month_stats: Optional[list] = None,
+        time_range: Optional[str] = None,
+        tools: Optional[LedgerTools] = None,
+    ) -> str:
+        """
+        回答用戶查詢（財務小助手）
 
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_content},
-        ]
+        支援多種查詢模式：
+        - 帳務統計查詢：根據統計資料回答消費相關問題
+        - 歷史明細查詢：根據明細記錄回答特定消費問題
+        - 趨勢分析：根據多月統計比較消費變化
+        - 財經知識問答：回答理財、投資、儲蓄等基礎知識
+        - 消費建議：根據消費模式提供個人化建議
+        - 日常閒聊：友善回應問候和一般對話
+
+        Args:
+            query: 用戶的問題
+            stats: 當月統計資料（可選，知識與閒聊問題不需要）
+            user_timezone: 用戶時區（IANA 格式，如 "Asia/Taipei"）
+            recent_records: 近期消費明細記錄（可選）
+            multi_month_stats: 多月統計資料（可選，用於趨勢分析）
+            time_range: 問題指定的時間範圍與類別說明（可選，提供時 recent_records
+                為該範圍內的全部記錄）
+            tools: 帳務查詢工具（可選，提供時改由模型呼叫工具取得資料，
+                不使用上述上下文參數）
 
+        Returns:
+            str: 回答內容
+        """
         try:
-            answer = self._call_with_retry(messages)
+            if tools is not None:
+                parts = [
+                    delta
+                    async for delta in self._stream_tool_answer(
+                        query, user_timezone, tools
+                    )
+                ]
+                return "".join(parts).strip()
+
+            messages = self._build_query_messages(
+                query, stats, user_timezone, recent_records, multi_month_stats, time_range
+            )
+            answer = await self._call_with_retry(messages, kind="query")
             return answer.strip()
         except Exception as e:
             logger.error(f"Failed to answer query: {e}")
             raise OpenAIServiceError("QUERY_ERROR", f"查詢失敗：{str(e)}")
 
+    async def stream_answer_query(
+        self,
+        query: str,
+        stats: Optional[MonthlyStats] = None,
+        user_timezone: str = "Asia/Taipei",
+        recent_records: Optional[list] = None,
+        multi_month_stats: Optional[list] = None,
+        time_range: Optional[str] = None,
+        tools: Optional[LedgerTools] = None,
+    ) -> AsyncIterator[str]:
+        """
+        串流回答用戶查詢（參數同 answer_query）
+
+        Yields:
+            str: 回答內容片段（開頭的空白會被略過）
+        """
+        if tools is not None:
+            deltas = self._stream_tool_answer(query, user_timezone, tools)
+        else:
+            messages = self._build_query_messages(
+                query, stats, user_timezone, recent_records, multi_month_stats, time_range
+            )
+            deltas = self._stream_with_retry(messages, kind="query_stream")
+
+        started = False
+        try:
+            async for delta in deltas:
+                if not started:
+                    delta = delta.lstrip()
+                    if not delta:
+                        continue
+                    started = True
+                yield delta
+        except Exception as e:
+            logger.error(f"Failed to stream query answer: {e}")
+            raise OpenAIServiceError("QUERY_ERROR", f"查詢失敗：{str(e)}")
+
 
 # 單例模式
 openai_service = OpenAIService()
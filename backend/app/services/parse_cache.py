@@ -0,0 +1,262 @@
+"""記帳語句解析結果快取
+
+用戶每天會重複輸入相同的記帳語句（例如「早餐 蛋餅 45」）。以正規化後的
+語句為 key，快取 LLM 解析出的每筆記錄的名稱、類別、金額、幣別與支付方式
+（不含時間），命中時以目前時間重建 AccountingRecord，不必再呼叫 LLM。
+
+- 每位用戶各自一份 LRU，筆數有上限，項目超過 TTL 即失效
+- 可選擇同時保存在資料庫（parse_cache_entries），重啟後仍可命中
+- 描述了特定時間的語句（例如「昨天晚餐 200」）不快取，因為時間需由 LLM 判斷
+"""
+
+import json
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.crud import (
+    delete_parse_cache_entry,
+    get_parse_cache_entry,
+    save_parse_cache_entry,
+)
+from app.models.schemas import AccountingRecord
+from app.utils.quick_parser import has_time_hint
+
+logger = logging.getLogger(__name__)
+
+# 快取的欄位（時間於命中時以目前時間填入）
+CACHED_FIELDS = ("名稱", "類別", "花費", "幣別", "支付方式")
+
+MAX_KEY_LENGTH = 255
+
+# 數字（保留緊鄰的負號與小數點）或不含數字的文字片段，其餘空白與標點皆移除
+_TOKEN = re.compile(r"(-?\d+(?:\.\d+)?)|[^\W\d_]+")
+
+
+def normalize_utterance(text: str) -> str:
+    """
+    正規化語句：全形轉半形、英文轉小寫、移除空白與標點
+
+    金額相關的符號不移除：「4.5」與「45」、「-120」與「120」為不同 key；
+    以空白或標點分隔的兩個數字之間保留一個空白（「2 45」不會變成「245」）。
+    """
+    parts = []
+    last_number_end = None
+    for match in _TOKEN.finditer(unicodedata.normalize("NFKC", text).lower()):
+        if match.group(1) is not None:
+            if last_number_end is not None and match.start() > last_number_end:
+                parts.append(" ")
+            last_number_end = match.end()
+        else:
+            last_number_end = None
+        parts.append(match.group(0))
+    return "".join(parts)
+
+
+class _UserCache:
+    """單一用戶的快取項目與命中統計"""
+
+    __slots__ = ("entries", "hits", "misses")
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
+
+
+class ParseCache:
+    """以用戶為單位的 LRU + TTL 解析結果快取"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: int,
+        max_users: int = 1000,
+        persist: bool = True,
+    ):
+        """
+        初始化快取
+
+        Args:
+            max_entries: 每位用戶最多快取幾筆語句
+            ttl_seconds: 快取項目有效時間
+            max_users: 記憶體中最多保留幾位用戶的快取
+            persist: 是否同時保存在資料庫
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self.persist = persist
+        self._users: "OrderedDict[str, _UserCache]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _user(self, user_id: str) -> _UserCache:
+        """取得用戶快取（超過用戶上限時淘汰最久未使用的用戶）"""
+        cache = self._users.get(user_id)
+        if cache is None:
+            cache = self._users[user_id] = _UserCache()
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return cache
+
+    def _expired(self, stored_at: float) -> bool:
+        return time.time() - stored_at > self.ttl_seconds
+
+    def _load(
+        self, db: Session, user_id: str, key: str
+    ) -> Optional[Tuple[float, List[Dict]]]:
+        """從資料庫載入快取項目（過期則刪除）"""
+        entry = get_parse_cache_entry(db, user_id, key)
+        if entry is None:
+            return None
+        stored_at = entry.created_at.replace(tzinfo=timezone.utc).timestamp()
+        if self._expired(stored_at):
+            delete_parse_cache_entry(db, user_id, key)
+            return None
+        fields = json.loads(entry.fields)
+        # 相容單筆記錄格式的舊項目
+        return stored_at, fields if isinstance(fields, list) else [fields]
+
+    def get(
+        self,
+        user_id: str,
+        text: str,
+        db: Optional[Session] = None,
+        now: Optional[datetime] = None,
+    ) -> Optional[List[AccountingRecord]]:
+        """
+        查詢快取
+
+        Args:
+            user_id: 用戶 ID
+            text: 使用者輸入的記帳文字
+            db: 資料庫 Session（啟用資料庫保存時使用）
+            now: 記帳時間（預設為現在）
+
+        Returns:
+            Optional[List[AccountingRecord]]: 命中時回傳以目前時間重建的記帳記錄
+        """
+        key = normalize_utterance(text)
+        if not key or len(key) > MAX_KEY_LENGTH or has_time_hint(text):
+            return None
+
+        cache = self._user(user_id)
+        cached = cache.entries.get(key)
+        if cached is not None and self._expired(cached[0]):
+            del cache.entries[key]
+            cached = None
+        if cached is None and self.persist and db is not None:
+            try:
+                cached = self._load(db, user_id, key)
+            except Exception as e:
+                logger.warning(f"Load parse cache entry failed: {e}")
+            if cached is not None:
+                self._remember(cache, key, cached)
+
+        if cached is None:
+            cache.misses += 1
+            self.misses += 1
+            return None
+
+        cache.entries.move_to_end(key)
+        cache.hits += 1
+        self.hits += 1
+        recorded_at = (now or datetime.now()).strftime("%Y-%m-%d %H:%M")
+        return [AccountingRecord(時間=recorded_at, **fields) for fields in cached[1]]
+
+    def _remember(
+        self, cache: _UserCache, key: str, item: Tuple[float, List[Dict]]
+    ) -> None:
+        cache.entries[key] = item
+        cache.entries.move_to_end(key)
+        while len(cache.entries) > self.max_entries:
+            cache.entries.popitem(last=False)
+
+    def put(
+        self,
+        user_id: str,
+        text: str,
+        records: List[AccountingRecord],
+        db: Optional[Session] = None,
+    ) -> None:
+        """
+        保存 LLM 解析結果
+
+        Args:
+            user_id: 用戶 ID
+            text: 使用者輸入的記帳文字
+            records: 解析出的記帳記錄
+            db: 資料庫 Session（啟用資料庫保存時使用）
+        """
+        key = normalize_utterance(text)
+        if not key or len(key) > MAX_KEY_LENGTH or has_time_hint(text):
+            return
+
+        fields = [
+            {name: getattr(record, name) for name in CACHED_FIELDS} for record in records
+        ]
+        self._remember(self._user(user_id), key, (time.time(), fields))
+
+        if self.persist and db is not None:
+            try:
+                save_parse_cache_entry(
+                    db,
+                    user_id,
+                    key,
+                    json.dumps(fields, ensure_ascii=False),
+                    max_entries=self.max_entries,
+                )
+            except Exception as e:
+                logger.warning(f"Save parse cache entry failed: {e}")
+
+    def stats(self, user_id: Optional[str] = None) -> Dict:
+        """
+        命中率統計
+
+        Args:
+            user_id: 用戶 ID（提供時回傳該用戶的統計，否則回傳全域統計）
+        """
+        if user_id is not None:
+            cache = self._users.get(user_id) or _UserCache()
+            return {
+                "hits": cache.hits,
+                "misses": cache.misses,
+                "hit_rate": _hit_rate(cache.hits, cache.misses),
+                "entries": len(cache.entries),
+            }
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": _hit_rate(self.hits, self.misses),
+            "users": len(self._users),
+        }
+
+    def clear(self) -> None:
+        """清除記憶體中的快取與統計"""
+        self._users.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# 單例模式
+parse_cache = ParseCache(
+    max_entries=settings.PARSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PARSE_CACHE_TTL_SECONDS,
+    max_users=settings.PARSE_CACHE_MAX_USERS,
+    persist=settings.PARSE_CACHE_PERSIST,
+)
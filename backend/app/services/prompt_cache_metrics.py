@@ -0,0 +1,134 @@
+"""Prompt 前綴快取統計
+
+OpenAI 會自動快取請求開頭相同的 prompt 前綴（1024 tokens 以上），命中時
+usage.prompt_tokens_details.cached_tokens 大於 0，回應延遲也較低。
+依呼叫類型（解析、回饋、查詢…）記錄 prompt tokens、命中快取的 tokens 與延遲，
+用來確認前綴是否穩定，並估計快取節省的延遲。
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def usage_tokens(usage: Any) -> Optional[Tuple[int, int]]:
+    """
+    從 API usage 取得 (prompt_tokens, cached_tokens)
+
+    相容的 API 端點可能不回傳 usage 或 prompt_tokens_details，取不到時回傳 None
+    （沒有 cached_tokens 時視為 0）。
+    """
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    if not isinstance(prompt_tokens, int):
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None)
+    return prompt_tokens, cached_tokens if isinstance(cached_tokens, int) else 0
+
+
+def _ratio(part: float, whole: float) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+def _average_ms(total_seconds: float, count: int) -> Optional[float]:
+    return round(total_seconds / count * 1000, 1) if count else None
+
+
+class _KindStats:
+    """單一呼叫類型的累計統計"""
+
+    __slots__ = (
+        "calls",
+        "prompt_tokens",
+        "cached_tokens",
+        "hit_calls",
+        "hit_latency",
+        "miss_latency",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.hit_calls = 0
+        self.hit_latency = 0.0
+        self.miss_latency = 0.0
+
+    def merge(self, other: "_KindStats") -> None:
+        for field in self.__slots__:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    def to_dict(self) -> Dict:
+        miss_calls = self.calls - self.hit_calls
+        hit_ms = _average_ms(self.hit_latency, self.hit_calls)
+        miss_ms = _average_ms(self.miss_latency, miss_calls)
+        # 以未命中的平均延遲估計命中呼叫原本需要的時間
+        saved_ms = None
+        if hit_ms is not None and miss_ms is not None:
+            saved_ms = round(max(miss_ms - hit_ms, 0) * self.hit_calls, 1)
+        return {
+            "calls": self.calls,
+            "hit_calls": self.hit_calls,
+            "hit_rate": _ratio(self.hit_calls, self.calls),
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_token_ratio": _ratio(self.cached_tokens, self.prompt_tokens),
+            "avg_latency_ms_hit": hit_ms,
+            "avg_latency_ms_miss": miss_ms,
+            "estimated_saved_ms": saved_ms,
+        }
+
+
+class PromptCacheMetrics:
+    """依呼叫類型累計 prompt 快取命中與延遲"""
+
+    def __init__(self):
+        self._kinds: Dict[str, _KindStats] = {}
+
+    def record(self, kind: str, usage: Any, latency_seconds: float) -> None:
+        """
+        記錄一次 API 呼叫
+
+        Args:
+            kind: 呼叫類型（例如 "parse"、"query_stream"）
+            usage: API 回應的 usage（串流時為最後一個 chunk 的 usage）
+            latency_seconds: 回應延遲（串流時為第一個 chunk 的延遲）
+        """
+        tokens = usage_tokens(usage)
+        if tokens is None:
+            return
+        prompt_tokens, cached_tokens = tokens
+
+        stats = self._kinds.setdefault(kind, _KindStats())
+        stats.calls += 1
+        stats.prompt_tokens += prompt_tokens
+        stats.cached_tokens += cached_tokens
+        if cached_tokens > 0:
+            stats.hit_calls += 1
+            stats.hit_latency += latency_seconds
+        else:
+            stats.miss_latency += latency_seconds
+
+        logger.info(
+            f"OpenAI {kind}: cached {cached_tokens}/{prompt_tokens} prompt tokens, "
+            f"{latency_seconds * 1000:.0f}ms"
+        )
+
+    def stats(self) -> Dict:
+        """各呼叫類型與整體的命中率、快取 token 比例與估計節省的延遲"""
+        overall = _KindStats()
+        for stats in self._kinds.values():
+            overall.merge(stats)
+        return {
+            "kinds": {kind: stats.to_dict() for kind, stats in self._kinds.items()},
+            "overall": overall.to_dict(),
+        }
+
+    def clear(self) -> None:
+        """清除統計"""
+        self._kinds.clear()
+
+
+# 單例模式
+prompt_cache_metrics = PromptCacheMetrics()
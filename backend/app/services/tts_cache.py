@@ -0,0 +1,191 @@
+"""語音合成結果的本地磁碟快取
+
+確認語句（例如「已記錄：咖啡 85TWD」）與固定回覆常以相同的聲音與語速
+重複合成。以 (text, voice, speed, model) 的雜湊為 key，將 MP3 存在本地磁碟：
+
+- 命中時直接以檔案回應（FileResponse，可使用 sendfile），並提供 ETag
+- 總大小超過上限時，依最後使用時間淘汰最舊的檔案（最近幾秒內使用過的檔案
+  可能仍在回應中，不淘汰）
+- 相同內容的並行請求共用同一次合成
+- 可在啟動時預先合成常用語句
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.services.openai_service import TTS_MODEL, openai_service
+
+logger = logging.getLogger(__name__)
+
+AUDIO_SUFFIX = ".mp3"
+
+# 最近使用過的檔案在此期間內不淘汰（FileResponse 可能仍在傳送）
+EVICT_GRACE_SECONDS = 10.0
+
+
+def tts_cache_key(text: str, voice: str, speed: float, model: str = TTS_MODEL) -> str:
+    """以合成參數計算內容位址（sha256）"""
+    raw = "\x1f".join([model, voice, f"{speed:.2f}", text])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTSAudioCache:
+    """以內容雜湊為 key 的 LRU 磁碟快取"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        evict_grace_seconds: float = EVICT_GRACE_SECONDS,
+    ):
+        """
+        初始化快取
+
+        Args:
+            directory: 快取目錄
+            max_bytes: 快取總大小上限
+            evict_grace_seconds: 最近使用過的檔案在此期間內不淘汰
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.evict_grace_seconds = evict_grace_seconds
+        # key -> 檔案大小，依最後使用時間排序（首次使用時由目錄內容建立）
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._used_at: Dict[str, float] = {}
+        self._total_bytes = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{AUDIO_SUFFIX}"
+
+    def _index(self) -> "OrderedDict[str, int]":
+        """載入目錄中既有的快取檔案（依修改時間排序）"""
+        if self._entries is None:
+            files = []
+            if self.directory.exists():
+                for path in self.directory.glob(f"*/*{AUDIO_SUFFIX}"):
+                    stat = path.stat()
+                    files.append((stat.st_mtime, path.stem, stat.st_size))
+            files.sort()
+            self._entries = OrderedDict((key, size) for _, key, size in files)
+            self._used_at = {key: mtime for mtime, key, _ in files}
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        取得快取檔案
+
+        Returns:
+            Optional[Path]: 命中時回傳檔案路徑（並更新最後使用時間）
+        """
+        entries = self._index()
+        if key not in entries:
+            return None
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # 檔案被外部刪除
+            self._total_bytes -= entries.pop(key)
+            self._used_at.pop(key, None)
+            return None
+        entries.move_to_end(key)
+        self._used_at[key] = time.time()
+        return path
+
+    def put(self, key: str, audio: bytes) -> Path:
+        """寫入快取（先寫暫存檔再 rename，避免讀到寫一半的檔案）"""
+        entries = self._index()
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self._total_bytes += len(audio) - entries.pop(key, 0)
+        entries[key] = len(audio)
+        self._used_at[key] = time.time()
+        self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str) -> None:
+        """
+        淘汰最久未使用的檔案，直到總大小低於上限
+
+        最舊的檔案在寬限期內使用過時停止淘汰（其餘檔案更新），
+        總大小可能暫時超過上限，於下次寫入時再淘汰。
+        """
+        entries = self._index()
+        cutoff = time.time() - self.evict_grace_seconds
+        while self._total_bytes > self.max_bytes and len(entries) > 1:
+            key, size = next(iter(entries.items()))
+            if key == keep or self._used_at.get(key, 0) > cutoff:
+                break
+            del entries[key]
+            self._used_at.pop(key, None)
+            self._total_bytes -= size
+            self._path(key).unlink(missing_ok=True)
+
+    async def synthesize(self, text: str, voice: str, speed: float) -> Path:
+        """
+        取得合成音訊的快取檔案，未命中時呼叫 TTS 並寫入快取
+
+        相同內容的並行請求共用同一次合成。
+
+        Returns:
+            Path: MP3 檔案路徑
+        """
+        key = tts_cache_key(text, voice, speed)
+        path = self.get(key)
+        if path is not None:
+            return path
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._synthesize(key, text, voice, speed))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _synthesize(self, key: str, text: str, voice: str, speed: float) -> Path:
+        audio = await openai_service.text_to_speech(text=text, voice=voice, speed=speed)
+        return self.put(key, audio)
+
+    async def prewarm(self, phrases: List[str], voice: str, speed: float = 1.0) -> int:
+        """
+        預先合成常用語句
+
+        Returns:
+            int: 新合成的語句數
+        """
+        synthesized = 0
+        for phrase in phrases:
+            if self.get(tts_cache_key(phrase, voice, speed)) is not None:
+                continue
+            try:
+                await self.synthesize(phrase, voice, speed)
+                synthesized += 1
+            except Exception as e:
+                logger.warning(f"TTS prewarm failed for {phrase!r}: {e}")
+        return synthesized
+
+
+# 單例模式
+tts_cache = TTSAudioCache(
+    directory=settings.TTS_CACHE_DIR,
+    max_bytes=settings.TTS_CACHE_MAX_BYTES,
+)
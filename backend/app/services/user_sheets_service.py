@@ -3,17 +3,30 @@
 使用用戶的 OAuth Token 操作其專屬的 Google Sheet
 """
 
+import asyncio
+import heapq
 import logging
 import re
+import time
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Tuple
+from typing import Any, Awaitable, Callable, Optional, List, Dict, Tuple
 
+import httpx
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
 from app.config import settings
 from app.models.schemas import AccountingRecord, MonthlyStats
+from app.services.google_api_client import GoogleAPIClient, GoogleAPIError
+from app.services.ledger_mirror import LedgerMirror
+from app.services.ledger_rows import (
+    DATE_TIME_RENDER_OPTION,
+    DEFAULT_DECODER,
+    SHEET_HEADERS,
+    VALUE_RENDER_OPTION,
+    LedgerRow,
+    decode_values,
+)
+from app.services.monthly_aggregates import MonthlyAggregateStore
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +40,99 @@ class GoogleSheetsError(Exception):
         super().__init__(f"{code}: {message}")
 
 
-# Sheet 標題列
-SHEET_HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+def _is_missing_range_error(error: Exception) -> bool:
+    """判斷錯誤是否為分頁不存在（range 無法解析）"""
+    return "unable to parse range" in str(error).lower()
+
+
+class WorksheetCatalogCache:
+    """
+    工作表（分頁）名稱快取
+
+    以 Sheet ID 為 key 快取分頁列表，讓寫入記錄時不必每次都呼叫
+    spreadsheets.get。快取在 TTL 到期、建立分頁或發現分頁不存在時失效。
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, List[str]]] = {}
+
+    def get(self, sheet_id: str) -> Optional[List[str]]:
+        """取得快取的分頁列表，過期或不存在則回傳 None"""
+        entry = self._entries.get(sheet_id)
+        if entry is None:
+            return None
+        cached_at, titles = entry
+        if time.monotonic() - cached_at > self.ttl_seconds:
+            del self._entries[sheet_id]
+            return None
+        return list(titles)
+
+    def set(self, sheet_id: str, titles: List[str]) -> None:
+        """寫入分頁列表"""
+        self._entries[sheet_id] = (time.monotonic(), list(titles))
+
+    def add(self, sheet_id: str, title: str) -> None:
+        """新增單一分頁到快取（僅在快取仍有效時）"""
+        titles = self.get(sheet_id)
+        if titles is not None and title not in titles:
+            cached_at, _ = self._entries[sheet_id]
+            self._entries[sheet_id] = (cached_at, titles + [title])
+
+    def invalidate(self, sheet_id: str) -> None:
+        """使指定 Sheet 的快取失效"""
+        self._entries.pop(sheet_id, None)
+
+    def clear(self) -> None:
+        """清除所有快取"""
+        self._entries.clear()
+
+
+# 跨請求共用的分頁列表快取
+worksheet_cache = WorksheetCatalogCache(settings.SHEETS_WORKSHEET_CACHE_TTL_SECONDS)
+
+
+class WorksheetRowCountCache:
+    """
+    分頁已使用列數快取
+
+    記錄每個月份分頁最後一列的列號（含標題列），讓查詢最近記錄時只讀取
+    分頁尾端。列數從 append 回應的 updatedRange 或讀取 A 欄得知；
+    讀取尾端時使用不限結束列的 range，即使快取過舊（有新資料列）也不會漏讀。
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], int] = {}
+
+    def get(self, sheet_id: str, worksheet: str) -> Optional[int]:
+        """取得最後一列的列號，未知則回傳 None"""
+        return self._entries.get((sheet_id, worksheet))
+
+    def set(self, sheet_id: str, worksheet: str, last_row: int) -> None:
+        """記錄最後一列的列號"""
+        self._entries[(sheet_id, worksheet)] = last_row
+
+    def invalidate(self, sheet_id: str, worksheet: str) -> None:
+        """使指定分頁的列數失效"""
+        self._entries.pop((sheet_id, worksheet), None)
+
+    def clear(self) -> None:
+        """清除所有快取"""
+        self._entries.clear()
+
+
+# 跨請求共用的分頁列數快取
+row_count_cache = WorksheetRowCountCache()
+
+# 查詢最近記錄時，尾端讀取的列數為所需筆數的倍數
+# （補記的舊日期記錄可能出現在分頁尾端，多讀幾列以取得時間最新的記錄）
+RECENT_TAIL_OVERFETCH = 4
+
+
+def _last_row_of_range(a1_range: str) -> Optional[int]:
+    """從 A1 range（例如 'Sheet'!A5:F7）取得最後一列的列號"""
+    match = re.search(r"(\d+)$", a1_range or "")
+    return int(match.group(1)) if match else None
 
 
 class DriveSheetInfo:
@@ -51,30 +155,68 @@ class DriveSheetInfo:
 class UserSheetsService:
     """用戶專屬 Google Sheets 服務（OAuth 模式）"""
 
-    def __init__(self, credentials: Credentials):
+    def __init__(
+        self,
+        credentials: Credentials,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         """
         初始化服務
 
         Args:
             credentials: 用戶的 Google OAuth Credentials
+            http_client: 自訂 httpx AsyncClient（預設使用共用連線池）
         """
         self.credentials = credentials
-        self._sheets_service = None
-        self._drive_service = None
-
-    @property
-    def sheets_service(self):
-        """取得 Google Sheets API 服務"""
-        if self._sheets_service is None:
-            self._sheets_service = build("sheets", "v4", credentials=self.credentials)
-        return self._sheets_service
-
-    @property
-    def drive_service(self):
-        """取得 Google Drive API 服務"""
-        if self._drive_service is None:
-            self._drive_service = build("drive", "v3", credentials=self.credentials)
-        return self._drive_service
+        self.client = GoogleAPIClient(credentials, http_client=http_client)
+        self.mirror: Optional[LedgerMirror] = None
+        self.aggregates: Optional[MonthlyAggregateStore] = None
+        # 請求範圍內的讀取快照：同一請求中每個分頁最多下載一次
+        self._snapshot: Dict[Tuple, asyncio.Task] = {}
+
+    def bind_session(self, db) -> None:
+        """
+        改用另一個資料庫 Session 存取鏡像與月度統計
+
+        串流回應的內容在請求的 Session 關閉後才產生，需改用串流期間開啟的 Session。
+        """
+        if self.mirror is not None:
+            self.mirror.db = db
+        if self.aggregates is not None:
+            self.aggregates.db = db
+
+    async def _snapshot_get(
+        self, key: Tuple, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        從請求快照取得結果，不存在則執行 loader 並記住
+
+        並行的呼叫者共用同一個進行中的讀取；讀取失敗時不保留，
+        讓下一次呼叫重新嘗試。
+        """
+        task = self._snapshot.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._snapshot_put(key, task)
+        # shield：單一呼叫者逾時取消時，不影響共用同一讀取的其他呼叫者
+        return await asyncio.shield(task)
+
+    def _snapshot_put(self, key: Tuple, task: asyncio.Task) -> None:
+        """將進行中的讀取放入快照"""
+        self._snapshot[key] = task
+
+        def discard_failed(done: asyncio.Task) -> None:
+            if (done.cancelled() or done.exception()) and self._snapshot.get(
+                key
+            ) is done:
+                del self._snapshot[key]
+
+        task.add_done_callback(discard_failed)
+
+    def _snapshot_forget(self, sheet_id: str, month: str) -> None:
+        """寫入後作廢快照中的月份與分頁列表"""
+        self._snapshot.pop(("worksheets", sheet_id), None)
+        self._snapshot.pop(("month", sheet_id, month), None)
 
     async def list_all_sheets(self, page_size: int = 100) -> List[DriveSheetInfo]:
         """
@@ -92,17 +234,13 @@ class UserSheetsService:
 
             while True:
                 # 查詢 Google Sheets 類型的檔案
-                response = (
-                    self.drive_service.files()
-                    .list(
-                        q="mimeType='application/vnd.google-apps.spreadsheet' and trashed=false",
-                        spaces="drive",
-                        fields="nextPageToken, files(id, name, modifiedTime)",
-                        pageSize=page_size,
-                        pageToken=page_token,
-                        orderBy="modifiedTime desc",
-                    )
-                    .execute()
+                response = await self.client.files_list(
+                    q="mimeType='application/vnd.google-apps.spreadsheet' and trashed=false",
+                    spaces="drive",
+                    fields="nextPageToken, files(id, name, modifiedTime)",
+                    pageSize=page_size,
+                    pageToken=page_token,
+                    orderBy="modifiedTime desc",
                 )
 
                 for file in response.get("files", []):
@@ -121,7 +259,7 @@ class UserSheetsService:
             logger.info(f"Listed {len(sheets)} sheets from Drive")
             return sheets
 
-        except HttpError as e:
+        except GoogleAPIError as e:
             logger.error(f"List sheets failed: {e}")
             raise GoogleSheetsError("LIST_ERROR", f"列出 Google Sheets 失敗：{str(e)}")
 
@@ -136,13 +274,11 @@ class UserSheetsService:
             str: Sheet 名稱
         """
         try:
-            result = (
-                self.sheets_service.spreadsheets()
-                .get(spreadsheetId=sheet_id, fields="properties.title")
-                .execute()
+            result = await self.client.spreadsheets_get(
+                sheet_id, fields="properties.title"
             )
             return result.get("properties", {}).get("title", "未命名")
-        except HttpError as e:
+        except GoogleAPIError as e:
             logger.error(f"Get sheet name failed: {e}")
             return "未命名"
 
@@ -173,45 +309,50 @@ class UserSheetsService:
                 ],
             }
 
-            result = (
-                self.sheets_service.spreadsheets()
-                .create(body=spreadsheet, fields="spreadsheetId,spreadsheetUrl")
-                .execute()
+            result = await self.client.spreadsheets_create(
+                spreadsheet, fields="spreadsheetId,spreadsheetUrl"
             )
 
             sheet_id = result.get("spreadsheetId")
             sheet_url = result.get("spreadsheetUrl")
 
             logger.info(f"Created new sheet: {sheet_id}")
+            worksheet_cache.set(sheet_id, [current_month])
 
             # 初始化當月分頁的標題列
             await self._init_worksheet_headers(sheet_id, current_month)
 
             return sheet_id, sheet_url
 
-        except HttpError as e:
+        except GoogleAPIError as e:
             logger.error(f"Create sheet failed: {e}")
             raise GoogleSheetsError("CREATE_ERROR", f"建立 Google Sheet 失敗：{str(e)}")
 
-    async def _get_worksheets(self, sheet_id: str) -> List[str]:
+    async def _get_worksheets(self, sheet_id: str, use_cache: bool = True) -> List[str]:
         """
         取得 Sheet 中所有工作表（分頁）的名稱
 
         Args:
             sheet_id: Google Sheet ID
+            use_cache: 是否使用分頁列表快取（False 時強制重新讀取）
 
         Returns:
             List[str]: 工作表名稱列表
         """
+        if use_cache:
+            cached = worksheet_cache.get(sheet_id)
+            if cached is not None:
+                return cached
+
         try:
-            result = (
-                self.sheets_service.spreadsheets()
-                .get(spreadsheetId=sheet_id, fields="sheets.properties.title")
-                .execute()
+            result = await self.client.spreadsheets_get(
+                sheet_id, fields="sheets.properties.title"
             )
             sheets = result.get("sheets", [])
-            return [s["properties"]["title"] for s in sheets]
-        except HttpError as e:
+            titles = [s["properties"]["title"] for s in sheets]
+            worksheet_cache.set(sheet_id, titles)
+            return titles
+        except GoogleAPIError as e:
             logger.error(f"Get worksheets failed: {e}")
             return []
 
@@ -239,9 +380,9 @@ class UserSheetsService:
                     }
                 ]
             }
-            self.sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=sheet_id, body=request
-            ).execute()
+            await self.client.spreadsheets_batch_update(sheet_id, request)
+
+            worksheet_cache.add(sheet_id, worksheet_name)
 
             # 初始化標題列
             await self._init_worksheet_headers(sheet_id, worksheet_name)
@@ -249,22 +390,20 @@ class UserSheetsService:
             logger.info(f"Created worksheet '{worksheet_name}' in sheet {sheet_id}")
             return True
 
-        except HttpError as e:
+        except GoogleAPIError as e:
             logger.error(f"Create worksheet failed: {e}")
+            worksheet_cache.invalidate(sheet_id)
             return False
 
     async def _init_worksheet_headers(self, sheet_id: str, worksheet_name: str):
         """初始化工作表的標題列"""
         try:
             body = {"values": [SHEET_HEADERS]}
-            self.sheets_service.spreadsheets().values().update(
-                spreadsheetId=sheet_id,
-                range=f"'{worksheet_name}'!A1",
-                valueInputOption="RAW",
-                body=body,
-            ).execute()
+            await self.client.values_update(
+                sheet_id, f"'{worksheet_name}'!A1", body, value_input_option="RAW"
+            )
             logger.info(f"Initialized headers for worksheet: {worksheet_name}")
-        except HttpError as e:
+        except GoogleAPIError as e:
             logger.error(f"Init worksheet headers failed: {e}")
             raise GoogleSheetsError("INIT_ERROR", f"初始化標題列失敗：{str(e)}")
 
@@ -281,13 +420,18 @@ class UserSheetsService:
         """
         worksheets = await self._get_worksheets(sheet_id)
 
+        if month not in worksheets:
+            # 快取可能過舊（例如分頁由其他裝置建立），重新讀取後再判斷
+            worksheets = await self._get_worksheets(sheet_id, use_cache=False)
+
         if month not in worksheets:
             logger.info(f"Worksheet '{month}' not found, creating...")
             await self._create_worksheet(sheet_id, month)
 
         return month
 
-    def _extract_month_from_time(self, time_str: str) -> str:
+    @staticmethod
+    def extract_month_from_time(time_str: str) -> str:
         """
         從時間字串中提取月份
 
@@ -304,56 +448,324 @@ class UserSheetsService:
         # 預設返回當月
         return datetime.now().strftime("%Y-%m")
 
-    async def write_record(self, sheet_id: str, record: AccountingRecord) -> bool:
+    @staticmethod
+    def record_to_row(record: AccountingRecord) -> List:
+        """將記帳記錄轉換為 Sheet 資料列（欄位順序同 SHEET_HEADERS）"""
+        return [
+            record.時間,
+            record.名稱,
+            record.類別,
+            record.花費,
+            record.幣別,
+            record.支付方式 or "",
+        ]
+
+    async def append_rows(self, sheet_id: str, month: str, rows: List[List]) -> bool:
         """
-        寫入記帳記錄到對應的月份分頁
+        以單次 append 將多筆資料列寫入指定月份分頁
 
         Args:
             sheet_id: Google Sheet ID
-            record: 記帳記錄
+            month: 月份（格式：YYYY-MM）
+            rows: 資料列（欄位順序同 SHEET_HEADERS）
 
         Returns:
             bool: 是否成功
         """
         try:
-            # 從記錄的時間提取月份
-            month = self._extract_month_from_time(record.時間)
-
             # 確保月份分頁存在
             worksheet_name = await self._ensure_worksheet_exists(sheet_id, month)
 
-            # 準備寫入資料
-            values = [
-                [
-                    record.時間,
-                    record.名稱,
-                    record.類別,
-                    record.花費,
-                    record.幣別,
-                    record.支付方式 or "",
-                ]
-            ]
-
-            body = {"values": values}
+            body = {"values": rows}
 
             # 使用 append 自動找到下一行，寫入對應月份的分頁
-            self.sheets_service.spreadsheets().values().append(
-                spreadsheetId=sheet_id,
-                range=f"'{worksheet_name}'!A:F",
-                valueInputOption="USER_ENTERED",
-                insertDataOption="INSERT_ROWS",
-                body=body,
-            ).execute()
+            try:
+                await self._append_values(sheet_id, worksheet_name, body)
+            except GoogleAPIError as e:
+                if not _is_missing_range_error(e):
+                    raise
+                # 分頁快取過舊（分頁已被刪除），重新確認分頁後再寫入一次
+                logger.warning(
+                    f"Worksheet '{worksheet_name}' missing in sheet {sheet_id}, retrying"
+                )
+                worksheet_cache.invalidate(sheet_id)
+                await self._ensure_worksheet_exists(sheet_id, month)
+                await self._append_values(sheet_id, worksheet_name, body)
 
+            self._snapshot_forget(sheet_id, month)
             logger.info(
-                f"Written record to sheet {sheet_id}/{worksheet_name}: {record.名稱}"
+                f"Written {len(rows)} row(s) to sheet {sheet_id}/{worksheet_name}"
             )
             return True
 
-        except HttpError as e:
+        except GoogleAPIError as e:
             logger.error(f"Write record failed: {e}")
             raise GoogleSheetsError("WRITE_ERROR", f"寫入 Google Sheet 失敗：{str(e)}")
 
+    async def write_record(self, sheet_id: str, record: AccountingRecord) -> bool:
+        """
+        寫入記帳記錄到對應的月份分頁
+
+        Args:
+            sheet_id: Google Sheet ID
+            record: 記帳記錄
+
+        Returns:
+            bool: 是否成功
+        """
+        return await self.write_records(sheet_id, [record])
+
+    async def write_records(
+        self, sheet_id: str, records: List[AccountingRecord]
+    ) -> bool:
+        """
+        寫入多筆記帳記錄，依月份分組，每個月份分頁只 append 一次
+
+        Args:
+            sheet_id: Google Sheet ID
+            records: 記帳記錄
+
+        Returns:
+            bool: 是否成功
+        """
+        errors = await self.write_records_by_month(sheet_id, records)
+        for error in errors.values():
+            if error is not None:
+                raise error
+        return True
+
+    async def write_records_by_month(
+        self, sheet_id: str, records: List[AccountingRecord]
+    ) -> Dict[str, Optional[BaseException]]:
+        """
+        寫入多筆記帳記錄並回報各月份的結果（不拋出寫入錯誤）
+
+        每個月份分頁只 append 一次，各分頁同時寫入；已成功寫入的月份
+        同步到本地鏡像與月度統計。
+
+        Returns:
+            Dict[str, Optional[BaseException]]: 月份 -> 寫入錯誤（成功為 None）
+        """
+        records_by_month: Dict[str, List[AccountingRecord]] = {}
+        for record in records:
+            month = self.extract_month_from_time(record.時間)
+            records_by_month.setdefault(month, []).append(record)
+
+        months = list(records_by_month)
+        results = await asyncio.gather(
+            *(
+                self.append_rows(
+                    sheet_id,
+                    month,
+                    [self.record_to_row(record) for record in records_by_month[month]],
+                )
+                for month in months
+            ),
+            return_exceptions=True,
+        )
+
+        errors: Dict[str, Optional[BaseException]] = {}
+        for month, result in zip(months, results):
+            if isinstance(result, BaseException):
+                errors[month] = result
+                continue
+            errors[month] = None
+            for record in records_by_month[month]:
+                self.apply_local_write(sheet_id, record)
+            logger.info(
+                f"Written {len(records_by_month[month])} record(s) to sheet {sheet_id}/{month}"
+            )
+        return errors
+
+    def apply_local_write(self, sheet_id: str, record: AccountingRecord) -> None:
+        """將已寫入（或已排入佇列）的記錄同步到本地鏡像與月度統計"""
+        month = self.extract_month_from_time(record.時間)
+        self._snapshot_forget(sheet_id, month)
+        try:
+            if self.mirror is not None and self.mirror.sheet_id == sheet_id:
+                row = DEFAULT_DECODER.decode(self.record_to_row(record))
+                self.mirror.add_records(month, [row])
+            if self.aggregates is not None and self.aggregates.sheet_id == sheet_id:
+                self.aggregates.apply_record(month, record)
+        except Exception as e:
+            # 本地更新失敗不影響寫入，下次同步或重新計算時會校正
+            logger.warning(f"Local write-through failed: {e}")
+
+    async def _append_values(
+        self, sheet_id: str, worksheet_name: str, body: Dict
+    ) -> None:
+        """將資料列 append 到指定分頁"""
+        result = await self.client.values_append(
+            sheet_id,
+            f"'{worksheet_name}'!A:F",
+            body,
+            value_input_option="USER_ENTERED",
+            insert_data_option="INSERT_ROWS",
+        )
+        # 記錄寫入後的最後一列，供尾端讀取使用
+        last_row = _last_row_of_range(
+            (result or {}).get("updates", {}).get("updatedRange", "")
+        )
+        if last_row is not None:
+            row_count_cache.set(sheet_id, worksheet_name, last_row)
+
+    async def _read_month_values(
+        self, sheet_id: str, worksheet: str
+    ) -> List[LedgerRow]:
+        """讀取單一分頁的記錄"""
+        result = await self.client.values_get(
+            sheet_id,
+            f"'{worksheet}'!A:F",
+            value_render_option=VALUE_RENDER_OPTION,
+            date_time_render_option=DATE_TIME_RENDER_OPTION,
+        )
+        return decode_values(result.get("values", []))
+
+    async def _ensure_mirror(self, sheet_id: str) -> bool:
+        """
+        確認本地鏡像可用且為最新
+
+        超過新鮮度期限時以 Drive modifiedTime 判斷 Sheet 是否被修改，
+        需要時從 Sheet 重新同步。每個服務實例（每次請求）只檢查一次。
+
+        Returns:
+            bool: 是否可以使用本地鏡像
+        """
+        if self.mirror is None or self.mirror.sheet_id != sheet_id:
+            return False
+        return await self._snapshot_get(
+            ("mirror", sheet_id), lambda: self._check_mirror(sheet_id)
+        )
+
+    async def _check_mirror(self, sheet_id: str) -> bool:
+        """檢查鏡像是否為最新，需要時重新同步"""
+        try:
+            if not self.mirror.is_fresh():
+                file = await self.client.files_get(sheet_id, fields="modifiedTime")
+                modified_time = file.get("modifiedTime")
+                if self.mirror.needs_resync(modified_time):
+                    worksheets = await self._get_worksheets(sheet_id, use_cache=False)
+                    if not worksheets:
+                        return False
+                    records_by_month = await self._fetch_months(sheet_id, worksheets)
+                    changed = self.mirror.replace_all(
+                        worksheets, records_by_month, modified_time
+                    )
+                    if self.aggregates is not None and changed:
+                        self.aggregates.invalidate(changed)
+                else:
+                    self.mirror.mark_checked(modified_time)
+        except GoogleAPIError as e:
+            logger.warning(f"Ledger mirror sync failed, reading from sheet: {e}")
+            return False
+        return True
+
+    async def _list_worksheets(self, sheet_id: str) -> List[str]:
+        """取得分頁名稱列表（鏡像可用時不呼叫 Sheets API，同一請求只取得一次）"""
+
+        async def load() -> List[str]:
+            if await self._ensure_mirror(sheet_id):
+                return self.mirror.worksheets()
+            return await self._get_worksheets(sheet_id)
+
+        return list(await self._snapshot_get(("worksheets", sheet_id), load))
+
+    async def _read_months(
+        self, sheet_id: str, worksheets: List[str]
+    ) -> Dict[str, List[LedgerRow]]:
+        """
+        讀取多個分頁的記錄（鏡像可用時從本地資料庫讀取）
+
+        同一請求中已讀過的分頁直接使用快照，其餘分頁合併為一次讀取。
+
+        Args:
+            sheet_id: Google Sheet ID
+            worksheets: 分頁名稱列表
+
+        Returns:
+            Dict[str, List[LedgerRow]]: 分頁名稱對應的記錄列表（依輸入順序，不含失敗分頁）
+        """
+        worksheets = list(dict.fromkeys(worksheets))
+        missing = [
+            worksheet
+            for worksheet in worksheets
+            if ("month", sheet_id, worksheet) not in self._snapshot
+        ]
+        if missing:
+
+            async def load() -> Dict[str, List[LedgerRow]]:
+                if await self._ensure_mirror(sheet_id):
+                    return self.mirror.read_months(missing)
+                # 不存在的分頁（未來或沒有記錄的月份）會讓整個批次讀取失敗，
+                # 先以分頁列表過濾；不存在的分頁視為沒有記錄
+                existing = set(await self._list_worksheets(sheet_id))
+                return await self._fetch_months(
+                    sheet_id, [worksheet for worksheet in missing if worksheet in existing]
+                )
+
+            batch = asyncio.ensure_future(load())
+            for worksheet in missing:
+                self._snapshot_put(("month", sheet_id, worksheet), batch)
+
+        tasks = {
+            worksheet: self._snapshot[("month", sheet_id, worksheet)]
+            for worksheet in worksheets
+        }
+        records_by_month: Dict[str, List[LedgerRow]] = {}
+        for worksheet, task in tasks.items():
+            loaded = await asyncio.shield(task)
+            if worksheet in loaded:
+                records_by_month[worksheet] = list(loaded[worksheet])
+        return records_by_month
+
+    async def _fetch_months(
+        self, sheet_id: str, worksheets: List[str]
+    ) -> Dict[str, List[LedgerRow]]:
+        """
+        從 Sheet 批次讀取多個分頁的記錄
+
+        使用單次 values.batchGet 取得所有分頁；若批次請求失敗（例如其中一個
+        分頁不存在），改為逐一讀取，讀取失敗的分頁會被略過，不影響其他分頁。
+
+        Args:
+            sheet_id: Google Sheet ID
+            worksheets: 分頁名稱列表
+
+        Returns:
+            Dict[str, List[LedgerRow]]: 分頁名稱對應的記錄列表（依輸入順序，不含失敗分頁）
+        """
+        if not worksheets:
+            return {}
+
+        try:
+            result = await self.client.values_batch_get(
+                sheet_id,
+                [f"'{worksheet}'!A:F" for worksheet in worksheets],
+                value_render_option=VALUE_RENDER_OPTION,
+                date_time_render_option=DATE_TIME_RENDER_OPTION,
+            )
+            value_ranges = result.get("valueRanges", [])
+            return {
+                worksheet: decode_values(value_range.get("values", []))
+                for worksheet, value_range in zip(worksheets, value_ranges)
+            }
+        except GoogleAPIError as e:
+            logger.warning(f"Batch read failed, falling back to per-worksheet: {e}")
+            if _is_missing_range_error(e):
+                worksheet_cache.invalidate(sheet_id)
+
+        records_by_month: Dict[str, List[LedgerRow]] = {}
+        for worksheet in worksheets:
+            try:
+                records_by_month[worksheet] = await self._read_month_values(
+                    sheet_id, worksheet
+                )
+            except GoogleAPIError as e:
+                # 某個分頁讀取失敗不影響其他分頁
+                logger.warning(f"Failed to read worksheet '{worksheet}': {e}")
+                continue
+        return records_by_month
+
     async def get_all_records(
         self, sheet_id: str, month: Optional[str] = None
     ) -> List[Dict]:
@@ -368,48 +780,66 @@ class UserSheetsService:
             list: 記帳記錄列表
         """
         try:
-            all_records = []
-
             if month:
                 # 只讀取指定月份的分頁
                 worksheets = [month]
             else:
                 # 讀取所有分頁
-                worksheets = await self._get_worksheets(sheet_id)
-
-            for worksheet in worksheets:
-                try:
-                    result = (
-                        self.sheets_service.spreadsheets()
-                        .values()
-                        .get(spreadsheetId=sheet_id, range=f"'{worksheet}'!A:F")
-                        .execute()
-                    )
+                worksheets = await self._list_worksheets(sheet_id)
 
-                    values = result.get("values", [])
+            records_by_month = await self._read_months(sheet_id, worksheets)
 
-                    if len(values) <= 1:  # 只有標題或沒有資料
-                        continue
-
-                    # 轉換為 dict 列表（跳過標題列）
-                    headers = values[0]
-                    for row in values[1:]:
-                        # 補齊缺少的欄位
-                        while len(row) < len(headers):
-                            row.append("")
-                        all_records.append(dict(zip(headers, row)))
-
-                except HttpError as e:
-                    # 某個分頁讀取失敗不影響其他分頁
-                    logger.warning(f"Failed to read worksheet '{worksheet}': {e}")
-                    continue
-
-            return all_records
+            return [
+                row.to_dict() for rows in records_by_month.values() for row in rows
+            ]
 
-        except HttpError as e:
+        except GoogleAPIError as e:
             logger.error(f"Get all records failed: {e}")
             raise GoogleSheetsError("READ_ERROR", f"讀取 Google Sheet 失敗：{str(e)}")
 
+    @staticmethod
+    def _compute_monthly_stats(month: str, records: List[LedgerRow]) -> MonthlyStats:
+        """根據單月記錄計算統計資料"""
+        total = 0.0
+        by_category: Dict[str, float] = {}
+        by_category_count: Dict[str, int] = {}
+
+        for record in records:
+            amount = record.amount
+            if amount is None:
+                continue
+            total += amount
+
+            category = record.category
+            by_category[category] = by_category.get(category, 0) + amount
+            by_category_count[category] = by_category_count.get(category, 0) + 1
+
+        return MonthlyStats(
+            month=month,
+            total=total,
+            record_count=len(records),
+            by_category=by_category,
+            by_category_count=by_category_count,
+        )
+
+    async def _get_cached_stats(
+        self, sheet_id: str, month: str
+    ) -> Optional[MonthlyStats]:
+        """從月度統計物化結果取得統計（先確認鏡像，以便偵測外部修改）"""
+        if self.aggregates is None or self.aggregates.sheet_id != sheet_id:
+            return None
+        await self._ensure_mirror(sheet_id)
+        return self.aggregates.get(month)
+
+    def _save_stats(self, sheet_id: str, stats: MonthlyStats) -> None:
+        """將完整計算的統計寫回物化結果"""
+        if self.aggregates is None or self.aggregates.sheet_id != sheet_id:
+            return
+        try:
+            self.aggregates.save(stats)
+        except Exception as e:
+            logger.warning(f"Save monthly aggregate failed: {e}")
+
     async def get_monthly_stats(
         self, sheet_id: str, month: Optional[str] = None
     ) -> MonthlyStats:
@@ -430,45 +860,20 @@ class UserSheetsService:
             if month is None:
                 month = datetime.now().strftime("%Y-%m")
 
-            # 直接讀取該月份的分頁
-            records = await self.get_all_records(sheet_id, month=month)
-
-            if not records:
-                return MonthlyStats(
-                    month=month,
-                    total=0.0,
-                    record_count=0,
-                    by_category={},
-                    by_category_count={},
-                )
-
-            # 計算統計
-            total = 0.0
-            by_category: Dict[str, float] = {}
-            by_category_count: Dict[str, int] = {}
-
-            for record in records:
-                try:
-                    amount = float(record.get("花費", 0))
-                    total += amount
+            stats = await self._get_cached_stats(sheet_id, month)
+            if stats is not None:
+                return stats
 
-                    category = record.get("類別", "其他")
-                    by_category[category] = by_category.get(category, 0) + amount
-                    by_category_count[category] = by_category_count.get(category, 0) + 1
-                except (ValueError, TypeError):
-                    continue
+            # 直接讀取該月份的分頁
+            records_by_month = await self._read_months(sheet_id, [month])
+            stats = self._compute_monthly_stats(month, records_by_month.get(month, []))
+            if month in records_by_month:
+                self._save_stats(sheet_id, stats)
 
             logger.info(
-                f"Monthly stats for {month}: total={total}, count={len(records)}"
-            )
-
-            return MonthlyStats(
-                month=month,
-                total=total,
-                record_count=len(records),
-                by_category=by_category,
-                by_category_count=by_category_count,
+                f"Monthly stats for {month}: total={stats.total}, count={stats.record_count}"
             )
+            return stats
 
         except Exception as e:
             logger.error(f"Get monthly stats failed: {e}")
@@ -485,13 +890,35 @@ class UserSheetsService:
             bool: 是否可以存取
         """
         try:
-            self.sheets_service.spreadsheets().get(
-                spreadsheetId=sheet_id, fields="spreadsheetId"
-            ).execute()
+            await self.client.spreadsheets_get(sheet_id, fields="spreadsheetId")
             return True
-        except HttpError:
+        except GoogleAPIError:
             return False
 
+    async def _rows_by_date_range(
+        self, sheet_id: str, start_date: str, end_date: str
+    ) -> List[LedgerRow]:
+        """讀取日期範圍內的記錄（start_date、end_date 格式：YYYY-MM-DD）"""
+        # 從日期範圍推算需要讀取的月份
+        start_month = start_date[:7]  # YYYY-MM
+        end_month = end_date[:7]
+
+        # 只讀取在日期範圍內的月份分頁（單次批次讀取）
+        worksheets = [
+            worksheet
+            for worksheet in await self._list_worksheets(sheet_id)
+            if start_month <= worksheet <= end_month
+        ]
+        records_by_month = await self._read_months(sheet_id, worksheets)
+
+        # 篩選符合日期範圍的記錄
+        return [
+            row
+            for rows in records_by_month.values()
+            for row in rows
+            if start_date <= row.date <= end_date
+        ]
+
     async def get_records_by_date_range(
         self,
         sheet_id: str,
@@ -510,40 +937,60 @@ class UserSheetsService:
             List[Dict]: 符合日期範圍的記錄列表
         """
         try:
-            # 從日期範圍推算需要讀取的月份
-            start_month = start_date[:7]  # YYYY-MM
-            end_month = end_date[:7]
+            rows = await self._rows_by_date_range(sheet_id, start_date, end_date)
 
-            # 讀取可能包含資料的所有月份
-            all_records = []
-            worksheets = await self._get_worksheets(sheet_id)
+            logger.info(
+                f"Found {len(rows)} records between {start_date} and {end_date}"
+            )
+            return [row.to_dict() for row in rows]
 
-            for worksheet in worksheets:
-                # 只讀取在日期範圍內的月份分頁
-                if worksheet < start_month or worksheet > end_month:
-                    continue
+        except Exception as e:
+            logger.error(f"Get records by date range failed: {e}")
+            raise GoogleSheetsError("READ_ERROR", f"查詢記錄失敗：{str(e)}")
 
-                records = await self.get_all_records(sheet_id, month=worksheet)
-                all_records.extend(records)
+    async def get_range_records_and_stats(
+        self,
+        sheet_id: str,
+        start_date: str,
+        end_date: str,
+        months: List[str],
+    ) -> Tuple[List[Dict], List[MonthlyStats]]:
+        """
+        取得日期範圍內的記錄與多個月份的統計
 
-            # 篩選符合日期範圍的記錄
-            filtered_records = []
-            for record in all_records:
-                time_str = record.get("時間", "")
-                # 提取日期部分（YYYY-MM-DD）
-                record_date = time_str[:10] if len(time_str) >= 10 else ""
-                if start_date <= record_date <= end_date:
-                    filtered_records.append(record)
+        需要讀取的分頁（範圍內的月份，以及沒有物化統計的月份）合併為
+        一次批次讀取。
 
-            logger.info(
-                f"Found {len(filtered_records)} records between {start_date} and {end_date}"
-            )
-            return filtered_records
+        Args:
+            sheet_id: Google Sheet ID
+            start_date: 開始日期（格式：YYYY-MM-DD）
+            end_date: 結束日期（格式：YYYY-MM-DD）
+            months: 需要統計的月份列表（格式：YYYY-MM）
 
+        Returns:
+            (符合日期範圍的記錄列表, 各月份的統計資料)
+        """
+        try:
+            range_months = [
+                worksheet
+                for worksheet in await self._list_worksheets(sheet_id)
+                if start_date[:7] <= worksheet <= end_date[:7]
+            ]
+            uncached = [
+                month
+                for month in months
+                if await self._get_cached_stats(sheet_id, month) is None
+            ]
+            # 預先讀取到請求快照，後續讀取不再呼叫 API
+            await self._read_months(sheet_id, range_months + uncached)
         except Exception as e:
-            logger.error(f"Get records by date range failed: {e}")
+            logger.error(f"Get range records and stats failed: {e}")
             raise GoogleSheetsError("READ_ERROR", f"查詢記錄失敗：{str(e)}")
 
+        records = await self.get_records_by_date_range(sheet_id, start_date, end_date)
+        stats = await self.get_multi_month_stats(sheet_id, months) if months else []
+        return records, stats
+
     async def get_records_by_category(
         self,
         sheet_id: str,
@@ -565,10 +1012,14 @@ class UserSheetsService:
             if month is None:
                 month = datetime.now().strftime("%Y-%m")
 
-            records = await self.get_all_records(sheet_id, month=month)
+            records_by_month = await self._read_months(sheet_id, [month])
 
             # 篩選符合類別的記錄
-            filtered_records = [r for r in records if r.get("類別", "") == category]
+            filtered_records = [
+                row.to_dict()
+                for row in records_by_month.get(month, [])
+                if row.category == category
+            ]
 
             logger.info(
                 f"Found {len(filtered_records)} records for category '{category}' in {month}"
@@ -595,10 +1046,24 @@ class UserSheetsService:
             List[MonthlyStats]: 各月份的統計資料
         """
         try:
-            stats_list = []
+            # 已有物化結果的月份直接使用，其餘月份單次批次讀取
+            cached = {}
             for month in months:
-                stats = await self.get_monthly_stats(sheet_id, month=month)
-                stats_list.append(stats)
+                stats = await self._get_cached_stats(sheet_id, month)
+                if stats is not None:
+                    cached[month] = stats
+
+            missing = [month for month in months if month not in cached]
+            records_by_month = await self._read_months(sheet_id, missing)
+            for month in missing:
+                # 讀取失敗的月份視為無資料（不寫入物化結果）
+                cached[month] = self._compute_monthly_stats(
+                    month, records_by_month.get(month, [])
+                )
+                if month in records_by_month:
+                    self._save_stats(sheet_id, cached[month])
+
+            stats_list = [cached[month] for month in months]
 
             logger.info(f"Got stats for {len(stats_list)} months")
             return stats_list
@@ -607,6 +1072,74 @@ class UserSheetsService:
             logger.error(f"Get multi-month stats failed: {e}")
             raise GoogleSheetsError("STATS_ERROR", f"統計查詢失敗：{str(e)}")
 
+    async def _read_recent_month(
+        self, sheet_id: str, month: str, count: int
+    ) -> List[LedgerRow]:
+        """
+        讀取月份分頁最後幾列的記錄
+
+        鏡像可用或同一請求已讀過該月份時直接使用完整資料；否則只讀取
+        分頁尾端 count 列，避免下載整個月份。
+
+        Args:
+            sheet_id: Google Sheet ID
+            month: 月份（格式：YYYY-MM）
+            count: 讀取的列數
+
+        Returns:
+            List[LedgerRow]: 記錄列表（分頁不存在時為空）
+        """
+        if ("month", sheet_id, month) in self._snapshot or await self._ensure_mirror(
+            sheet_id
+        ):
+            return (await self._read_months(sheet_id, [month])).get(month, [])
+
+        for attempt in range(2):
+            last_row = row_count_cache.get(sheet_id, month)
+            learned = last_row is None
+            if learned:
+                last_row = await self._learn_row_count(sheet_id, month)
+                if last_row is None:
+                    return []
+
+            # 第 1 列為標題；不指定結束列，快取的列數過舊時仍可讀到新資料列
+            start_row = max(2, last_row - count + 1)
+            try:
+                result = await self.client.values_get(
+                    sheet_id,
+                    f"'{month}'!A{start_row}:F",
+                    value_render_option=VALUE_RENDER_OPTION,
+                    date_time_render_option=DATE_TIME_RENDER_OPTION,
+                )
+            except GoogleAPIError as e:
+                if not _is_missing_range_error(e):
+                    raise
+                row_count_cache.invalidate(sheet_id, month)
+                return []
+
+            values = result.get("values", [])
+            if len(values) < count and start_row > 2 and not learned and attempt == 0:
+                # 快取的列數大於實際列數（資料列被刪除），重新取得列數後再讀一次
+                row_count_cache.invalidate(sheet_id, month)
+                continue
+            break
+
+        row_count_cache.set(sheet_id, month, start_row + len(values) - 1)
+        # 尾端讀取不含標題列，依 SHEET_HEADERS 欄位順序解碼
+        return DEFAULT_DECODER.decode_rows(values)
+
+    async def _learn_row_count(self, sheet_id: str, month: str) -> Optional[int]:
+        """讀取 A 欄取得分頁最後一列的列號，分頁不存在時回傳 None"""
+        try:
+            result = await self.client.values_get(sheet_id, f"'{month}'!A:A")
+        except GoogleAPIError as e:
+            if _is_missing_range_error(e):
+                return None
+            raise
+        last_row = max(len(result.get("values", [])), 1)
+        row_count_cache.set(sheet_id, month, last_row)
+        return last_row
+
     async def get_recent_records(
         self,
         sheet_id: str,
@@ -616,6 +1149,9 @@ class UserSheetsService:
         """
         取得最近的記帳記錄
 
+        只讀取當月分頁的尾端，筆數不足時才讀取上個月，再以 heap 取出
+        時間最新的 N 筆。
+
         Args:
             sheet_id: Google Sheet ID
             limit: 最多回傳幾筆記錄
@@ -641,29 +1177,27 @@ class UserSheetsService:
             current_month = now.strftime("%Y-%m")
             last_month = (now.replace(day=1) - td(days=1)).strftime("%Y-%m")
 
+            # 先讀當月；筆數不足時才往前一個月（讀取失敗的月份略過）
             all_records = []
-            for month in [current_month, last_month]:
+            for month in (current_month, last_month):
                 try:
-                    records = await self.get_all_records(sheet_id, month=month)
-                    all_records.extend(records)
-                except Exception:
+                    all_records.extend(
+                        await self._read_recent_month(
+                            sheet_id, month, limit * RECENT_TAIL_OVERFETCH
+                        )
+                    )
+                except Exception as e:
+                    logger.warning(f"Skip recent records of {month}: {e}")
                     continue
+                if len(all_records) >= limit:
+                    break
 
-            # 按時間倒序排列（使用 datetime 解析確保正確排序）
-            def parse_time_for_sort(record: Dict) -> datetime:
-                time_str = record.get("時間", "")
-                try:
-                    return datetime.strptime(time_str, "%Y-%m-%d %H:%M")
-                except (ValueError, TypeError):
-                    # 如果解析失敗，返回最小時間（排在最後）
-                    return datetime.min
-
-            all_records.sort(key=parse_time_for_sort, reverse=True)
-
-            # 回傳前 N 筆
-            recent = all_records[:limit]
+            # 按時間倒序取前 N 筆（時間無法解析的記錄排在最後）
+            recent = heapq.nlargest(
+                limit, all_records, key=lambda row: row.timestamp or datetime.min
+            )
             logger.info(f"Got {len(recent)} recent records")
-            return recent
+            return [row.to_dict() for row in recent]
 
         except Exception as e:
             logger.error(f"Get recent records failed: {e}")
@@ -704,23 +1238,13 @@ class UserSheetsService:
             end_date = today.strftime("%Y-%m-%d")
 
             # 取得日期範圍內的記錄
-            records = await self.get_records_by_date_range(
-                sheet_id, start_date, end_date
-            )
+            rows = await self._rows_by_date_range(sheet_id, start_date, end_date)
 
             # 按日期分組統計
             daily_totals: Dict[str, float] = {}
-            for record in records:
-                time_str = record.get("時間", "")
-                record_date = time_str[:10] if len(time_str) >= 10 else ""
-                if record_date:
-                    try:
-                        amount = float(record.get("花費", 0))
-                        daily_totals[record_date] = (
-                            daily_totals.get(record_date, 0) + amount
-                        )
-                    except (ValueError, TypeError):
-                        continue
+            for row in rows:
+                if row.amount is not None:
+                    daily_totals[row.date] = daily_totals.get(row.date, 0) + row.amount
 
             # 填補沒有記錄的日期
             trend = []
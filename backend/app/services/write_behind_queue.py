@@ -0,0 +1,239 @@
+"""Google Sheets write-behind 寫入佇列
+
+連續記帳（例如快速點擊多個快捷按鈕、Siri 捷徑重試）時，將記錄先寫入資料庫
+佇列並立即回應，再於短暫等待後以「每個月份分頁一次 append」的方式批次寫入，
+節省用戶的 Sheets 寫入配額與每次請求的延遲。
+
+佇列以資料庫（pending_sheet_writes）為準，程序重啟後仍可補寫；
+應用程式啟動與關閉時都會清空佇列。寫入時一律以資料庫中的 Google Token
+建立 Sheets 服務，不保留請求的服務（其授權與資料庫 Session 在請求結束後即失效）。
+
+寫入失敗時以指數退避排程重試；超過重試次數後不再主動重試，記錄仍保留在
+佇列中，於下次記帳或應用程式啟動時補寫。本地鏡像與月度統計在排入佇列時
+即已更新（鏡像同步時也會合併佇列中的記錄），因此在補寫成功前，
+儀表板會顯示尚未出現在 Sheet 中的記錄。
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.crud import (
+    create_pending_sheet_write,
+    delete_pending_sheet_writes,
+    get_google_token,
+    get_pending_sheet_writes,
+)
+from app.database.engine import SessionLocal
+from app.models.schemas import AccountingRecord
+from app.services.user_sheets_service import (
+    UserSheetsService,
+    create_user_sheets_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SheetWriteQueue:
+    """以 Sheet 為單位合併寫入的 write-behind 佇列"""
+
+    def __init__(
+        self,
+        window_seconds: float,
+        max_batch: int,
+        session_factory: Callable[[], Session] = SessionLocal,
+        retry_seconds: float = settings.SHEETS_WRITE_BEHIND_RETRY_SECONDS,
+        max_retries: int = settings.SHEETS_WRITE_BEHIND_MAX_RETRIES,
+    ):
+        """
+        初始化佇列
+
+        Args:
+            window_seconds: 第一筆記錄進入佇列後，最多等待多久再寫入
+            max_batch: 同一 Sheet 累積到此筆數時立即寫入
+            session_factory: 資料庫 Session 工廠
+            retry_seconds: 寫入失敗後第一次重試的等待時間（之後每次加倍）
+            max_retries: 連續失敗時最多重試幾次
+        """
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.retry_seconds = retry_seconds
+        self.max_retries = max_retries
+        self._session_factory = session_factory
+        self._counts: Dict[str, int] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._retries: Dict[str, int] = {}
+
+    async def enqueue(
+        self,
+        user_id: str,
+        sheet_id: str,
+        record: AccountingRecord,
+        record_id: Optional[str] = None,
+    ) -> str:
+        """
+        將記錄放入佇列
+
+        Args:
+            user_id: 用戶 ID
+            sheet_id: Google Sheet ID
+            record: 記帳記錄
+            record_id: 記錄 ID（未提供則自動產生）
+
+        Returns:
+            str: 記錄 ID
+        """
+        record_id = record_id or uuid.uuid4().hex
+        month = UserSheetsService.extract_month_from_time(record.時間)
+        row = json.dumps(UserSheetsService.record_to_row(record), ensure_ascii=False)
+
+        with self._session_factory() as db:
+            create_pending_sheet_write(db, record_id, user_id, sheet_id, month, row)
+
+        self._counts[sheet_id] = self._counts.get(sheet_id, 0) + 1
+
+        if sheet_id not in self._timers:
+            self._schedule(sheet_id, self.window_seconds)
+        if self._counts[sheet_id] >= self.max_batch:
+            self._wakeups[sheet_id].set()
+
+        logger.info(f"Queued record {record_id} for sheet {sheet_id}/{month}")
+        return record_id
+
+    def _schedule(self, sheet_id: str, delay: float) -> None:
+        """排程於 delay 秒後（或被喚醒時）寫入"""
+        self._wakeups[sheet_id] = asyncio.Event()
+        self._timers[sheet_id] = asyncio.create_task(self._flush_later(sheet_id, delay))
+
+    def _schedule_retry(self, sheet_id: str, remaining: int) -> None:
+        """flush 後仍有未寫入的記錄時，以指數退避排程重試"""
+        if remaining == 0:
+            self._retries.pop(sheet_id, None)
+            return
+
+        attempt = self._retries.get(sheet_id, 0) + 1
+        if attempt > self.max_retries:
+            self._retries.pop(sheet_id, None)
+            logger.error(
+                f"Giving up retrying {remaining} queued record(s) for sheet {sheet_id}; "
+                "they stay queued (and visible locally) until the next enqueue or restart"
+            )
+            return
+
+        self._retries[sheet_id] = attempt
+        if sheet_id in self._timers:
+            return
+        delay = self.retry_seconds * 2 ** (attempt - 1)
+        logger.warning(
+            f"Retrying {remaining} queued record(s) for sheet {sheet_id} "
+            f"in {delay:.0f}s (attempt {attempt}/{self.max_retries})"
+        )
+        self._schedule(sheet_id, delay)
+
+    async def _flush_later(self, sheet_id: str, delay: float) -> None:
+        """等待 delay 秒或達到批次上限後寫入"""
+        try:
+            await asyncio.wait_for(self._wakeups[sheet_id].wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._timers.pop(sheet_id, None)
+            self._wakeups.pop(sheet_id, None)
+
+        try:
+            await self.flush(sheet_id)
+        except Exception as e:
+            logger.error(f"Write-behind flush failed for sheet {sheet_id}: {e}")
+
+    def _service_for_user(self, user_id: str) -> Optional[UserSheetsService]:
+        """以資料庫中的 Google Token 建立 Sheets 服務"""
+        with self._session_factory() as db:
+            google_token = get_google_token(db, user_id)
+        if not google_token:
+            return None
+        return create_user_sheets_service(
+            access_token=google_token.access_token,
+            refresh_token=google_token.refresh_token,
+            expires_at=google_token.expires_at,
+        )
+
+    async def flush(self, sheet_id: str) -> int:
+        """
+        將指定 Sheet 的佇列寫入 Google Sheet
+
+        每個月份分頁只呼叫一次 append；寫入失敗的月份保留在佇列中，
+        並排程重試。
+
+        Args:
+            sheet_id: Google Sheet ID
+
+        Returns:
+            int: 成功寫入的筆數
+        """
+        lock = self._locks.setdefault(sheet_id, asyncio.Lock())
+        async with lock:
+            with self._session_factory() as db:
+                pending = get_pending_sheet_writes(db, sheet_id=sheet_id)
+            self._counts[sheet_id] = 0
+            if not pending:
+                return 0
+
+            sheets_service = self._service_for_user(pending[0].user_id)
+            if sheets_service is None:
+                logger.error(f"No credentials to flush pending writes for {sheet_id}")
+                self._schedule_retry(sheet_id, len(pending))
+                return 0
+
+            by_month: Dict[str, List] = {}
+            for item in pending:
+                by_month.setdefault(item.month, []).append(item)
+
+            flushed = 0
+            for month, items in by_month.items():
+                try:
+                    await sheets_service.append_rows(
+                        sheet_id, month, [json.loads(item.row) for item in items]
+                    )
+                except Exception as e:
+                    logger.error(f"Flush {len(items)} row(s) to {sheet_id}/{month}: {e}")
+                    continue
+
+                with self._session_factory() as db:
+                    delete_pending_sheet_writes(db, [item.id for item in items])
+                flushed += len(items)
+
+            logger.info(f"Flushed {flushed} queued record(s) to sheet {sheet_id}")
+            self._schedule_retry(sheet_id, len(pending) - flushed)
+            return flushed
+
+    async def flush_all(self) -> int:
+        """寫入所有 Sheet 的佇列（啟動補寫與關閉時使用）"""
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+
+        with self._session_factory() as db:
+            sheet_ids = list(
+                dict.fromkeys(item.sheet_id for item in get_pending_sheet_writes(db))
+            )
+
+        flushed = 0
+        for sheet_id in sheet_ids:
+            try:
+                flushed += await self.flush(sheet_id)
+            except Exception as e:
+                logger.error(f"Write-behind flush failed for sheet {sheet_id}: {e}")
+        return flushed
+
+
+# 單例模式
+sheet_write_queue = SheetWriteQueue(
+    window_seconds=settings.SHEETS_WRITE_BEHIND_WINDOW_SECONDS,
+    max_batch=settings.SHEETS_WRITE_BEHIND_MAX_BATCH,
+)
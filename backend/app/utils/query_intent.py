@@ -0,0 +1,113 @@
+"""智慧查詢的意圖分類
+
+財務小助手的問題大致分為帳務統計、趨勢比較、理財知識與日常閒聊。
+只有前兩類需要讀取用戶的 Sheet 資料；在呼叫 LLM 前先以關鍵字在本地
+分類，只取得該意圖需要的上下文，知識與閒聊問題完全不讀取 Sheets。
+無法判斷時視為 unknown，取得完整上下文（與分類前的行為相同）。
+"""
+
+import re
+import unicodedata
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from app.utils.categories import DEFAULT_CATEGORIES
+
+INTENT_LEDGER = "ledger"
+INTENT_TREND = "trend"
+INTENT_KNOWLEDGE = "knowledge"
+INTENT_CHAT = "chat"
+INTENT_UNKNOWN = "unknown"
+
+# 上下文項目
+CONTEXT_STATS = "stats"
+CONTEXT_RECENT = "recent_records"
+CONTEXT_MULTI_MONTH = "multi_month_stats"
+
+# 各意圖需要的上下文
+INTENT_CONTEXT: Dict[str, FrozenSet[str]] = {
+    INTENT_LEDGER: frozenset({CONTEXT_STATS, CONTEXT_RECENT}),
+    INTENT_TREND: frozenset({CONTEXT_STATS, CONTEXT_MULTI_MONTH}),
+    INTENT_KNOWLEDGE: frozenset(),
+    INTENT_CHAT: frozenset(),
+    INTENT_UNKNOWN: frozenset({CONTEXT_STATS, CONTEXT_RECENT, CONTEXT_MULTI_MONTH}),
+}
+
+# 比較多個月份（預算規劃也需要歷史月份）
+TREND_KEYWORDS: List[str] = [
+    "趨勢", "走勢", "比起", "變化", "增加", "減少", "成長",
+    "上個月", "上月", "前幾個月", "近三個月", "最近幾個月", "每個月", "每月",
+    "月份", "歷史", "預算",
+]
+
+# 查詢自己的帳務（類別名稱也算）
+LEDGER_KEYWORDS: List[str] = [
+    "花了", "花多少", "花這麼多", "花太多", "刷了", "花費", "支出", "消費",
+    "開銷", "記錄", "紀錄", "記帳", "帳務", "多少", "總共", "合計", "最多",
+    "最少", "明細", "這個月", "本月", "今天", "昨天", "前天", "這週", "這周",
+    "本週", "上週", "上周", "我的", "我花", "省錢",
+] + DEFAULT_CATEGORIES
+
+# 理財知識
+KNOWLEDGE_KEYWORDS: List[str] = [
+    "什麼是", "是什麼", "什麼意思", "差別", "差異", "怎麼", "如何", "為什麼",
+    "etf", "基金", "股票", "債券", "投資", "利率", "利息", "定存", "複利",
+    "通膨", "保險", "稅", "貸款", "信用卡", "儲蓄", "理財", "退休", "匯率",
+]
+
+# 問候、感謝等閒聊
+CHAT_KEYWORDS: List[str] = [
+    "你好", "您好", "哈囉", "嗨", "hi", "hello", "hey", "早安", "午安", "晚安",
+    "謝謝", "感謝", "辛苦了", "再見", "掰", "你是誰", "你叫什麼", "哈哈",
+]
+
+# 只由問候組成的短句才視為閒聊（避免「你好，這個月花多少」被誤判）
+MAX_CHAT_LENGTH = 20
+
+# 提到自己的知識問題可能需要個人資料（例如「我適合買 ETF 嗎」），不略過上下文
+PERSONAL_MARKER = "我"
+
+_PUNCTUATION = re.compile(r"[\W_]+")
+
+
+def _normalize(text: str) -> str:
+    """全形轉半形、轉小寫並移除空白與標點"""
+    return _PUNCTUATION.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+def _find_keyword(text: str, keywords: List[str]) -> Optional[str]:
+    return next((keyword for keyword in keywords if keyword in text), None)
+
+
+def classify_query(query: str) -> Tuple[str, Optional[str]]:
+    """
+    分類查詢意圖
+
+    依序判斷趨勢、帳務、知識、閒聊；帳務相關的關鍵字優先於知識，
+    例如「信用卡這個月花多少」為帳務查詢。誤判為知識或閒聊會讓回答缺少
+    帳務資料，因此不確定時一律回傳 unknown（取得完整上下文）。
+
+    Args:
+        query: 用戶的問題
+
+    Returns:
+        (意圖, 命中的關鍵字)：無法判斷時為 (INTENT_UNKNOWN, None)
+    """
+    text = _normalize(query)
+    if not text:
+        return INTENT_UNKNOWN, None
+
+    keyword = _find_keyword(text, TREND_KEYWORDS)
+    if keyword:
+        return INTENT_TREND, keyword
+    keyword = _find_keyword(text, LEDGER_KEYWORDS)
+    if keyword:
+        return INTENT_LEDGER, keyword
+    keyword = _find_keyword(text, KNOWLEDGE_KEYWORDS)
+    if keyword:
+        if PERSONAL_MARKER in text:
+            return INTENT_UNKNOWN, keyword
+        return INTENT_KNOWLEDGE, keyword
+    keyword = _find_keyword(text, CHAT_KEYWORDS)
+    if keyword and len(text) <= MAX_CHAT_LENGTH:
+        return INTENT_CHAT, keyword
+    return INTENT_UNKNOWN, None
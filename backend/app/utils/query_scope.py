@@ -0,0 +1,211 @@
+"""智慧查詢的時間範圍與類別擷取
+
+從問題中找出時間範圍（「今天」、「上週」、「去年三月」、「最近 10 天」等）
+與消費類別（「吃飯」→ 飲食），讓查詢只讀取該範圍的分頁，並只把相關的
+記錄與統計交給 LLM。日期以用戶時區的「今天」為基準計算。
+"""
+
+import re
+import unicodedata
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from app.utils.quick_parser import match_category
+
+# 問題中未指定時間、只指定類別時使用的範圍
+DEFAULT_LABEL = "本月"
+
+# 「最近 N 天 / 週 / 個月」的上限（避免一次讀取過多分頁）
+MAX_RECENT_DAYS = 366
+MAX_RECENT_MONTHS = 12
+
+_CHINESE_DIGITS = {
+    "零": 0, "一": 1, "二": 2, "兩": 2, "三": 3, "四": 4,
+    "五": 5, "六": 6, "七": 7, "八": 8, "九": 9,
+}
+
+_NUM = r"\d{1,3}|[零一二兩三四五六七八九十]{1,3}"
+
+_FULL_DATE = re.compile(r"(\d{4})[-/年](\d{1,2})[-/月](\d{1,2})[日號]?")
+_MONTH_DAY = re.compile(rf"(今年|去年|前年)?({_NUM})月({_NUM})[日號]")
+_YEAR_MONTH = re.compile(r"(\d{4})(?:年(\d{1,2})月|[-/](\d{1,2}))")
+_NAMED_MONTH = re.compile(rf"(今年|去年|前年)?({_NUM})月份?")
+_RECENT = re.compile(rf"(?:最近|近|過去|前)({_NUM})(天|日|週|周|個禮拜|個星期|個月)")
+_WEEK = re.compile(r"(這|本|上)(?:個)?(週|周|禮拜|星期)")
+_DAY = re.compile(r"今天|今日|昨天|昨日|大前天|前天")
+_MONTH = re.compile(r"這個月|這月|本月|上上個月|上個月|上月")
+_YEAR = re.compile(r"今年|去年|前年|(\d{4})年")
+
+_DAY_OFFSETS = {"今天": 0, "今日": 0, "昨天": 1, "昨日": 1, "前天": 2, "大前天": 3}
+_MONTH_OFFSETS = {"這個月": 0, "這月": 0, "本月": 0, "上個月": 1, "上月": 1, "上上個月": 2}
+_YEAR_OFFSETS = {"今年": 0, "去年": 1, "前年": 2}
+
+
+def _parse_number(text: str) -> Optional[int]:
+    """解析阿拉伯數字或中文數字（最多到九十九）"""
+    if text.isdigit():
+        return int(text)
+    if "十" in text:
+        tens, _, ones = text.partition("十")
+        for digit in (tens, ones):
+            if digit and digit not in _CHINESE_DIGITS:
+                return None
+        return _CHINESE_DIGITS.get(tens, 1) * 10 + _CHINESE_DIGITS.get(ones, 0)
+    if len(text) == 1:
+        return _CHINESE_DIGITS.get(text)
+    return None
+
+
+def _shift_month(year: int, month: int, offset: int) -> Tuple[int, int]:
+    """往前推 offset 個月"""
+    index = year * 12 + (month - 1) - offset
+    return index // 12, index % 12 + 1
+
+
+def _month_range(year: int, month: int) -> Tuple[date, date]:
+    start = date(year, month, 1)
+    next_year, next_month = _shift_month(year, month, -1)
+    return start, date(next_year, next_month, 1) - timedelta(days=1)
+
+
+def months_between(start: date, end: date) -> List[str]:
+    """start 到 end 之間的月份（YYYY-MM，含頭尾）"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = _shift_month(year, month, -1)
+    return months
+
+
+class QueryScope:
+    """問題指定的日期範圍（含頭尾）與類別"""
+
+    __slots__ = ("start", "end", "label", "category")
+
+    def __init__(
+        self, start: date, end: date, label: str, category: Optional[str] = None
+    ):
+        self.start = start
+        self.end = end
+        self.label = label
+        self.category = category
+
+    @property
+    def months(self) -> List[str]:
+        """範圍涵蓋的月份"""
+        return months_between(self.start, self.end)
+
+    def describe(self) -> str:
+        """範圍說明（放入 LLM 訊息）"""
+        text = f"{self.label}（{self.start.isoformat()} ~ {self.end.isoformat()}）"
+        if self.category:
+            text += f"，類別：{self.category}"
+        return text
+
+
+def _match_time(text: str, today: date) -> Optional[Tuple[date, date, str]]:
+    """擷取時間範圍，回傳 (開始日期, 結束日期, 原文)"""
+    match = _FULL_DATE.search(text)
+    if match:
+        try:
+            day = date(int(match[1]), int(match[2]), int(match[3]))
+            return day, day, match[0]
+        except ValueError:
+            return None
+
+    match = _MONTH_DAY.search(text)
+    if match:
+        month, day = _parse_number(match[2]), _parse_number(match[3])
+        if month and day:
+            year = today.year - _YEAR_OFFSETS[match[1]] if match[1] else today.year
+            try:
+                resolved = date(year, month, day)
+                if not match[1] and resolved > today:
+                    # 未指定年份時為最近一次的該日期（一月問「12月25號」指去年）
+                    resolved = date(year - 1, month, day)
+            except ValueError:
+                return None
+            return resolved, resolved, match[0]
+
+    match = _YEAR_MONTH.search(text)
+    if match and 1 <= int(match[2] or match[3]) <= 12:
+        return (*_month_range(int(match[1]), int(match[2] or match[3])), match[0])
+
+    match = _RECENT.search(text)
+    if match:
+        count = _parse_number(match[1])
+        if count:
+            unit = match[2]
+            if unit.endswith("月"):
+                count = min(count, MAX_RECENT_MONTHS)
+                year, month = _shift_month(today.year, today.month, count - 1)
+                return date(year, month, 1), today, match[0]
+            days = count * 7 if unit not in ("天", "日") else count
+            days = min(days, MAX_RECENT_DAYS)
+            return today - timedelta(days=days - 1), today, match[0]
+
+    match = _NAMED_MONTH.search(text)
+    if match:
+        month = _parse_number(match[2])
+        if month and 1 <= month <= 12:
+            if match[1]:
+                year = today.year - _YEAR_OFFSETS[match[1]]
+            else:
+                # 未指定年份時為最近一次的該月份（二月問「十二月」指去年十二月）
+                year = today.year if month <= today.month else today.year - 1
+            return (*_month_range(year, month), match[0])
+
+    match = _WEEK.search(text)
+    if match:
+        monday = today - timedelta(days=today.weekday())
+        if match[1] == "上":
+            return monday - timedelta(days=7), monday - timedelta(days=1), match[0]
+        return monday, today, match[0]
+
+    match = _DAY.search(text)
+    if match:
+        day = today - timedelta(days=_DAY_OFFSETS[match[0]])
+        return day, day, match[0]
+
+    match = _MONTH.search(text)
+    if match:
+        year, month = _shift_month(today.year, today.month, _MONTH_OFFSETS[match[0]])
+        return (*_month_range(year, month), match[0])
+
+    match = _YEAR.search(text)
+    if match:
+        year = int(match[1]) if match[1] else today.year - _YEAR_OFFSETS[match[0]]
+        return date(year, 1, 1), date(year, 12, 31), match[0]
+
+    return None
+
+
+def extract_query_scope(query: str, today: date) -> Optional[QueryScope]:
+    """
+    擷取問題中的時間範圍與類別
+
+    只指定類別時範圍為本月；結束日期不超過今天。
+
+    Args:
+        query: 用戶的問題
+        today: 用戶時區的今天
+
+    Returns:
+        Optional[QueryScope]: 問題未指定時間與類別時回傳 None
+    """
+    text = re.sub(r"\s+", "", unicodedata.normalize("NFKC", query).lower())
+    category = match_category(text)
+    matched = _match_time(text, today)
+    if matched is None:
+        if category is None:
+            return None
+        start, end = _month_range(today.year, today.month)
+        label = DEFAULT_LABEL
+    else:
+        start, end, label = matched
+
+    end = min(end, today)
+    if start > end:
+        return None
+    return QueryScope(start, end, label, category)
@@ -0,0 +1,147 @@
+"""純數字帳務問題的本地回答
+
+「這個月花了多少」、「飲食花多少」、「剩多少預算」這類問題只需要加總與
+預算即可精確回答，不需要呼叫 LLM。先擷取問題的時間範圍與類別，移除後
+剩下的句子必須完全符合下列句型之一，才以模板產生回答；其餘問題
+（比較、原因、建議等）回傳 None 交給 LLM。
+"""
+
+import re
+import unicodedata
+from datetime import date
+from typing import Optional
+
+from app.utils.query_scope import DEFAULT_LABEL, QueryScope, extract_query_scope
+from app.utils.quick_parser import CATEGORY_KEYWORDS
+
+KIND_TOTAL = "total"
+KIND_COUNT = "count"
+KIND_BUDGET = "budget"
+
+_PUNCTUATION = re.compile(r"[\W_]+")
+
+# 不影響問題意思的字詞
+_FILLER = re.compile(
+    r"請問|幫我|查一下|到目前為止|到現在|目前|現在|總共|一共|總計|合計|全部"
+    r"|我|的|了|呢|啊|呀|喔|嗎"
+)
+
+# 句型（移除時間、類別與贅字後必須完全符合）
+_TOTAL = re.compile(
+    r"費?用?(?:花|花掉|花費|支出|消費|開銷|用)(?:是|有)?(?:多少|幾塊|幾元)(?:錢|元)?"
+)
+# 「交通費多少」：指定類別時可省略動詞
+_CATEGORY_TOTAL = re.compile(r"費用?(?:是|有)?多少(?:錢|元)?")
+_COUNT = re.compile(
+    r"(?:記|記錄|紀錄|記帳|花|消費)?(?:幾|多少)筆(?:記錄|紀錄|帳|消費)?"
+)
+_BUDGET = re.compile(
+    r"(?:預算還?(?:剩下?|剩餘|有)?|還?(?:剩下?|剩餘))(?:多少|幾塊|幾元)(?:錢|元|預算)?"
+    r"|還(?:能|可以)花(?:多少|幾塊|幾元)(?:錢|元)?"
+)
+
+
+def _normalize(text: str) -> str:
+    """全形轉半形、轉小寫並移除空白與標點"""
+    return _PUNCTUATION.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+class NumericQuestion:
+    """可由彙總資料直接回答的問題"""
+
+    __slots__ = ("kind", "scope")
+
+    def __init__(self, kind: str, scope: QueryScope):
+        self.kind = kind
+        self.scope = scope
+
+
+def parse_numeric_question(query: str, today: date) -> Optional[NumericQuestion]:
+    """
+    辨識純數字帳務問題
+
+    Args:
+        query: 用戶的問題
+        today: 用戶時區的今天
+
+    Returns:
+        Optional[NumericQuestion]: 不符合任何句型時回傳 None；未指定時間時範圍為本月
+    """
+    core = _normalize(query)
+    scope = extract_query_scope(query, today)
+    if scope is None:
+        scope = QueryScope(today.replace(day=1), today, DEFAULT_LABEL)
+    else:
+        core = core.replace(_normalize(scope.label), "", 1)
+    if scope.category:
+        keywords = [scope.category] + CATEGORY_KEYWORDS.get(scope.category, [])
+        for keyword in sorted(keywords, key=len, reverse=True):
+            core = core.replace(keyword, "")
+    core = _FILLER.sub("", core)
+
+    if _TOTAL.fullmatch(core) or (scope.category and _CATEGORY_TOTAL.fullmatch(core)):
+        return NumericQuestion(KIND_TOTAL, scope)
+    if _COUNT.fullmatch(core):
+        return NumericQuestion(KIND_COUNT, scope)
+    # 預算只有本月、不分類別
+    if (
+        _BUDGET.fullmatch(core)
+        and scope.category is None
+        and (scope.start, scope.end) == (today.replace(day=1), today)
+    ):
+        return NumericQuestion(KIND_BUDGET, scope)
+    return None
+
+
+def format_amount(amount: float) -> str:
+    """金額加上千分位（整數不顯示小數）"""
+    if float(amount).is_integer():
+        return f"{amount:,.0f}"
+    return f"{amount:,.2f}"
+
+
+def render_numeric_answer(
+    question: NumericQuestion,
+    total: float,
+    count: int,
+    budget: Optional[int] = None,
+) -> str:
+    """
+    以模板產生回答
+
+    Args:
+        question: 辨識出的問題
+        total: 範圍內（指定類別時為該類別）的總支出
+        count: 範圍內的記錄筆數
+        budget: 每月預算（預算問題使用，未設定時為 None）
+
+    Returns:
+        str: 回答內容
+    """
+    scope = question.scope
+    label = scope.label
+    subject = f"{scope.category}類" if scope.category else ""
+
+    if question.kind == KIND_BUDGET:
+        if budget is None:
+            return (
+                f"你還沒有設定每月預算。本月目前已花費 {format_amount(total)} 元，"
+                "可以在設定頁面設定預算，方便追蹤支出。"
+            )
+        remaining = budget - total
+        if remaining < 0:
+            return (
+                f"本月預算 {format_amount(budget)} 元，已花費 {format_amount(total)} 元，"
+                f"超出預算 {format_amount(-remaining)} 元。"
+            )
+        used = f"，已使用 {total / budget * 100:.0f}%" if budget > 0 else ""
+        return (
+            f"本月預算 {format_amount(budget)} 元，已花費 {format_amount(total)} 元，"
+            f"還剩 {format_amount(remaining)} 元{used}。"
+        )
+
+    if count == 0:
+        return f"{label}沒有{subject}消費記錄。"
+    if question.kind == KIND_COUNT:
+        return f"{label}共記了 {count} 筆{subject}消費，合計 {format_amount(total)} 元。"
+    return f"{label}{subject}共花了 {format_amount(total)} 元（{count} 筆）。"
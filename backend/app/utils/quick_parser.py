@@ -0,0 +1,259 @@
+"""常見記帳語句的規則式快速解析
+
+Siri 捷徑與快速記帳按鈕送出的內容大多是「午餐 120」、「咖啡85元 信用卡」、
+「捷運 30」這類固定格式。這些語句以關鍵字字典與規則在本地解析，不需要
+呼叫 LLM；只要有任何不確定（多個金額、日期描述、無法判斷類別等），
+就回傳 None 交給 LLM 處理。
+"""
+
+import re
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.models.schemas import AccountingRecord
+from app.utils.categories import DEFAULT_CATEGORIES
+
+# 類別關鍵字（名稱包含關鍵字即歸類；類別名稱本身也是關鍵字）
+# 不使用單一字元的關鍵字，避免比對到無關名稱中的字（例如「書包」的「書」）
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "飲食": [
+        "早餐", "午餐", "晚餐", "早午餐", "宵夜", "點心", "下午茶", "便當",
+        "咖啡", "拿鐵", "飲料", "奶茶", "珍奶", "手搖", "紅茶", "綠茶",
+        "果汁", "豆漿", "麵包", "蛋餅", "飯糰", "漢堡", "披薩", "火鍋",
+        "拉麵", "牛肉麵", "水餃", "小吃", "滷味", "雞排", "鹹酥雞", "聚餐",
+        "外送", "吃飯", "水果", "零食", "啤酒", "ubereats", "foodpanda",
+    ],
+    "交通": [
+        "捷運", "公車", "客運", "計程車", "小黃", "uber", "高鐵", "台鐵",
+        "火車", "加油", "油錢", "停車", "過路費", "etag", "機票", "ubike",
+        "共享機車",
+    ],
+    "娛樂": [
+        "電影", "唱歌", "ktv", "遊戲", "門票", "演唱會", "展覽", "訂閱",
+        "netflix", "spotify", "youtube", "健身房", "旅遊",
+    ],
+    "購物": [
+        "衣服", "褲子", "鞋子", "球鞋", "包包", "日用品", "衛生紙", "洗髮精", "超市",
+        "全聯", "家樂福", "好市多", "蝦皮", "網購", "文具", "手機殼",
+    ],
+    "居住": [
+        "房租", "租金", "水費", "電費", "瓦斯", "網路費", "管理費", "電話費",
+    ],
+    "醫療": ["看診", "掛號", "診所", "醫院", "藥局", "牙醫", "藥品", "藥費", "健保"],
+    "教育": ["學費", "補習", "課程", "書籍", "參考書", "書店", "課本", "教材", "線上課"],
+}
+
+# 支付方式（關鍵字 → 正規名稱）
+PAYMENT_METHODS: Dict[str, str] = {
+    "信用卡": "信用卡",
+    "刷卡": "信用卡",
+    "現金": "現金",
+    "悠遊卡": "悠遊卡",
+    "一卡通": "一卡通",
+    "line pay": "LINE Pay",
+    "linepay": "LINE Pay",
+    "街口": "街口支付",
+    "apple pay": "Apple Pay",
+    "轉帳": "轉帳",
+}
+
+# 幣別（關鍵字 → ISO 代碼）
+CURRENCIES: Dict[str, str] = {
+    "新台幣": "TWD",
+    "台幣": "TWD",
+    "nt$": "TWD",
+    "twd": "TWD",
+    "元": "TWD",
+    "塊錢": "TWD",
+    "塊": "TWD",
+    "美金": "USD",
+    "美元": "USD",
+    "usd": "USD",
+    "日幣": "JPY",
+    "日圓": "JPY",
+    "円": "JPY",
+    "jpy": "JPY",
+    "歐元": "EUR",
+    "eur": "EUR",
+    "人民幣": "CNY",
+    "港幣": "HKD",
+}
+
+# 出現這些描述時，時間可能不是「現在」，交給 LLM 判斷
+_TIME_HINT = re.compile(
+    r"昨|前天|大前天|上週|上周|上禮拜|上星期|上個|明天|後天"
+    r"|[週周][一二三四五六日天]|星期|禮拜|\d\s*[點號:/]|\d+\s*月"
+)
+
+# 語句開頭的時段與動詞（LLM 解析時不會放進名稱）
+_LEADING_FILLER = re.compile(
+    r"^(今天|剛剛|剛才)?(早上|中午|下午|晚上|半夜)?(去)?((吃|喝|買|搭|坐|付|繳)了?)?"
+)
+
+_NUMBER = re.compile(r"\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?")
+# 金額前的正負號（例如退款「午餐 -120」），交給 LLM 判斷
+_SIGNED = re.compile(r"[-+−]\s*$")
+_SEPARATORS = re.compile(r"[\s,，、。.!！~～:：;；+＋$＄]+")
+
+# 多筆記帳之間的分隔（全形標點已先轉為半形；數字中的千分位逗號不分隔）
+_RECORD_SEPARATORS = re.compile(r"(?<!\d),|,(?!\d)|[;。\n]")
+
+# 依關鍵字長度由長到短比對，避免「新台幣」被「台幣」、「塊錢」被「塊」搶先吃掉
+_CURRENCY_KEYS = sorted(CURRENCIES, key=len, reverse=True)
+_PAYMENT_KEYS = sorted(PAYMENT_METHODS, key=len, reverse=True)
+# 類別關鍵字同樣由長到短比對，避免「ubereats」中的「uber」被歸為交通
+_CATEGORY_KEYS = sorted(
+    (
+        (keyword, category)
+        for category in DEFAULT_CATEGORIES
+        for keyword in [category] + CATEGORY_KEYWORDS.get(category, [])
+    ),
+    key=lambda item: len(item[0]),
+    reverse=True,
+)
+
+MAX_NAME_LENGTH = 12
+MAX_RECORDS = 10
+
+
+def _normalize(text: str) -> str:
+    """全形轉半形（例如「１２０」→「120」）"""
+    return unicodedata.normalize("NFKC", text).strip()
+
+
+def has_time_hint(text: str) -> bool:
+    """語句是否描述了非「現在」的時間（例如「昨天」、「3點」）"""
+    return bool(_TIME_HINT.search(_normalize(text).lower()))
+
+
+def _take_keyword(
+    text: str, keys: List[str], mapping: Dict[str, str]
+) -> Tuple[str, Optional[str]]:
+    """
+    從文字中取出關鍵字
+
+    Returns:
+        (移除關鍵字後的文字, 對應值)；出現兩種以上不同的值時對應值為 "?"
+    """
+    found = set()
+    for key in keys:
+        if key in text:
+            found.add(mapping[key])
+            # 以等長空白取代，文字位置與原始語句保持對應
+            text = text.replace(key, " " * len(key))
+    if len(found) > 1:
+        return text, "?"
+    return text, found.pop() if found else None
+
+
+def match_category(name: str) -> Optional[str]:
+    """
+    依關鍵字判斷類別，無法判斷或符合多個類別時回傳 None
+
+    已比對到的文字會被移除，不再參與較短關鍵字的比對。
+    """
+    matched = set()
+    for keyword, category in _CATEGORY_KEYS:
+        if keyword in name:
+            matched.add(category)
+            name = name.replace(keyword, " ")
+    return matched.pop() if len(matched) == 1 else None
+
+
+def quick_parse(text: str, now: Optional[datetime] = None) -> Optional[AccountingRecord]:
+    """
+    以規則解析常見記帳語句
+
+    Args:
+        text: 使用者輸入的記帳文字，如 "午餐 120"、"咖啡85元 信用卡"
+        now: 記帳時間（預設為現在，與 LLM 解析相同）
+
+    Returns:
+        Optional[AccountingRecord]: 高信心時回傳記帳記錄，否則回傳 None
+    """
+    original = _normalize(text)
+    normalized = original.lower()
+    if not normalized or _TIME_HINT.search(normalized):
+        return None
+
+    # 金額：必須剛好一個數字
+    numbers = list(_NUMBER.finditer(normalized))
+    if len(numbers) != 1:
+        return None
+    number = numbers[0]
+    if _SIGNED.search(normalized, 0, number.start()):
+        return None
+    amount = float(number.group().replace(",", ""))
+    if amount <= 0:
+        return None
+    rest = (
+        normalized[: number.start()]
+        + " " * len(number.group())
+        + normalized[number.end() :]
+    )
+
+    # 支付方式與幣別
+    rest, payment_method = _take_keyword(rest, _PAYMENT_KEYS, PAYMENT_METHODS)
+    rest, currency = _take_keyword(rest, _CURRENCY_KEYS, CURRENCIES)
+    if payment_method == "?" or currency == "?":
+        return None
+
+    # 剩下的文字即為名稱（記錄每個字的位置，用來取回原始大小寫）
+    positions = [i for i, c in enumerate(rest) if not _SEPARATORS.match(c)]
+    name = "".join(rest[i] for i in positions)
+    filler = _LEADING_FILLER.match(name).end()
+    name, positions = name[filler:], positions[filler:]
+    if not name or len(name) > MAX_NAME_LENGTH or any(c.isdigit() for c in name):
+        return None
+
+    category = match_category(name)
+    if category is None:
+        return None
+
+    # 名稱保留原始大小寫（例如 Uber）；lower() 改變長度時無法對應，維持小寫
+    if len(original) == len(normalized):
+        name = "".join(original[i] for i in positions)
+
+    return AccountingRecord(
+        時間=(now or datetime.now()).strftime("%Y-%m-%d %H:%M"),
+        名稱=name,
+        類別=category,
+        花費=amount,
+        幣別=currency or "TWD",
+        支付方式=payment_method,
+    )
+
+
+def quick_parse_many(
+    text: str, now: Optional[datetime] = None
+) -> Optional[List[AccountingRecord]]:
+    """
+    以規則解析一句話中的一筆或多筆記帳
+
+    整句無法解析時，依逗號、分號、句號切分後逐段解析，
+    例如 "早餐蛋餅45，午餐便當120，晚上捷運30"。
+
+    Returns:
+        Optional[List[AccountingRecord]]: 每一段都能高信心解析時回傳記錄，否則回傳 None
+    """
+    now = now or datetime.now()
+    record = quick_parse(text, now)
+    if record is not None:
+        return [record]
+
+    segments = [
+        segment
+        for segment in _RECORD_SEPARATORS.split(_normalize(text))
+        if segment.strip()
+    ]
+    if len(segments) < 2 or len(segments) > MAX_RECORDS:
+        return None
+
+    records = []
+    for segment in segments:
+        record = quick_parse(segment, now)
+        if record is None:
+            return None
+        records.append(record)
+    return records
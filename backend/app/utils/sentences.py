@@ -0,0 +1,46 @@
+"""長文字分句（語音合成管線使用）"""
+
+import re
+from typing import List
+
+# 句尾標點（保留在句子中）與換行
+_SENTENCE_END = re.compile(r"(?<=[。！？!?；;…])|\n+")
+
+
+def split_sentences(text: str, min_chars: int = 20, max_chars: int = 200) -> List[str]:
+    """
+    依句尾標點切分文字
+
+    過短的句子會與下一句合併，避免產生大量很短的合成請求；
+    沒有標點的超長段落則依 max_chars 強制切分。
+
+    Args:
+        text: 要切分的文字
+        min_chars: 每段最少字數（最後一段除外）
+        max_chars: 每段最多字數
+
+    Returns:
+        List[str]: 切分後的段落（不含空白段落）
+    """
+    pieces: List[str] = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > max_chars:
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if sentence:
+            pieces.append(sentence)
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+        if len(current) >= min_chars:
+            chunks.append(current)
+            current = ""
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,128 @@
+"""事件迴圈延遲基準測試
+
+模擬多位用戶同時載入 Dashboard（當月統計 + 最近記錄 + 每日趨勢），
+比較 Google API 呼叫「阻塞事件迴圈」（舊版 googleapiclient `.execute()`）
+與「非同步連線池」兩種傳輸方式下的事件迴圈延遲。
+
+不會呼叫真實的 Google API：以 httpx.MockTransport 模擬固定延遲的 Sheets 後端。
+
+使用方式（於 backend 目錄）：
+    python -m benchmarks.bench_event_loop_latency --users 20 --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+import httpx
+from google.oauth2.credentials import Credentials
+
+from app.services.user_sheets_service import UserSheetsService, worksheet_cache
+
+HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+
+
+def _fake_response(request: httpx.Request) -> httpx.Response:
+    """依請求路徑回傳假的 Sheets 資料"""
+    month = datetime.now().strftime("%Y-%m")
+    rows = [HEADERS] + [
+        [f"{month}-01 12:{i % 60:02d}", f"項目{i}", "飲食", str(100 + i), "TWD", ""]
+        for i in range(200)
+    ]
+    path = request.url.path
+    if path.endswith("values:batchGet"):
+        ranges = request.url.params.get_list("ranges")
+        return httpx.Response(
+            200, json={"valueRanges": [{"values": rows} for _ in ranges]}
+        )
+    if "/values/" in path:
+        return httpx.Response(200, json={"values": rows})
+    return httpx.Response(200, json={"sheets": [{"properties": {"title": month}}]})
+
+
+def blocking_transport(latency: float) -> httpx.MockTransport:
+    """模擬同步 `.execute()`：在事件迴圈執行緒中阻塞等待"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        return _fake_response(request)
+
+    return httpx.MockTransport(handler)
+
+
+def async_transport(latency: float) -> httpx.MockTransport:
+    """模擬非同步連線池：等待期間讓出事件迴圈"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return _fake_response(request)
+
+    return httpx.MockTransport(handler)
+
+
+async def _load_dashboard(service: UserSheetsService) -> None:
+    await service.get_monthly_stats("sheet")
+    await service.get_recent_records("sheet", limit=5)
+    await service.get_daily_trend("sheet", days=7)
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float, lags: list) -> None:
+    """每隔 interval 秒喚醒一次，記錄實際喚醒延遲"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run_scenario(name: str, transport: httpx.MockTransport, users: int) -> dict:
+    worksheet_cache.clear()
+    lags: list = []
+    stop = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        services = [
+            UserSheetsService(Credentials(token="bench"), http_client=http_client)
+            for _ in range(users)
+        ]
+        monitor = asyncio.create_task(_measure_loop_lag(stop, 0.005, lags))
+        started = time.perf_counter()
+        await asyncio.gather(*(_load_dashboard(service) for service in services))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await monitor
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "name": name,
+        "wall_ms": elapsed * 1000,
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))],
+        "lag_max_ms": lags_ms[-1],
+    }
+
+
+async def main(users: int, latency_ms: float) -> None:
+    latency = latency_ms / 1000
+    results = [
+        await run_scenario("blocking (before)", blocking_transport(latency), users),
+        await run_scenario("async pool (after)", async_transport(latency), users),
+    ]
+
+    print(f"{users} concurrent dashboard loads, {latency_ms:.0f} ms per Sheets call")
+    print(f"{'transport':<20} {'wall':>10} {'lag p50':>10} {'lag p99':>10} {'lag max':>10}")
+    for r in results:
+        print(
+            f"{r['name']:<20} {r['wall_ms']:>8.0f}ms {r['lag_p50_ms']:>8.1f}ms "
+            f"{r['lag_p99_ms']:>8.1f}ms {r['lag_max_ms']:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.latency_ms))
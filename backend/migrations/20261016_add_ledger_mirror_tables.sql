@@ -0,0 +1,34 @@
+-- Migration: Add ledger mirror tables
+-- Date: 2026-10-16
+-- Description: 新增記帳記錄本地鏡像與同步狀態資料表，讓統計與查詢不必每次讀取 Google Sheet
+
+CREATE TABLE IF NOT EXISTS ledger_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id VARCHAR(255) NOT NULL,
+    sheet_id VARCHAR(255) NOT NULL,
+    month VARCHAR(7) NOT NULL,
+    position INTEGER NOT NULL,
+    time VARCHAR(32) NOT NULL DEFAULT '',
+    name VARCHAR(255) NOT NULL DEFAULT '',
+    category VARCHAR(50) NOT NULL DEFAULT '',
+    amount VARCHAR(50) NOT NULL DEFAULT '',
+    currency VARCHAR(10) NOT NULL DEFAULT '',
+    payment_method VARCHAR(50) NOT NULL DEFAULT '',
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_ledger_entries_user_sheet_month
+    ON ledger_entries(user_id, sheet_id, month);
+
+CREATE TABLE IF NOT EXISTS ledger_sync_state (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id VARCHAR(255) NOT NULL,
+    sheet_id VARCHAR(255) NOT NULL,
+    worksheets TEXT NOT NULL DEFAULT '[]',
+    drive_modified_time VARCHAR(64),
+    checked_at TIMESTAMP,
+    synced_at TIMESTAMP,
+    self_write_at TIMESTAMP,
+    UNIQUE (user_id, sheet_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
@@ -0,0 +1,18 @@
+-- Migration: Add monthly_aggregates table
+-- Date: 2026-10-16
+-- Description: 新增月度統計物化資料表，寫入記錄時累加更新，查詢統計不必重新讀取整個月份
+
+CREATE TABLE IF NOT EXISTS monthly_aggregates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id VARCHAR(255) NOT NULL,
+    sheet_id VARCHAR(255) NOT NULL,
+    month VARCHAR(7) NOT NULL,
+    total REAL NOT NULL DEFAULT 0,
+    record_count INTEGER NOT NULL DEFAULT 0,
+    by_category TEXT NOT NULL DEFAULT '{}',
+    by_category_count TEXT NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    reconciled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (user_id, sheet_id, month),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
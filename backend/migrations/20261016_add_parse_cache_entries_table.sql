@@ -0,0 +1,13 @@
+-- Migration: Add parse_cache_entries table
+-- Date: 2026-10-16
+-- Description: 新增記帳語句解析結果快取資料表，重複的語句不必再呼叫 LLM
+
+CREATE TABLE IF NOT EXISTS parse_cache_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id VARCHAR(255) NOT NULL,
+    text_key VARCHAR(255) NOT NULL,
+    fields TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (user_id, text_key),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
@@ -0,0 +1,15 @@
+-- Migration: Add pending_sheet_writes table
+-- Date: 2026-10-16
+-- Description: 新增 write-behind 佇列資料表，暫存尚未寫入 Google Sheet 的記帳記錄
+
+CREATE TABLE IF NOT EXISTS pending_sheet_writes (
+    id VARCHAR(32) PRIMARY KEY,
+    user_id VARCHAR(255) NOT NULL,
+    sheet_id VARCHAR(255) NOT NULL,
+    month VARCHAR(7) NOT NULL,
+    row TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_pending_sheet_writes_sheet_id ON pending_sheet_writes(sheet_id);
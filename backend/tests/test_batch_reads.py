@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.google_api_client import GoogleAPIClient, GoogleAPIError
+from app.services.user_sheets_service import UserSheetsService, worksheet_cache
+
+HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+
+
+class BatchReadTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        self.service = UserSheetsService(credentials=MagicMock())
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.service.client = self.api
+        worksheet_cache.set("sheet", ["2025-12", "2026-01", "2026-02"])
+
+    def tearDown(self):
+        worksheet_cache.clear()
+
+    async def test_multi_month_stats_uses_single_batch_get(self):
+        self.api.values_batch_get.return_value = {
+            "valueRanges": [
+                {
+                    "values": [
+                        HEADERS,
+                        ["2026-02-01 12:00", "午餐", "飲食", "120", "TWD"],
+                        ["2026-02-02 08:00", "捷運", "交通", "30", "TWD"],
+                    ]
+                },
+                {"values": [HEADERS]},
+            ]
+        }
+
+        stats = await self.service.get_multi_month_stats("sheet", ["2026-02", "2026-01"])
+
+        self.assertEqual(self.api.values_batch_get.call_count, 1)
+        self.assertFalse(self.api.values_get.called)
+        self.assertEqual([s.month for s in stats], ["2026-02", "2026-01"])
+        self.assertEqual(stats[0].total, 150.0)
+        self.assertEqual(stats[0].by_category_count, {"飲食": 1, "交通": 1})
+        self.assertEqual(stats[1].record_count, 0)
+
+    async def test_missing_worksheet_is_not_requested(self):
+        # 未來月份沒有分頁：只讀取存在的分頁，仍為單次 API 呼叫
+        self.api.values_batch_get.return_value = {
+            "valueRanges": [
+                {"values": [HEADERS, ["2026-02-01 12:00", "午餐", "飲食", "120", "TWD"]]}
+            ]
+        }
+
+        stats = await self.service.get_multi_month_stats("sheet", ["2026-02", "2026-03"])
+
+        self.assertEqual(len(self.api.mock_calls), 1)
+        ranges = self.api.values_batch_get.await_args.args[1]
+        self.assertEqual(ranges, ["'2026-02'!A:F"])
+        self.assertEqual([s.total for s in stats], [120.0, 0])
+
+    async def test_broken_worksheet_is_skipped(self):
+        self.api.values_batch_get.side_effect = GoogleAPIError(
+            400, "Unable to parse range: '2025-12'!A:F"
+        )
+
+        async def fake_get(sheet_id, range_, **render_options):
+            if range_.startswith("'2025-12'"):
+                raise GoogleAPIError(400, "Unable to parse range")
+            return {"values": [HEADERS, ["2026-01-03 12:00", "午餐", "飲食", "80"]]}
+
+        self.api.values_get.side_effect = fake_get
+
+        records = await self.service._read_months("sheet", ["2026-01", "2025-12"])
+
+        self.assertEqual(list(records), ["2026-01"])
+        self.assertEqual(records["2026-01"][0].payment_method, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.api import accounting
+from app.models.schemas import AccountingRecord, BatchRecordItem, BatchRecordRequest
+from app.services.openai_service import OpenAIServiceError
+from app.services.user_sheets_service import GoogleSheetsError, UserSheetsService
+
+
+def _record(time: str, name: str, amount: float) -> AccountingRecord:
+    return AccountingRecord(時間=time, 名稱=name, 類別="飲食", 花費=amount)
+
+
+class BatchRecordItemTests(unittest.TestCase):
+    def test_exactly_one_of_text_or_record(self):
+        with self.assertRaises(ValidationError):
+            BatchRecordItem()
+        with self.assertRaises(ValidationError):
+            BatchRecordItem(text="午餐 120", record=_record("2026-02-01 12:00", "午餐", 120))
+
+
+class BatchRecordEndpointTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sheets_service = MagicMock()
+        self.sheets_service.write_records_by_month = AsyncMock(return_value={})
+        self.sheets_service.extract_month_from_time = UserSheetsService.extract_month_from_time
+        self.sheets_service.client.call_count = 1
+
+        self.parse = AsyncMock()
+        patches = [
+            patch.object(
+                accounting,
+                "get_sheets_service_for_user",
+                AsyncMock(return_value=(self.sheets_service, "sheet")),
+            ),
+            patch.object(accounting, "get_user_by_id", return_value=None),
+            patch.object(accounting.openai_service, "parse_accounting_records", self.parse),
+            patch.object(accounting.settings, "PARSE_CACHE_ENABLED", False),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def _batch(self, items):
+        return await accounting.record_accounting_batch(
+            BatchRecordRequest(items=items),
+            response=MagicMock(headers={}),
+            current_user={"user_id": "u1"},
+            db=MagicMock(),
+        )
+
+    async def test_text_and_structured_items_are_written_together(self):
+        structured = _record("2026-01-31 08:00", "早餐", 45)
+        with patch.object(accounting.settings, "FAST_PARSER_ENABLED", True):
+            result = await self._batch(
+                [
+                    BatchRecordItem(client_id="a", record=structured),
+                    # 用戶端 UTC 時間轉為用戶時區（預設 Asia/Taipei）
+                    BatchRecordItem(
+                        client_id="b", text="午餐 120", recorded_at="2026-01-31T23:30:00Z"
+                    ),
+                ]
+            )
+
+        self.assertTrue(result.success)
+        self.assertEqual((result.written, result.failed), (2, 0))
+        self.assertEqual([r.parse_path for r in result.results], ["structured", "rule"])
+        self.assertEqual(result.results[1].records[0].時間, "2026-02-01 07:30")
+        self.assertEqual(len(result.results[1].record_ids), 1)
+        self.parse.assert_not_awaited()
+
+        self.sheets_service.write_records_by_month.assert_awaited_once()
+        _, written = self.sheets_service.write_records_by_month.await_args.args
+        self.assertEqual([r.名稱 for r in written], ["早餐", "午餐"])
+
+    async def test_llm_parsing_is_concurrent_but_bounded(self):
+        active = 0
+        peak = 0
+
+        async def parse(text, now=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if text == "壞掉":
+                raise OpenAIServiceError("PARSE_ERROR", "無法解析")
+            return [_record("2026-02-01 12:00", text, 100)]
+
+        self.parse.side_effect = parse
+        texts = ["甲", "乙", "壞掉", "丁", "戊"]
+        with patch.object(accounting.settings, "FAST_PARSER_ENABLED", False), patch.object(
+            accounting.settings, "BATCH_PARSE_CONCURRENCY", 2
+        ):
+            result = await self._batch([BatchRecordItem(text=t) for t in texts])
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(self.parse.await_count, 5)
+        self.assertFalse(result.success)
+        self.assertEqual((result.written, result.failed), (4, 1))
+        self.assertEqual(
+            [r.status for r in result.results], ["ok", "ok", "error", "ok", "ok"]
+        )
+        self.assertEqual(result.results[2].error, "無法解析")
+
+    async def test_failed_month_only_marks_its_items(self):
+        self.sheets_service.write_records_by_month.return_value = {
+            "2026-01": GoogleSheetsError("WRITE_ERROR", "寫入失敗"),
+            "2026-02": None,
+        }
+        result = await self._batch(
+            [
+                BatchRecordItem(record=_record("2026-01-31 22:00", "宵夜", 80)),
+                BatchRecordItem(record=_record("2026-02-01 12:00", "午餐", 120)),
+            ]
+        )
+
+        self.assertEqual([r.status for r in result.results], ["error", "ok"])
+        self.assertEqual((result.written, result.failed), (1, 1))
+
+    async def test_too_many_items_is_rejected(self):
+        items = [BatchRecordItem(text="午餐 120")] * 3
+        with patch.object(accounting.settings, "BATCH_RECORD_MAX_ITEMS", 2):
+            with self.assertRaises(HTTPException) as ctx:
+                await self._batch(items)
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.sheets_service.write_records_by_month.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
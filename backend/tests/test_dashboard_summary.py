@@ -0,0 +1,45 @@
+import asyncio
+import time
+import unittest
+
+from app.api.accounting import _run_summary_section
+
+
+async def _slow(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _fail():
+    raise RuntimeError("boom")
+
+
+class SummarySectionTests(unittest.IsolatedAsyncioTestCase):
+    async def test_sections_run_concurrently_with_deadlines(self):
+        status = {}
+        started = time.monotonic()
+        results = await asyncio.gather(
+            _run_summary_section("a", _slow("a", 0.1), 1, status),
+            _run_summary_section("b", _slow("b", 0.1), 1, status),
+            _run_summary_section("slow", _slow("slow", 5), 0.2, status),
+        )
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, ["a", "b", None])
+        self.assertEqual(status, {"a": "ok", "b": "ok", "slow": "timeout"})
+        self.assertLess(elapsed, 1)
+
+    async def test_failed_section_is_flagged(self):
+        status = {}
+        self.assertIsNone(await _run_summary_section("x", _fail(), 1, status))
+        self.assertEqual(status, {"x": "error"})
+
+    async def test_required_section_raises(self):
+        status = {}
+        with self.assertRaises(RuntimeError):
+            await _run_summary_section("x", _fail(), 1, status, required=True)
+        self.assertEqual(status, {"x": "error"})
+
+
+if __name__ == "__main__":
+    unittest.main()
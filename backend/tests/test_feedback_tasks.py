@@ -0,0 +1,134 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api import accounting
+from app.models.schemas import AccountingRecord, AccountingRequest
+from app.services.feedback_tasks import FeedbackTasks
+
+RECORD = AccountingRecord(時間="2026-02-01 12:00", 名稱="午餐", 類別="飲食", 花費=120)
+
+
+async def _feedback(text, delay=0.0):
+    await asyncio.sleep(delay)
+    return text
+
+
+async def _fail():
+    raise RuntimeError("boom")
+
+
+class FeedbackTasksTests(unittest.IsolatedAsyncioTestCase):
+    async def test_wait_returns_pending_without_cancelling(self):
+        tasks = FeedbackTasks(ttl_seconds=60)
+        tasks.start("r1", "u1", _feedback("記得控制飲食預算", delay=0.2))
+
+        self.assertEqual(await tasks.wait("r1", 0.01), ("pending", None))
+        self.assertEqual(await tasks.wait("r1", 1), ("ready", "記得控制飲食預算"))
+
+    async def test_owner_is_checked_and_failures_are_reported(self):
+        tasks = FeedbackTasks(ttl_seconds=60)
+        tasks.start("r1", "u1", _fail())
+
+        self.assertIsNone(await tasks.wait("r1", 1, user_id="u2"))
+        self.assertIsNone(await tasks.wait("missing", 0))
+        self.assertEqual(await tasks.wait("r1", 1, user_id="u1"), ("failed", None))
+
+    async def test_close_cancels_pending_feedback(self):
+        tasks = FeedbackTasks(ttl_seconds=60)
+        tasks.start("r1", "u1", _feedback("x", delay=10))
+        await tasks.close()
+        self.assertIsNone(await tasks.wait("r1", 0))
+
+
+class RecordFeedbackDeadlineTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tasks = FeedbackTasks(ttl_seconds=60)
+        self.sheets_service = sheets_service = MagicMock()
+        sheets_service.write_records = AsyncMock()
+        sheets_service.get_monthly_stats = AsyncMock(return_value=MagicMock())
+        sheets_service.client.call_count = 1
+
+        self.generate_feedback = AsyncMock()
+        patches = [
+            patch.object(accounting, "feedback_tasks", self.tasks),
+            patch.object(accounting, "quick_parse_many", return_value=[RECORD]),
+            patch.object(
+                accounting,
+                "get_sheets_service_for_user",
+                AsyncMock(return_value=(sheets_service, "sheet")),
+            ),
+            patch.object(accounting.openai_service, "generate_feedback", self.generate_feedback),
+            patch.object(accounting.settings, "SHEETS_WRITE_BEHIND_ENABLED", False),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def _record(self, deadline):
+        return await accounting.record_accounting(
+            AccountingRequest(text="午餐 120", feedback_deadline=deadline),
+            response=MagicMock(headers={}),
+            current_user={"user_id": "u1"},
+            db=MagicMock(),
+        )
+
+    async def test_fast_feedback_is_returned_inline(self):
+        self.generate_feedback.side_effect = lambda records, stats: "不錯"
+
+        result = await self._record(deadline=1)
+
+        self.assertEqual((result.feedback_status, result.feedback), ("ready", "不錯"))
+
+    async def test_slow_feedback_moves_to_background(self):
+        async def slow_feedback(records, stats):
+            return await _feedback("晚到", 0.3)
+
+        self.generate_feedback.side_effect = slow_feedback
+
+        started = time.monotonic()
+        result = await self._record(deadline=0.05)
+
+        self.assertLess(time.monotonic() - started, 0.25)
+        self.assertEqual((result.feedback_status, result.feedback), ("pending", None))
+
+        polled = await accounting.get_record_feedback(
+            result.record_id, wait=1, current_user={"user_id": "u1"}
+        )
+        self.assertEqual((polled.status, polled.feedback), ("ready", "晚到"))
+
+    async def test_late_feedback_reads_stats_with_its_own_session(self):
+        session_factory = MagicMock()
+        session = session_factory.return_value.__enter__.return_value
+        bound_during_read = []
+
+        async def slow_stats(sheet_id):
+            await asyncio.sleep(0.1)
+            bound_during_read.append(
+                (
+                    self.sheets_service.bind_session.call_args.args[0],
+                    session_factory.return_value.__exit__.called,
+                )
+            )
+            return MagicMock()
+
+        self.sheets_service.get_monthly_stats.side_effect = slow_stats
+        self.generate_feedback.side_effect = lambda records, stats: "晚到"
+
+        with patch.object(accounting, "SessionLocal", session_factory):
+            result = await self._record(deadline=0.01)
+            self.assertEqual(result.feedback_status, "pending")
+
+            polled = await accounting.get_record_feedback(
+                result.record_id, wait=1, current_user={"user_id": "u1"}
+            )
+
+        self.assertEqual(polled.status, "ready")
+        # 回應送出後才讀取統計，使用的是回饋自己的 Session（讀取時尚未關閉）
+        self.assertEqual(bound_during_read, [(session, False)])
+        session_factory.return_value.__exit__.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
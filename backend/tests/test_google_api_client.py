@@ -0,0 +1,99 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from google.oauth2.credentials import Credentials
+
+from app.services.google_api_client import GoogleAPIClient, GoogleAPIError
+
+
+class GoogleAPIClientTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.requests = []
+
+    def _client(self, handler, credentials=None) -> GoogleAPIClient:
+        def record(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return handler(request)
+
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        self.addAsyncCleanup(http_client.aclose)
+        return GoogleAPIClient(
+            credentials or Credentials(token="access-token"), http_client=http_client
+        )
+
+    async def test_batch_get_encodes_ranges_and_sends_token(self):
+        client = self._client(lambda r: httpx.Response(200, json={"valueRanges": []}))
+
+        await client.values_batch_get("sheet", ["'2026-01'!A:F", "'2026-02'!A:F"])
+
+        request = self.requests[0]
+        self.assertEqual(request.url.path, "/v4/spreadsheets/sheet/values:batchGet")
+        self.assertEqual(
+            request.url.params.get_list("ranges"), ["'2026-01'!A:F", "'2026-02'!A:F"]
+        )
+        self.assertEqual(request.headers["Authorization"], "Bearer access-token")
+        self.assertEqual(client.call_count, 1)
+
+    async def test_append_path_is_quoted(self):
+        client = self._client(lambda r: httpx.Response(200, json={}))
+
+        await client.values_append("sheet", "'2026-01'!A:F", {"values": [[1]]})
+
+        self.assertIn(
+            "/values/%272026-01%27%21A%3AF:append", self.requests[0].url.raw_path.decode()
+        )
+
+    async def test_error_message_is_surfaced(self):
+        client = self._client(
+            lambda r: httpx.Response(
+                400, json={"error": {"message": "Unable to parse range: x"}}
+            )
+        )
+
+        with self.assertRaises(GoogleAPIError) as context:
+            await client.values_get("sheet", "'x'!A:F")
+        self.assertEqual(context.exception.status_code, 400)
+        self.assertIn("Unable to parse range", str(context.exception))
+
+    async def test_expired_token_is_refreshed(self):
+        credentials = Credentials(
+            token="old",
+            refresh_token="refresh",
+            expiry=datetime.utcnow() - timedelta(minutes=1),
+        )
+        client = self._client(lambda r: httpx.Response(200, json={}), credentials)
+        refresh = AsyncMock(
+            return_value=("new", datetime.utcnow() + timedelta(hours=1))
+        )
+
+        with patch(
+            "app.services.oauth_service.oauth_service.refresh_access_token", refresh
+        ):
+            await client.spreadsheets_get("sheet", fields="spreadsheetId")
+
+        refresh.assert_awaited_once_with("refresh")
+        self.assertEqual(self.requests[0].headers["Authorization"], "Bearer new")
+
+    async def test_refresh_failure_is_google_api_error(self):
+        credentials = Credentials(
+            token="old",
+            refresh_token="revoked",
+            expiry=datetime.utcnow() - timedelta(minutes=1),
+        )
+        client = self._client(lambda r: httpx.Response(200, json={}), credentials)
+        refresh = AsyncMock(side_effect=ValueError("Token refresh failed: invalid_grant"))
+
+        with patch(
+            "app.services.oauth_service.oauth_service.refresh_access_token", refresh
+        ), self.assertRaises(GoogleAPIError) as context:
+            await client.spreadsheets_get("sheet", fields="spreadsheetId")
+
+        self.assertEqual(context.exception.status_code, 401)
+        self.assertIn("invalid_grant", str(context.exception))
+        self.assertEqual(self.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api import accounting
+from app.models.schemas import QueryRequest
+from app.services.knowledge_cache import KnowledgeAnswerCache, knowledge_cache
+
+QUESTIONS = [
+    "什麼是定期定額",
+    "信用卡循環利息怎麼算",
+    "什麼是複利",
+    "房貸利率怎麼算",
+    "定存和活存的差別",
+]
+
+
+class KnowledgeAnswerCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = KnowledgeAnswerCache(max_entries=10, ttl_seconds=60, similarity=0.8)
+        for question in QUESTIONS:
+            self.cache.put(question, f"回答：{question}")
+
+    def test_rephrased_and_similar_questions_hit(self):
+        self.assertEqual(self.cache.get("請問定期定額是什麼？"), "回答：什麼是定期定額")
+        self.assertEqual(self.cache.get("信用卡循環利息怎麼算出來"), "回答：信用卡循環利息怎麼算")
+        self.assertEqual(self.cache.stats()["similar_hits"], 1)
+
+    def test_different_questions_miss(self):
+        for question in ["什麼是單利", "房貸利息怎麼算", "定期定額的缺點是什麼"]:
+            with self.subTest(question=question):
+                self.assertIsNone(self.cache.get(question))
+
+    def test_ttl_and_size_bound(self):
+        with patch("app.services.knowledge_cache.time.time", return_value=1e12):
+            self.assertIsNone(self.cache.get("什麼是複利"))
+
+        cache = KnowledgeAnswerCache(max_entries=2, ttl_seconds=60, similarity=0.8)
+        for question in QUESTIONS[:3]:
+            cache.put(question, "回答")
+        self.assertIsNone(cache.get(QUESTIONS[0]))
+        self.assertEqual(cache.stats()["entries"], 2)
+        self.assertNotIn("定期", cache._index)
+
+
+class KnowledgeCacheEndpointTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        knowledge_cache.clear()
+        self.addCleanup(knowledge_cache.clear)
+        self.answer_query = AsyncMock(return_value="定期定額是每月固定投入相同金額。")
+        self.save_history = MagicMock()
+        self.get_service = AsyncMock(return_value=(MagicMock(), "sheet"))
+        patches = [
+            patch.object(accounting, "get_sheets_service_for_user", self.get_service),
+            patch.object(accounting, "get_user_by_id", return_value=None),
+            patch.object(accounting, "_save_query_history", self.save_history),
+            patch.object(accounting.openai_service, "answer_query", self.answer_query),
+            patch.object(accounting.settings, "KNOWLEDGE_CACHE_ENABLED", True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def _query(self, query, user_id):
+        result = await accounting.query_accounting(
+            QueryRequest(query=query),
+            response=MagicMock(headers={}),
+            current_user={"user_id": user_id},
+            db=MagicMock(),
+        )
+        return result.response
+
+    async def test_second_user_gets_cached_answer_without_llm(self):
+        first = await self._query("什麼是定期定額", "u1")
+        second = await self._query("定期定額是什麼？", "u2")
+
+        self.assertEqual(first, second)
+        self.answer_query.assert_awaited_once()
+        self.assertEqual(
+            [c.args[1:] for c in self.save_history.call_args_list],
+            [("u1", "什麼是定期定額", first), ("u2", "定期定額是什麼？", first)],
+        )
+
+    async def test_ledger_and_personal_questions_are_not_cached(self):
+        self.answer_query.return_value = "回答"
+        with patch.object(
+            accounting, "_load_query_context", AsyncMock(return_value={})
+        ), patch.object(accounting.settings, "QUICK_ANSWER_ENABLED", False):
+            await self._query("我適合買ETF嗎", "u1")
+            await self._query("這個月飲食花多少", "u1")
+
+        self.assertEqual(knowledge_cache.stats()["entries"], 0)
+
+    async def test_stream_hit_is_sent_whole_and_saved(self):
+        knowledge_cache.put("什麼是複利", "複利是利滾利。")
+
+        response = await accounting.query_accounting_stream(
+            QueryRequest(query="複利是什麼"), current_user={"user_id": "u1"}, db=MagicMock()
+        )
+        body = "".join([chunk async for chunk in response.body_iterator])
+
+        self.assertIn("event: done", body)
+        self.assertIn("複利是利滾利。", body)
+        self.answer_query.assert_not_awaited()
+        self.save_history.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.crud import create_user, save_ledger_sync_state
+from app.database.engine import Base
+from app.models.schemas import AccountingRecord
+from app.services.google_api_client import GoogleAPIClient
+from app.services.ledger_mirror import LedgerMirror
+from app.services.user_sheets_service import UserSheetsService, worksheet_cache
+
+HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+
+
+def _drive_time(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class LedgerMirrorTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        create_user(self.db, user_id="u1", email="u1@example.com", name="U1")
+
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.api.values_append.return_value = {}
+        self.api.files_get.return_value = {"modifiedTime": "2026-02-01T00:00:00.000Z"}
+        self.api.spreadsheets_get.return_value = {
+            "sheets": [{"properties": {"title": "2026-02"}}]
+        }
+        self.api.values_batch_get.return_value = {
+            "valueRanges": [
+                {"values": [HEADERS, ["2026-02-01 12:00", "午餐", "飲食", "120", "TWD"]]}
+            ]
+        }
+
+    def tearDown(self):
+        self.db.close()
+        worksheet_cache.clear()
+
+    def _service(self) -> UserSheetsService:
+        service = UserSheetsService(credentials=MagicMock())
+        service.client = self.api
+        service.mirror = LedgerMirror(self.db, "u1", "sheet", freshness_seconds=60)
+        return service
+
+    async def test_reads_are_served_locally_within_freshness(self):
+        stats = await self._service().get_monthly_stats("sheet", month="2026-02")
+        self.assertEqual(stats.total, 120.0)
+        self.assertEqual(self.api.values_batch_get.await_count, 1)
+
+        self.api.reset_mock()
+        service = self._service()
+        stats = await service.get_monthly_stats("sheet", month="2026-02")
+        records = await service.get_records_by_date_range(
+            "sheet", "2026-02-01", "2026-02-28"
+        )
+
+        self.assertEqual(stats.record_count, 1)
+        self.assertEqual(records[0]["名稱"], "午餐")
+        self.assertFalse(self.api.method_calls)
+
+    async def test_write_through_does_not_trigger_resync(self):
+        await self._service().get_monthly_stats("sheet", month="2026-02")
+
+        service = self._service()
+        await service.write_record(
+            "sheet",
+            AccountingRecord(時間="2026-02-02 08:00", 名稱="早餐", 類別="飲食", 花費=45),
+        )
+
+        # 新鮮度過期後，Drive 的修改時間來自剛才的寫入
+        save_ledger_sync_state(
+            self.db, "u1", "sheet", checked_at=datetime.utcnow() - timedelta(hours=1)
+        )
+        self.api.reset_mock()
+        self.api.files_get.return_value = {"modifiedTime": _drive_time(datetime.utcnow())}
+
+        stats = await self._service().get_monthly_stats("sheet", month="2026-02")
+
+        self.assertEqual(stats.total, 165.0)
+        self.api.files_get.assert_awaited_once()
+        self.assertFalse(self.api.values_batch_get.called)
+
+    async def test_external_edit_is_resynced(self):
+        await self._service().get_monthly_stats("sheet", month="2026-02")
+
+        save_ledger_sync_state(
+            self.db, "u1", "sheet", checked_at=datetime.utcnow() - timedelta(hours=1)
+        )
+        self.api.files_get.return_value = {
+            "modifiedTime": _drive_time(datetime.utcnow() + timedelta(minutes=1))
+        }
+        self.api.values_batch_get.return_value = {
+            "valueRanges": [
+                {"values": [HEADERS, ["2026-02-01 12:00", "午餐", "飲食", "100", "TWD"]]}
+            ]
+        }
+
+        stats = await self._service().get_monthly_stats("sheet", month="2026-02")
+
+        self.assertEqual(stats.total, 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.google_api_client import GoogleAPIClient
+from app.services.ledger_rows import (
+    DEFAULT_DECODER,
+    LedgerRow,
+    RowDecoder,
+    decode_values,
+)
+from app.services.user_sheets_service import UserSheetsService, worksheet_cache
+
+HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+
+# 2026-02-01 12:30 的試算表序列值
+SERIAL_2026_02_01_1230 = 46054 + 12.5 / 24
+
+
+class LedgerRowDecodeTests(unittest.TestCase):
+    def test_serial_time_and_numeric_amount(self):
+        row = DEFAULT_DECODER.decode(
+            [SERIAL_2026_02_01_1230, "午餐", "飲食", 120, "TWD", "現金"]
+        )
+
+        self.assertEqual(row.timestamp, datetime(2026, 2, 1, 12, 30))
+        self.assertEqual(row.date, "2026-02-01")
+        self.assertEqual(row.amount, 120.0)
+        self.assertEqual(
+            row.to_dict(),
+            {
+                "時間": "2026-02-01 12:30",
+                "名稱": "午餐",
+                "類別": "飲食",
+                "花費": 120,
+                "幣別": "TWD",
+                "支付方式": "現金",
+            },
+        )
+
+    def test_text_values_are_normalized(self):
+        written = LedgerRow("2026-02-01 12:30", "午餐", "飲食", 120.0, "TWD")
+        read = LedgerRow(SERIAL_2026_02_01_1230, "午餐", "飲食", 120, "TWD")
+
+        self.assertEqual(written.time_text, read.time_text)
+        self.assertEqual(written.amount_text, read.amount_text)
+
+    def test_unparseable_values_are_kept(self):
+        row = LedgerRow("上週五", "午餐", "飲食", "約一百")
+
+        self.assertIsNone(row.timestamp)
+        self.assertIsNone(row.amount)
+        self.assertEqual(row.to_dict()["花費"], "約一百")
+
+    def test_decoder_follows_header_order_and_skips_blank_rows(self):
+        rows = decode_values(
+            [
+                ["名稱", "花費", "時間", "類別"],
+                ["捷運", 30, "2026-02-02 08:00", "交通"],
+                [],
+                ["晚餐"],
+            ]
+        )
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0].category, "交通")
+        self.assertEqual(rows[0].amount, 30.0)
+        self.assertEqual(rows[1].payment_method, "")
+        self.assertIsNone(rows[1].amount)
+
+    def test_short_row_with_default_layout(self):
+        row = RowDecoder().decode(["2026-02-02 08:00", "捷運"])
+        self.assertEqual((row.category, row.currency), ("", ""))
+
+
+class UnformattedReadTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.service = UserSheetsService(credentials=MagicMock())
+        self.service.client = self.api
+        worksheet_cache.set("sheet", ["2026-02"])
+
+    def tearDown(self):
+        worksheet_cache.clear()
+
+    async def test_stats_and_records_from_unformatted_values(self):
+        self.api.values_batch_get.return_value = {
+            "valueRanges": [
+                {
+                    "values": [
+                        HEADERS,
+                        [SERIAL_2026_02_01_1230, "午餐", "飲食", 120, "TWD"],
+                        [SERIAL_2026_02_01_1230 + 1, "計程車", "交通", 250.5, "TWD"],
+                    ]
+                }
+            ]
+        }
+
+        stats = await self.service.get_monthly_stats("sheet", month="2026-02")
+        records = await self.service.get_all_records("sheet", month="2026-02")
+
+        kwargs = self.api.values_batch_get.await_args.kwargs
+        self.assertEqual(kwargs["value_render_option"], "UNFORMATTED_VALUE")
+        self.assertEqual(kwargs["date_time_render_option"], "SERIAL_NUMBER")
+        self.assertEqual(stats.total, 370.5)
+        self.assertEqual(stats.by_category, {"飲食": 120.0, "交通": 250.5})
+        self.assertEqual(records[1]["時間"], "2026-02-02 12:30")
+        self.assertEqual(records[1]["花費"], 250.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
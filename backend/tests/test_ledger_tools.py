@@ -0,0 +1,191 @@
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api import accounting
+from app.models.schemas import MonthlyStats
+from app.services.ledger_tools import LedgerTools
+from app.services.openai_service import OpenAIService
+
+RECORDS = [
+    {"時間": "2026-10-02 12:00", "名稱": "午餐", "類別": "飲食", "花費": 120},
+    {"時間": "2026-10-05 08:00", "名稱": "捷運", "類別": "交通", "花費": 30},
+    {"時間": "2026-10-09 19:00", "名稱": "牛排晚餐", "類別": "飲食", "花費": 680},
+]
+
+
+def _stats(month, total, by_category):
+    return MonthlyStats(
+        month=month,
+        total=total,
+        record_count=len(by_category),
+        by_category=by_category,
+        by_category_count={c: 1 for c in by_category},
+    )
+
+
+def _chunk(content=None, tool_calls=None):
+    chunk = MagicMock()
+    chunk.choices[0].delta.content = content
+    chunk.choices[0].delta.tool_calls = tool_calls
+    return chunk
+
+
+def _tool_call(index, id=None, name=None, arguments=None):
+    call = MagicMock()
+    call.index = index
+    call.id = id
+    call.function.name = name
+    call.function.arguments = arguments
+    return call
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class LedgerToolsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sheets_service = MagicMock()
+        self.sheets_service.get_records_by_date_range = AsyncMock(return_value=RECORDS)
+        self.sheets_service.get_multi_month_stats = AsyncMock(
+            return_value=[
+                _stats("2026-09", 500, {"飲食": 400, "交通": 100}),
+                _stats("2026-10", 830, {"飲食": 800, "交通": 30}),
+            ]
+        )
+        self.tools = LedgerTools(self.sheets_service, "sheet", max_calls=3)
+
+    async def _call(self, name, **arguments):
+        return json.loads(await self.tools.call(name, json.dumps(arguments)))
+
+    async def test_sum_by_category(self):
+        result = await self._call(
+            "sum_by_category", start_date="2026-10-01", end_date="2026-10-16"
+        )
+
+        self.assertEqual(result["total"], 830)
+        self.assertEqual(result["by_category"]["飲食"], {"total": 800, "count": 2})
+        self.sheets_service.get_records_by_date_range.assert_awaited_once_with(
+            "sheet", "2026-10-01", "2026-10-16"
+        )
+
+    async def test_list_records_filters_and_orders(self):
+        result = await self._call(
+            "list_records",
+            start_date="2026-10-01",
+            end_date="2026-10-16",
+            category="飲食",
+            order="largest",
+            limit=1,
+        )
+
+        self.assertEqual([r["名稱"] for r in result["records"]], ["牛排晚餐"])
+        self.assertEqual((result["matched"], result["truncated"]), (2, True))
+
+    async def test_compare_months(self):
+        result = await self._call("compare_months", month_a="2026-09", month_b="2026-10")
+
+        self.assertEqual(result["difference"]["total"], 330)
+        self.assertEqual(result["difference"]["by_category"], {"交通": -70, "飲食": 400})
+
+    async def test_invalid_arguments_are_reported_to_model(self):
+        result = await self._call(
+            "sum_by_category", start_date="2026/10/01", end_date="2026-10-16"
+        )
+        self.assertIn("YYYY-MM-DD", result["error"])
+
+        result = await self._call(
+            "list_records", start_date="2025-01-01", end_date="2026-10-16"
+        )
+        self.assertIn("366", result["error"])
+        self.sheets_service.get_records_by_date_range.assert_not_awaited()
+
+    async def test_call_limit(self):
+        for _ in range(3):
+            await self._call("compare_months", month_a="2026-09", month_b="2026-10")
+
+        self.assertTrue(self.tools.exhausted)
+        result = await self._call("compare_months", month_a="2026-09", month_b="2026-10")
+        self.assertIn("上限", result["error"])
+        self.assertEqual(self.sheets_service.get_multi_month_stats.await_count, 3)
+
+    async def test_read_failure_does_not_raise(self):
+        self.sheets_service.get_records_by_date_range.side_effect = RuntimeError("boom")
+
+        result = await self._call(
+            "sum_by_category", start_date="2026-10-01", end_date="2026-10-16"
+        )
+        self.assertEqual(result, {"error": "讀取帳務資料失敗"})
+
+
+class ToolAnswerTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.chat.completions.create = AsyncMock()
+        self.service = OpenAIService(client=self.client)
+        self.sheets_service = MagicMock()
+        self.sheets_service.get_records_by_date_range = AsyncMock(return_value=RECORDS)
+        self.tools = LedgerTools(self.sheets_service, "sheet")
+
+    async def test_runs_tools_then_streams_answer(self):
+        arguments = json.dumps(
+            {"start_date": "2026-10-01", "end_date": "2026-10-16", "category": "飲食"}
+        )
+        self.client.chat.completions.create.side_effect = [
+            _stream(
+                _chunk(tool_calls=[_tool_call(0, "call_1", "sum_by_category", arguments[:20])]),
+                _chunk(tool_calls=[_tool_call(0, arguments=arguments[20:])]),
+            ),
+            _stream(_chunk("本月飲食"), _chunk("共 800 元")),
+        ]
+
+        deltas = [
+            d
+            async for d in self.service.stream_answer_query(
+                "這個月吃飯花多少", tools=self.tools
+            )
+        ]
+
+        self.assertEqual("".join(deltas), "本月飲食共 800 元")
+        self.assertEqual(self.tools.calls, 1)
+        messages = self.client.chat.completions.create.await_args.kwargs["messages"]
+        self.assertEqual(messages[2]["tool_calls"][0]["function"]["arguments"], arguments)
+        self.assertEqual(messages[3]["tool_call_id"], "call_1")
+        self.assertEqual(json.loads(messages[3]["content"])["total"], 800)
+
+    async def test_last_round_disallows_tools(self):
+        self.tools.max_calls = 0
+        self.client.chat.completions.create.return_value = _stream(_chunk("資料不足"))
+
+        answer = await self.service.answer_query("花多少", tools=self.tools)
+
+        self.assertEqual(answer, "資料不足")
+        kwargs = self.client.chat.completions.create.await_args.kwargs
+        self.assertEqual(kwargs["tool_choice"], "none")
+
+
+class ToolRoutingTests(unittest.IsolatedAsyncioTestCase):
+    async def test_ledger_query_gets_tools_instead_of_context(self):
+        sheets_service = MagicMock()
+        load_context = AsyncMock()
+        with patch.object(accounting.settings, "QUERY_TOOLS_ENABLED", True), patch.object(
+            accounting,
+            "get_sheets_service_for_user",
+            AsyncMock(return_value=(sheets_service, "sheet")),
+        ), patch.object(accounting, "get_user_by_id", return_value=None), patch.object(
+            accounting, "_load_query_context", load_context
+        ):
+            context, service = await accounting._route_query(
+                {"user_id": "u1"}, MagicMock(), "上個月哪個類別花最多"
+            )
+
+        self.assertIs(service, sheets_service)
+        self.assertIsInstance(context["tools"], LedgerTools)
+        self.assertEqual(context["tools"].sheet_id, "sheet")
+        load_context.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.crud import create_user
+from app.database.engine import Base
+from app.models.schemas import AccountingRecord
+from app.services.google_api_client import GoogleAPIClient
+from app.services.monthly_aggregates import MonthlyAggregateStore
+from app.services.user_sheets_service import UserSheetsService, worksheet_cache
+
+HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+
+
+class MonthlyAggregateTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        create_user(self.db, user_id="u1", email="u1@example.com", name="U1")
+
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.api.values_append.return_value = {}
+        self.api.spreadsheets_get.return_value = {
+            "sheets": [{"properties": {"title": "2026-02"}}]
+        }
+        self.api.values_batch_get.return_value = {
+            "valueRanges": [
+                {"values": [HEADERS, ["2026-02-01 12:00", "午餐", "飲食", "120", "TWD"]]}
+            ]
+        }
+
+    def tearDown(self):
+        self.db.close()
+        worksheet_cache.clear()
+
+    def _service(self, reconcile_seconds: int = 900) -> UserSheetsService:
+        service = UserSheetsService(credentials=MagicMock())
+        service.client = self.api
+        service.aggregates = MonthlyAggregateStore(
+            self.db, "u1", "sheet", reconcile_seconds=reconcile_seconds
+        )
+        return service
+
+    async def test_write_then_read_does_not_reread_month(self):
+        await self._service().get_monthly_stats("sheet", month="2026-02")
+        self.api.reset_mock()
+
+        service = self._service()
+        await service.write_record(
+            "sheet",
+            AccountingRecord(時間="2026-02-02 08:30", 名稱="捷運", 類別="交通", 花費=30),
+        )
+        stats = await service.get_monthly_stats("sheet", month="2026-02")
+
+        self.assertFalse(self.api.values_batch_get.called)
+        self.assertEqual(stats.total, 150.0)
+        self.assertEqual(stats.record_count, 2)
+        self.assertEqual(stats.by_category, {"飲食": 120.0, "交通": 30.0})
+        self.assertEqual(stats.by_category_count, {"飲食": 1, "交通": 1})
+
+    async def test_expired_aggregate_is_reconciled(self):
+        await self._service().get_monthly_stats("sheet", month="2026-02")
+        self.api.values_batch_get.return_value = {
+            "valueRanges": [{"values": [HEADERS]}]
+        }
+
+        stats = await self._service(reconcile_seconds=-1).get_monthly_stats(
+            "sheet", month="2026-02"
+        )
+
+        self.assertEqual(self.api.values_batch_get.await_count, 2)
+        self.assertEqual(stats.record_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
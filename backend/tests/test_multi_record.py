@@ -0,0 +1,114 @@
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models.schemas import AccountingRecord
+from app.services.google_api_client import GoogleAPIClient, GoogleAPIError
+from app.services.openai_service import OpenAIService
+from app.services.user_sheets_service import (
+    GoogleSheetsError,
+    UserSheetsService,
+    worksheet_cache,
+)
+
+
+def _completion(content: str):
+    completion = MagicMock()
+    completion.choices[0].message.content = content
+    return completion
+
+
+def _record(time: str, name: str, amount: float) -> AccountingRecord:
+    return AccountingRecord(時間=time, 名稱=name, 類別="飲食", 花費=amount)
+
+
+class ParseRecordsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.chat.completions.create = AsyncMock()
+        self.service = OpenAIService(client=self.client)
+
+    async def test_single_llm_call_returns_every_record(self):
+        items = [
+            {"時間": "2026-02-01 20:00", "名稱": "蛋餅", "類別": "飲食", "花費": 45},
+            {"時間": "2026-02-01 20:00", "名稱": "捷運", "類別": "交通", "花費": 30},
+        ]
+        self.client.chat.completions.create.return_value = _completion(
+            json.dumps({"records": items}, ensure_ascii=False)
+        )
+
+        records = await self.service.parse_accounting_records("早餐蛋餅45，晚上捷運30")
+
+        self.assertEqual([r.名稱 for r in records], ["蛋餅", "捷運"])
+        self.client.chat.completions.create.assert_awaited_once()
+
+    async def test_single_object_response_is_accepted(self):
+        self.client.chat.completions.create.return_value = _completion(
+            '{"時間": "2026-02-01 12:00", "名稱": "便當", "類別": "飲食", "花費": 120}'
+        )
+
+        records = await self.service.parse_accounting_records("便當120")
+
+        self.assertEqual([r.花費 for r in records], [120])
+
+
+class WriteRecordsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        self.service = UserSheetsService(credentials=MagicMock())
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.service.client = self.api
+        self.api.values_append.return_value = {}
+        self.api.spreadsheets_get.return_value = {
+            "sheets": [
+                {"properties": {"title": "2026-01"}},
+                {"properties": {"title": "2026-02"}},
+            ]
+        }
+
+    def tearDown(self):
+        worksheet_cache.clear()
+
+    async def test_one_append_per_month_tab(self):
+        await self.service.write_records(
+            "sheet",
+            [
+                _record("2026-01-31 23:00", "宵夜", 80),
+                _record("2026-02-01 08:00", "早餐", 45),
+                _record("2026-02-01 12:00", "午餐", 120),
+            ],
+        )
+
+        appended = {
+            call.args[1]: [row[1] for row in call.args[2]["values"]]
+            for call in self.api.values_append.await_args_list
+        }
+        self.assertEqual(
+            appended, {"'2026-01'!A:F": ["宵夜"], "'2026-02'!A:F": ["早餐", "午餐"]}
+        )
+
+    async def test_successful_months_are_applied_locally_before_error(self):
+        self.service.aggregates = MagicMock(sheet_id="sheet")
+
+        async def append(sheet_id, range_, body, **kwargs):
+            if range_.startswith("'2026-01'"):
+                raise GoogleAPIError(500, "boom")
+            return {}
+
+        self.api.values_append.side_effect = append
+
+        with self.assertRaises(GoogleSheetsError):
+            await self.service.write_records(
+                "sheet",
+                [
+                    _record("2026-01-31 23:00", "宵夜", 80),
+                    _record("2026-02-01 08:00", "早餐", 45),
+                ],
+            )
+
+        applied = [call.args[0] for call in self.service.aggregates.apply_record.call_args_list]
+        self.assertEqual(applied, ["2026-02"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+from openai import APITimeoutError, BadRequestError, RateLimitError
+
+from app.services.openai_service import OpenAIService, OpenAIServiceError
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _rate_limited(headers=None) -> RateLimitError:
+    response = httpx.Response(429, headers=headers or {}, request=REQUEST)
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+def _completion(content: str):
+    completion = MagicMock()
+    completion.choices[0].message.content = content
+    return completion
+
+
+class OpenAIRetryTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.chat.completions.create = AsyncMock()
+        self.service = OpenAIService(client=self.client)
+        self.service.max_retries = 3
+        self.service.retry_base_delay = 0.5
+        self.service.retry_max_delay = 8
+
+    async def test_backoff_uses_asyncio_sleep_and_retry_after(self):
+        self.client.chat.completions.create.side_effect = [
+            _rate_limited({"retry-after": "2"}),
+            APITimeoutError(request=REQUEST),
+            _completion("好的"),
+        ]
+
+        with patch(
+            "app.services.openai_service.asyncio.sleep", new_callable=AsyncMock
+        ) as sleep:
+            answer = await self.service._call_with_retry([])
+
+        self.assertEqual(answer, "好的")
+        delays = [call.args[0] for call in sleep.await_args_list]
+        self.assertEqual(delays[0], 2.0)
+        self.assertTrue(0 <= delays[1] <= 1.0)
+        kwargs = self.client.chat.completions.create.await_args.kwargs
+        self.assertEqual(kwargs["timeout"], self.service.timeout)
+
+    async def test_retry_after_is_capped(self):
+        self.client.chat.completions.create.side_effect = [
+            _rate_limited({"retry-after": "120"}),
+            _completion("ok"),
+        ]
+
+        with patch(
+            "app.services.openai_service.asyncio.sleep", new_callable=AsyncMock
+        ) as sleep:
+            await self.service._call_with_retry([])
+
+        sleep.assert_awaited_once_with(8)
+
+    async def test_exhausted_retries_raise(self):
+        self.client.chat.completions.create.side_effect = _rate_limited()
+
+        with patch(
+            "app.services.openai_service.asyncio.sleep", new_callable=AsyncMock
+        ) as sleep:
+            with self.assertRaises(OpenAIServiceError) as ctx:
+                await self.service._call_with_retry([])
+
+        self.assertEqual(ctx.exception.code, "RETRY_EXHAUSTED")
+        self.assertEqual(sleep.await_count, 2)
+
+    async def test_non_retryable_error_is_not_retried(self):
+        response = httpx.Response(400, request=REQUEST)
+        self.client.chat.completions.create.side_effect = BadRequestError(
+            "bad", response=response, body=None
+        )
+
+        with self.assertRaises(OpenAIServiceError) as ctx:
+            await self.service._call_with_retry([])
+
+        self.assertEqual(ctx.exception.code, "API_ERROR")
+        self.assertEqual(self.client.chat.completions.create.await_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
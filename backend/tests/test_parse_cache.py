@@ -0,0 +1,134 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.crud import create_user, get_parse_cache_entry
+from app.database.engine import Base
+from app.models.schemas import AccountingRecord
+from app.services.parse_cache import ParseCache, normalize_utterance
+
+
+def _record(**overrides) -> AccountingRecord:
+    fields = dict(
+        時間="2026-01-01 08:00",
+        名稱="蛋餅",
+        類別="飲食",
+        花費=45,
+        幣別="TWD",
+        支付方式="現金",
+    )
+    fields.update(overrides)
+    return AccountingRecord(**fields)
+
+
+class ParseCacheTests(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(engine)
+        self.db = sessionmaker(bind=engine)()
+        create_user(self.db, user_id="u1", email="u1@example.com", name="U1")
+        create_user(self.db, user_id="u2", email="u2@example.com", name="U2")
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_normalize_ignores_width_case_spaces_and_punctuation(self):
+        self.assertEqual(
+            normalize_utterance("早餐　蛋餅 ４５ 元！"), normalize_utterance("早餐蛋餅45元")
+        )
+        self.assertEqual(normalize_utterance("Uber 200"), normalize_utterance("uber200"))
+
+    def test_normalize_keeps_amount_sign_decimal_and_number_boundaries(self):
+        for a, b in [
+            ("咖啡 4.5 美金", "咖啡 45 美金"),
+            ("午餐 -120", "午餐 120"),
+            ("咖啡 2 45", "咖啡 245"),
+            ("咖啡 2.5 10", "咖啡 25 10"),
+        ]:
+            with self.subTest(a=a, b=b):
+                self.assertNotEqual(normalize_utterance(a), normalize_utterance(b))
+
+        self.assertEqual(normalize_utterance("咖啡 4.5 美金"), "咖啡4.5美金")
+        self.assertEqual(normalize_utterance("午餐 -120"), "午餐-120")
+        self.assertEqual(normalize_utterance("咖啡 2, 45元"), "咖啡2 45元")
+        self.assertEqual(normalize_utterance("午餐 - 120"), normalize_utterance("午餐120"))
+
+    def test_hit_rebuilds_record_with_current_time(self):
+        cache = ParseCache(max_entries=10, ttl_seconds=3600, persist=False)
+        cache.put("u1", "早餐 蛋餅 45", [_record()])
+
+        [record] = cache.get("u1", "早餐蛋餅45！")
+
+        self.assertEqual((record.名稱, record.花費, record.支付方式), ("蛋餅", 45, "現金"))
+        self.assertNotEqual(record.時間, "2026-01-01 08:00")
+        self.assertIsNone(cache.get("u2", "早餐 蛋餅 45"))
+        self.assertEqual(cache.stats("u1")["hit_rate"], 1.0)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5, "users": 2})
+
+    def test_multi_record_utterances_are_cached_together(self):
+        cache = ParseCache(max_entries=10, ttl_seconds=3600, persist=False)
+        cache.put(
+            "u1",
+            "早餐蛋餅45，午餐便當120",
+            [_record(), _record(名稱="便當", 花費=120)],
+        )
+
+        records = cache.get("u1", "早餐蛋餅45 午餐便當120")
+
+        self.assertEqual([r.名稱 for r in records], ["蛋餅", "便當"])
+        self.assertEqual(records[0].時間, records[1].時間)
+
+    def test_utterances_with_time_hints_are_not_cached(self):
+        cache = ParseCache(max_entries=10, ttl_seconds=3600, persist=False)
+        cache.put("u1", "昨天晚餐 200", [_record(名稱="晚餐", 花費=200)])
+
+        self.assertIsNone(cache.get("u1", "昨天晚餐 200"))
+        self.assertEqual(cache.stats("u1")["entries"], 0)
+
+    def test_lru_and_ttl_eviction(self):
+        cache = ParseCache(max_entries=2, ttl_seconds=60, persist=False)
+        cache.put("u1", "a 1", [_record(名稱="a")])
+        cache.put("u1", "b 2", [_record(名稱="b")])
+        cache.get("u1", "a 1")
+        cache.put("u1", "c 3", [_record(名稱="c")])
+
+        self.assertIsNone(cache.get("u1", "b 2"))
+        self.assertIsNotNone(cache.get("u1", "a 1"))
+
+        with patch("app.services.parse_cache.time.time", return_value=10**12):
+            self.assertIsNone(cache.get("u1", "c 3"))
+
+    def test_persisted_entries_survive_restart(self):
+        ParseCache(max_entries=2, ttl_seconds=3600).put(
+            "u1", "咖啡 拿鐵 85", [_record(名稱="拿鐵", 花費=85)], db=self.db
+        )
+
+        [record] = ParseCache(max_entries=2, ttl_seconds=3600).get(
+            "u1", "咖啡拿鐵85", db=self.db
+        )
+        self.assertEqual(record.名稱, "拿鐵")
+
+        entry = get_parse_cache_entry(self.db, "u1", normalize_utterance("咖啡拿鐵85"))
+        entry.created_at = datetime.utcnow() - timedelta(hours=2)
+        self.db.commit()
+        self.assertIsNone(
+            ParseCache(max_entries=2, ttl_seconds=3600).get("u1", "咖啡拿鐵85", db=self.db)
+        )
+        self.assertIsNone(get_parse_cache_entry(self.db, "u1", "咖啡拿鐵85"))
+
+    def test_persisted_entries_are_trimmed_per_user(self):
+        cache = ParseCache(max_entries=2, ttl_seconds=3600)
+        for name in ("a", "b", "c"):
+            cache.put("u1", f"{name} 10", [_record(名稱=name)], db=self.db)
+
+        self.assertIsNone(get_parse_cache_entry(self.db, "u1", "a10"))
+        self.assertIsNotNone(get_parse_cache_entry(self.db, "u1", "c10"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models.schemas import MonthlyStats
+from app.services.openai_service import OpenAIService
+from app.services.prompt_cache_metrics import PromptCacheMetrics, prompt_cache_metrics
+
+STATS = MonthlyStats(
+    month="2026-10",
+    total=500,
+    record_count=2,
+    by_category={"飲食": 500},
+    by_category_count={"飲食": 2},
+)
+
+
+def _usage(prompt_tokens, cached_tokens):
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+    )
+
+
+def _chunk(content=None, usage=None):
+    if content is None:
+        return SimpleNamespace(choices=[], usage=usage)
+    delta = SimpleNamespace(content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class PromptCacheMetricsTests(unittest.TestCase):
+    def test_hit_rate_and_saved_latency(self):
+        metrics = PromptCacheMetrics()
+        metrics.record("query", _usage(1500, 0), 0.9)
+        metrics.record("query", _usage(1500, 1280), 0.5)
+        metrics.record("query", _usage(1500, 1280), 0.5)
+        metrics.record("parse", _usage(300, 0), 0.4)
+        metrics.record("parse", None, 0.4)
+
+        stats = metrics.stats()
+        query = stats["kinds"]["query"]
+        self.assertEqual((query["calls"], query["hit_calls"]), (3, 2))
+        self.assertEqual(query["cached_token_ratio"], round(2560 / 4500, 4))
+        self.assertEqual((query["avg_latency_ms_hit"], query["avg_latency_ms_miss"]), (500, 900))
+        self.assertEqual(query["estimated_saved_ms"], 800)
+
+        self.assertIsNone(stats["kinds"]["parse"]["estimated_saved_ms"])
+        self.assertEqual(stats["overall"]["calls"], 4)
+        self.assertEqual(stats["overall"]["prompt_tokens"], 4800)
+
+
+class StablePrefixTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        prompt_cache_metrics.clear()
+        self.addCleanup(prompt_cache_metrics.clear)
+        self.client = MagicMock()
+        self.client.chat.completions.create = AsyncMock()
+        self.service = OpenAIService(client=self.client)
+
+    async def test_parse_prefix_is_identical_and_usage_recorded(self):
+        self.client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(
+                        content='{"records": [{"時間": "2026-10-16 12:00", '
+                        '"名稱": "午餐", "類別": "飲食", "花費": 120}]}'
+                    )
+                )
+            ],
+            usage=_usage(400, 0),
+        )
+
+        await self.service.parse_accounting_records("午餐 120", datetime(2026, 10, 16, 12))
+        await self.service.parse_accounting_records("晚餐 200", datetime(2026, 10, 16, 19))
+
+        first, second = [
+            call.kwargs["messages"]
+            for call in self.client.chat.completions.create.await_args_list
+        ]
+        self.assertEqual(first[0], second[0])
+        self.assertNotIn("2026", first[0]["content"])
+        self.assertEqual(prompt_cache_metrics.stats()["kinds"]["parse"]["calls"], 2)
+
+    def test_query_messages_put_question_last(self):
+        build = self.service._build_query_messages
+        first = build("這個月花多少", STATS, "Asia/Taipei", None, None)[1]["content"]
+        second = build("飲食佔多少", STATS, "Asia/Taipei", None, None)[1]["content"]
+
+        prefix = first[: first.index("目前時間")]
+        self.assertTrue(prefix.startswith("【當月統計資料】"))
+        self.assertTrue(second.startswith(prefix))
+        self.assertTrue(first.endswith("用戶問題：這個月花多少"))
+
+    async def test_stream_records_usage_from_final_chunk(self):
+        self.client.chat.completions.create.return_value = _stream(
+            _chunk("本月"), _chunk("共 500 元"), _chunk(usage=_usage(1200, 1024))
+        )
+
+        deltas = [d async for d in self.service.stream_answer_query("花多少", STATS)]
+
+        self.assertEqual(deltas, ["本月", "共 500 元"])
+        kwargs = self.client.chat.completions.create.await_args.kwargs
+        self.assertEqual(kwargs["stream_options"], {"include_usage": True})
+        stats = prompt_cache_metrics.stats()["kinds"]["query_stream"]
+        self.assertEqual((stats["hit_calls"], stats["cached_tokens"]), (1, 1024))
+
+
+if __name__ == "__main__":
+    unittest.main()
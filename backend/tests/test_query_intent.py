@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api import accounting
+from app.models.schemas import MonthlyStats, QueryRequest
+from app.services.knowledge_cache import knowledge_cache
+from app.utils.query_intent import (
+    INTENT_CHAT,
+    INTENT_KNOWLEDGE,
+    INTENT_LEDGER,
+    INTENT_TREND,
+    INTENT_UNKNOWN,
+    classify_query,
+)
+
+STATS = MonthlyStats(
+    month="2026-02",
+    total=1200,
+    record_count=10,
+    by_category={"飲食": 1200},
+    by_category_count={"飲食": 10},
+)
+
+
+class ClassifyQueryTests(unittest.TestCase):
+    def test_intents(self):
+        cases = {
+            "你好": INTENT_CHAT,
+            "謝謝你！": INTENT_CHAT,
+            "什麼是ETF": INTENT_KNOWLEDGE,
+            "複利怎麼算？": INTENT_KNOWLEDGE,
+            "這個月花多少": INTENT_LEDGER,
+            "信用卡這個月刷了多少": INTENT_LEDGER,
+            "你好，這個月飲食花多少": INTENT_LEDGER,
+            "跟上個月比起來呢": INTENT_TREND,
+            "幫我規劃預算": INTENT_TREND,
+            "我該買 ETF 嗎": INTENT_UNKNOWN,
+            "": INTENT_UNKNOWN,
+        }
+        for query, intent in cases.items():
+            with self.subTest(query=query):
+                self.assertEqual(classify_query(query)[0], intent)
+
+
+class QueryRoutingTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sheets_service = MagicMock()
+        self.sheets_service.get_monthly_stats = AsyncMock(return_value=STATS)
+        self.sheets_service.get_records_by_date_range = AsyncMock(return_value=[])
+        self.sheets_service.get_multi_month_stats = AsyncMock(return_value=[STATS])
+        self.sheets_service.client.call_count = 2
+
+        self.get_service = AsyncMock(return_value=(self.sheets_service, "sheet"))
+        self.answer_query = AsyncMock(return_value="回答")
+        patches = [
+            patch.object(accounting, "get_sheets_service_for_user", self.get_service),
+            patch.object(accounting, "get_user_by_id", return_value=None),
+            patch.object(accounting, "_save_query_history"),
+            patch.object(accounting.openai_service, "answer_query", self.answer_query),
+            patch.object(accounting.settings, "QUICK_ANSWER_ENABLED", False),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        knowledge_cache.clear()
+        self.addCleanup(knowledge_cache.clear)
+
+    async def _query(self, query):
+        response = MagicMock(headers={})
+        await accounting.query_accounting(
+            QueryRequest(query=query),
+            response=response,
+            current_user={"user_id": "u1"},
+            db=MagicMock(),
+        )
+        return response
+
+    async def test_knowledge_query_skips_sheets(self):
+        response = await self._query("什麼是ETF")
+
+        self.get_service.assert_not_awaited()
+        self.assertEqual(response.headers[accounting.UPSTREAM_CALLS_HEADER], "0")
+        context = self.answer_query.await_args.kwargs
+        self.assertNotIn("stats", context)
+        self.assertEqual(context["user_timezone"], "Asia/Taipei")
+
+    async def test_ledger_query_loads_only_what_it_needs(self):
+        await self._query("總共花了多少")
+
+        self.sheets_service.get_monthly_stats.assert_awaited_once()
+        self.sheets_service.get_records_by_date_range.assert_awaited_once()
+        self.sheets_service.get_multi_month_stats.assert_not_awaited()
+
+    async def test_scoped_query_reads_only_its_range(self):
+        self.sheets_service.get_range_records_and_stats = AsyncMock(
+            return_value=([{"名稱": "捷運", "類別": "交通", "花費": 30}], [])
+        )
+
+        await self._query("上週交通費花多少")
+
+        self.sheets_service.get_range_records_and_stats.assert_awaited_once()
+        self.sheets_service.get_monthly_stats.assert_not_awaited()
+        context = self.answer_query.await_args.kwargs
+        self.assertIn("上週", context["time_range"])
+        self.assertIn("類別：交通", context["time_range"])
+
+    async def test_routing_can_be_disabled(self):
+        with patch.object(accounting.settings, "QUERY_INTENT_ROUTING_ENABLED", False):
+            await self._query("什麼是ETF")
+
+        self.sheets_service.get_multi_month_stats.assert_awaited_once()
+        self.sheets_service.get_records_by_date_range.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
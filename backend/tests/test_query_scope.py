@@ -0,0 +1,124 @@
+import unittest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.google_api_client import GoogleAPIClient
+from app.services.openai_service import OpenAIService
+from app.services.user_sheets_service import UserSheetsService, worksheet_cache
+from app.utils.query_scope import extract_query_scope
+
+HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+
+# 2026-10-16 為星期五
+TODAY = date(2026, 10, 16)
+
+
+class ExtractQueryScopeTests(unittest.TestCase):
+    def test_time_ranges(self):
+        cases = {
+            "今天花多少": (date(2026, 10, 16), date(2026, 10, 16)),
+            "前天吃了什麼": (date(2026, 10, 14), date(2026, 10, 14)),
+            "這週花了多少": (date(2026, 10, 12), date(2026, 10, 16)),
+            "上週總共": (date(2026, 10, 5), date(2026, 10, 11)),
+            "上個月": (date(2026, 9, 1), date(2026, 9, 30)),
+            "最近10天": (date(2026, 10, 7), date(2026, 10, 16)),
+            "近三個月": (date(2026, 8, 1), date(2026, 10, 16)),
+            "今年總共花多少": (date(2026, 1, 1), date(2026, 10, 16)),
+            "去年三月": (date(2025, 3, 1), date(2025, 3, 31)),
+            "十二月花多少": (date(2025, 12, 1), date(2025, 12, 31)),
+            "2026年2月": (date(2026, 2, 1), date(2026, 2, 28)),
+            "2026/03/05 買了什麼": (date(2026, 3, 5), date(2026, 3, 5)),
+            "10月5號花多少": (date(2026, 10, 5), date(2026, 10, 5)),
+            "十二月二十五日買了什麼": (date(2025, 12, 25), date(2025, 12, 25)),
+            "去年3月5日": (date(2025, 3, 5), date(2025, 3, 5)),
+        }
+        for query, expected in cases.items():
+            with self.subTest(query=query):
+                scope = extract_query_scope(query, TODAY)
+                self.assertEqual((scope.start, scope.end), expected)
+
+    def test_category(self):
+        scope = extract_query_scope("去年三月吃飯花多少", TODAY)
+        self.assertEqual((scope.category, scope.months), ("飲食", ["2025-03"]))
+
+        # 只有類別時為本月
+        scope = extract_query_scope("交通費", TODAY)
+        self.assertEqual((scope.start, scope.end), (date(2026, 10, 1), TODAY))
+
+        self.assertIsNone(extract_query_scope("什麼是ETF", TODAY))
+
+
+class RangeReadTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        self.service = UserSheetsService(credentials=MagicMock())
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.service.client = self.api
+        self.api.spreadsheets_get.return_value = {
+            "sheets": [
+                {"properties": {"title": month}}
+                for month in ["2025-12", "2026-01", "2026-02"]
+            ]
+        }
+        rows = {
+            "2025-12": [["2025-12-20 12:00", "午餐", "飲食", 100]],
+            "2026-01": [
+                ["2026-01-10 12:00", "午餐", "飲食", 120],
+                ["2026-01-20 08:00", "捷運", "交通", 30],
+            ],
+            "2026-02": [["2026-02-03 19:00", "晚餐", "飲食", 200]],
+        }
+
+        async def batch_get(sheet_id, ranges, **render_options):
+            return {
+                "valueRanges": [
+                    {"values": [HEADERS] + rows[r.split("'")[1]]} for r in ranges
+                ]
+            }
+
+        self.api.values_batch_get.side_effect = batch_get
+
+    def tearDown(self):
+        worksheet_cache.clear()
+
+    async def test_range_and_trend_months_share_one_batch_read(self):
+        records, stats = await self.service.get_range_records_and_stats(
+            "sheet", "2026-01-15", "2026-02-10", ["2025-12", "2026-01", "2026-02"]
+        )
+
+        self.assertEqual(self.api.values_batch_get.await_count, 1)
+        self.assertFalse(self.api.values_get.called)
+        self.assertEqual([r["名稱"] for r in records], ["捷運", "晚餐"])
+        self.assertEqual([s.total for s in stats], [100, 150, 200])
+
+
+class ScopedPromptTests(unittest.TestCase):
+    def test_range_totals_cover_every_record(self):
+        service = OpenAIService(client=MagicMock())
+        records = [
+            {"時間": f"2025-03-{day:02d} 12:00", "名稱": "午餐", "類別": "飲食", "花費": 100}
+            for day in range(1, 26)
+        ]
+
+        messages = service._build_query_messages(
+            "去年三月吃飯花多少",
+            None,
+            "Asia/Taipei",
+            records,
+            None,
+            "去年三月（2025-03-01 ~ 2025-03-31），類別：飲食",
+        )
+
+        content = messages[1]["content"]
+        self.assertIn("【查詢範圍】去年三月", content)
+        self.assertIn("總支出：2500 元", content)
+        self.assertIn("（共 25 筆）", content)
+        # 超過 20 筆時顯示最新的 20 筆
+        self.assertIn("2025-03-25 12:00", content)
+        self.assertNotIn("2025-03-05 12:00", content)
+        self.assertLess(content.index("2025-03-25 12:00"), content.index("2025-03-06 12:00"))
+        self.assertNotIn("當月統計資料", content)
+
+
+if __name__ == "__main__":
+    unittest.main()
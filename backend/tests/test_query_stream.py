@@ -0,0 +1,144 @@
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+from openai import APIConnectionError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import accounting
+from app.database.crud import create_user, get_query_history
+from app.database.engine import Base
+from app.models.schemas import MonthlyStats, QueryRequest
+from app.services.openai_service import OpenAIService, OpenAIServiceError
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+STATS = MonthlyStats(
+    month="2026-02", total=0, record_count=0, by_category={}, by_category_count={}
+)
+
+
+def _chunk(content):
+    chunk = MagicMock()
+    chunk.choices[0].delta.content = content
+    return chunk
+
+
+async def _stream(*contents):
+    for content in contents:
+        yield _chunk(content)
+
+
+def _parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+class StreamAnswerTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.chat.completions.create = AsyncMock()
+        self.service = OpenAIService(client=self.client)
+        self.service.max_retries = 2
+
+    async def test_yields_deltas_and_retries_stream_creation(self):
+        self.client.chat.completions.create.side_effect = [
+            APIConnectionError(request=REQUEST),
+            _stream("\n", " 本月", None, "共 0 元"),
+        ]
+
+        with patch("app.services.openai_service.asyncio.sleep", new_callable=AsyncMock):
+            deltas = [d async for d in self.service.stream_answer_query("花多少", STATS)]
+
+        self.assertEqual(deltas, ["本月", "共 0 元"])
+        kwargs = self.client.chat.completions.create.await_args.kwargs
+        self.assertTrue(kwargs["stream"])
+
+    async def test_failure_is_wrapped(self):
+        self.client.chat.completions.create.side_effect = APIConnectionError(
+            request=REQUEST
+        )
+
+        with patch("app.services.openai_service.asyncio.sleep", new_callable=AsyncMock):
+            with self.assertRaises(OpenAIServiceError):
+                [d async for d in self.service.stream_answer_query("花多少", STATS)]
+
+
+class QueryStreamEndpointTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        engine = create_engine(
+            "sqlite:///:memory:", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(engine)
+        self.session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+        self.db = self.session_factory()
+        create_user(self.db, user_id="u1", email="u1@example.com", name="U1")
+
+        sheets_service = MagicMock()
+        sheets_service.client.call_count = 2
+        patches = [
+            patch.object(
+                accounting,
+                "get_sheets_service_for_user",
+                AsyncMock(return_value=(sheets_service, "sheet")),
+            ),
+            patch.object(
+                accounting, "_load_query_context", AsyncMock(return_value={"stats": STATS})
+            ),
+            patch.object(accounting, "SessionLocal", self.session_factory),
+            patch.object(accounting.settings, "QUICK_ANSWER_ENABLED", False),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.db.close()
+
+    async def _run(self):
+        response = await accounting.query_accounting_stream(
+            QueryRequest(query="這個月花多少"), current_user={"user_id": "u1"}, db=self.db
+        )
+        body = "".join([chunk async for chunk in response.body_iterator])
+        return response, _parse_events(body)
+
+    async def test_streams_deltas_then_saves_history(self):
+        async def fake_stream(**kwargs):
+            for delta in ["本月", "共 0 元"]:
+                yield delta
+
+        with patch.object(accounting.openai_service, "stream_answer_query", fake_stream):
+            response, events = await self._run()
+
+        self.assertEqual(response.media_type, "text/event-stream")
+        self.assertEqual(response.headers[accounting.UPSTREAM_CALLS_HEADER], "2")
+        self.assertEqual(
+            events,
+            [
+                ("delta", {"text": "本月"}),
+                ("delta", {"text": "共 0 元"}),
+                ("done", {"response": "本月共 0 元"}),
+            ],
+        )
+        history, _ = get_query_history(self.db, "u1")
+        self.assertEqual([h.answer for h in history], ["本月共 0 元"])
+
+    async def test_error_event_skips_history(self):
+        async def failing_stream(**kwargs):
+            yield "本月"
+            raise OpenAIServiceError("QUERY_ERROR", "查詢失敗")
+
+        with patch.object(accounting.openai_service, "stream_answer_query", failing_stream):
+            _, events = await self._run()
+
+        self.assertEqual(events[-1], ("error", {"code": "QUERY_ERROR", "message": "查詢失敗"}))
+        self.assertEqual(get_query_history(self.db, "u1")[0], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api import accounting
+from app.models.schemas import MonthlyStats, QueryRequest
+from app.utils.quick_answer import (
+    KIND_BUDGET,
+    KIND_COUNT,
+    KIND_TOTAL,
+    parse_numeric_question,
+    render_numeric_answer,
+)
+
+TODAY = date(2026, 10, 16)
+
+
+def _stats(month, total, by_category):
+    return MonthlyStats(
+        month=month,
+        total=total,
+        record_count=sum(count for _, count in by_category.values()),
+        by_category={c: amount for c, (amount, _) in by_category.items()},
+        by_category_count={c: count for c, (_, count) in by_category.items()},
+    )
+
+
+class ParseNumericQuestionTests(unittest.TestCase):
+    def test_recognised_questions(self):
+        cases = {
+            "這個月花了多少？": (KIND_TOTAL, None),
+            "飲食花多少": (KIND_TOTAL, "飲食"),
+            "上週交通費多少": (KIND_TOTAL, "交通"),
+            "去年三月吃飯花多少錢": (KIND_TOTAL, "飲食"),
+            "這個月記了幾筆": (KIND_COUNT, None),
+            "剩多少預算": (KIND_BUDGET, None),
+            "這個月還能花多少": (KIND_BUDGET, None),
+        }
+        for query, (kind, category) in cases.items():
+            with self.subTest(query=query):
+                question = parse_numeric_question(query, TODAY)
+                self.assertEqual((question.kind, question.scope.category), (kind, category))
+
+    def test_other_questions_go_to_llm(self):
+        for query in [
+            "為什麼這個月花這麼多",
+            "哪個類別花最多",
+            "跟上個月比花多少",
+            "上個月剩多少預算",
+            "什麼是ETF",
+        ]:
+            with self.subTest(query=query):
+                self.assertIsNone(parse_numeric_question(query, TODAY))
+
+
+class RenderNumericAnswerTests(unittest.TestCase):
+    def test_sentences(self):
+        total = parse_numeric_question("飲食花多少", TODAY)
+        self.assertEqual(
+            render_numeric_answer(total, 1234.5, 3), "本月飲食類共花了 1,234.50 元（3 筆）。"
+        )
+        self.assertEqual(render_numeric_answer(total, 0, 0), "本月沒有飲食類消費記錄。")
+
+        budget = parse_numeric_question("剩多少預算", TODAY)
+        self.assertEqual(
+            render_numeric_answer(budget, 5000, 10, budget=20000),
+            "本月預算 20,000 元，已花費 5,000 元，還剩 15,000 元，已使用 25%。",
+        )
+        self.assertIn("超出預算 1,000 元", render_numeric_answer(budget, 21000, 10, 20000))
+        self.assertIn("還沒有設定每月預算", render_numeric_answer(budget, 5000, 10))
+
+
+class QuickAnswerEndpointTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sheets_service = MagicMock()
+        self.sheets_service.client.call_count = 1
+        self.sheets_service.get_multi_month_stats = AsyncMock(
+            return_value=[_stats("2026-10", 500, {"飲食": (320, 3), "交通": (180, 2)})]
+        )
+        self.sheets_service.get_records_by_date_range = AsyncMock(
+            return_value=[
+                {"時間": "2026-10-06 08:00", "類別": "交通", "花費": 30},
+                {"時間": "2026-10-07 12:00", "類別": "飲食", "花費": 120},
+            ]
+        )
+        self.answer_query = AsyncMock(return_value="LLM 回答")
+        self.save_history = MagicMock()
+
+        frozen = MagicMock(wraps=datetime)
+        frozen.now.side_effect = lambda tz=None: datetime(2026, 10, 16, 12, 0, tzinfo=tz)
+        patches = [
+            patch.object(
+                accounting,
+                "get_sheets_service_for_user",
+                AsyncMock(return_value=(self.sheets_service, "sheet")),
+            ),
+            patch.object(accounting, "get_user_by_id", return_value=None),
+            patch.object(accounting, "get_user_budget", return_value=2000),
+            patch.object(accounting, "_save_query_history", self.save_history),
+            patch.object(accounting, "datetime", frozen),
+            patch.object(accounting.openai_service, "answer_query", self.answer_query),
+            patch.object(accounting.settings, "QUICK_ANSWER_ENABLED", True),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def _query(self, query):
+        result = await accounting.query_accounting(
+            QueryRequest(query=query),
+            response=MagicMock(headers={}),
+            current_user={"user_id": "u1"},
+            db=MagicMock(),
+        )
+        return result.response
+
+    async def test_month_total_uses_aggregates_without_llm(self):
+        answer = await self._query("這個月飲食花了多少")
+
+        self.assertEqual(answer, "這個月飲食類共花了 320 元（3 筆）。")
+        self.sheets_service.get_multi_month_stats.assert_awaited_once_with(
+            "sheet", ["2026-10"]
+        )
+        self.answer_query.assert_not_awaited()
+        self.save_history.assert_called_once()
+
+    async def test_partial_range_sums_records(self):
+        answer = await self._query("上週交通費多少")
+
+        self.assertEqual(answer, "上週交通類共花了 30 元（1 筆）。")
+        self.sheets_service.get_records_by_date_range.assert_awaited_once_with(
+            "sheet", "2026-10-05", "2026-10-11"
+        )
+
+    async def test_budget_remaining(self):
+        answer = await self._query("剩多少預算")
+        self.assertIn("還剩 1,500 元", answer)
+
+    async def test_other_questions_fall_back_to_llm(self):
+        with patch.object(accounting, "_route_query", AsyncMock(return_value=({}, None))):
+            answer = await self._query("為什麼這個月花這麼多")
+
+        self.assertEqual(answer, "LLM 回答")
+        self.answer_query.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
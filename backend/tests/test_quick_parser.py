@@ -0,0 +1,124 @@
+import time
+import unittest
+from datetime import datetime
+
+from app.utils.quick_parser import quick_parse, quick_parse_many
+
+NOW = datetime(2026, 2, 3, 12, 30)
+
+# 常見語句與 LLM 解析結果（名稱、類別、花費、幣別、支付方式）
+LLM_REFERENCE = [
+    ("午餐 120", ("午餐", "飲食", 120, "TWD", None)),
+    ("早餐 50元", ("早餐", "飲食", 50, "TWD", None)),
+    ("晚餐 150元", ("晚餐", "飲食", 150, "TWD", None)),
+    ("咖啡 80元", ("咖啡", "飲食", 80, "TWD", None)),
+    ("交通 30元", ("交通", "交通", 30, "TWD", None)),
+    ("咖啡85元 信用卡", ("咖啡", "飲食", 85, "TWD", "信用卡")),
+    ("捷運 30", ("捷運", "交通", 30, "TWD", None)),
+    ("中午吃排骨便當120元", ("排骨便當", "飲食", 120, "TWD", None)),
+    ("珍奶 65 現金", ("珍奶", "飲食", 65, "TWD", "現金")),
+    ("Uber 250", ("Uber", "交通", 250, "TWD", None)),
+    ("計程車 320元 刷卡", ("計程車", "交通", 320, "TWD", "信用卡")),
+    ("電影票 320 line pay", ("電影票", "娛樂", 320, "TWD", "LINE Pay")),
+    ("房租 12,000", ("房租", "居住", 12000, "TWD", None)),
+    ("衛生紙 199", ("衛生紙", "購物", 199, "TWD", None)),
+    ("看牙醫 150 現金", ("看牙醫", "醫療", 150, "TWD", "現金")),
+    ("拿鐵 ８５", ("拿鐵", "飲食", 85, "TWD", None)),
+    ("午餐 12 美金", ("午餐", "飲食", 12, "USD", None)),
+    ("拉麵 1200 日幣", ("拉麵", "飲食", 1200, "JPY", None)),
+    ("加油 1500", ("加油", "交通", 1500, "TWD", None)),
+    ("學費 30000 轉帳", ("學費", "教育", 30000, "TWD", "轉帳")),
+    ("Netflix 390", ("Netflix", "娛樂", 390, "TWD", None)),
+    ("電費 880", ("電費", "居住", 880, "TWD", None)),
+]
+
+# 語意不明確、應交給 LLM 的語句
+AMBIGUOUS = [
+    "昨天晚餐 200",
+    "午餐120 咖啡80",
+    "上週五看電影 300",
+    "3點喝下午茶 150",
+    "一百二的便當",
+    "午餐",
+    "給媽媽 2000",
+    "12/25 聖誕禮物 1500",
+    "悠遊卡儲值 500",
+]
+
+
+class QuickParserCorpusTests(unittest.TestCase):
+    def test_accuracy_against_llm_reference(self):
+        hits, mismatches = 0, []
+        for text, expected in LLM_REFERENCE:
+            record = quick_parse(text, now=NOW)
+            if record is None:
+                continue
+            hits += 1
+            actual = (record.名稱, record.類別, record.花費, record.幣別, record.支付方式)
+            if actual != expected:
+                mismatches.append((text, actual, expected))
+
+        # 走規則路徑的結果必須與 LLM 一致，且涵蓋大部分常見語句
+        self.assertEqual(mismatches, [])
+        self.assertGreaterEqual(hits / len(LLM_REFERENCE), 0.9)
+
+    def test_ambiguous_inputs_fall_back_to_llm(self):
+        for text in AMBIGUOUS:
+            with self.subTest(text=text):
+                self.assertIsNone(quick_parse(text, now=NOW))
+
+    def test_longest_keyword_wins_and_single_characters_do_not_match(self):
+        self.assertEqual(quick_parse("uber eats 250", now=NOW).類別, "飲食")
+        self.assertEqual(quick_parse("UberEats 180", now=NOW).類別, "飲食")
+        self.assertEqual(quick_parse("Uber 250", now=NOW).類別, "交通")
+        self.assertEqual(quick_parse("參考書 350", now=NOW).類別, "教育")
+        self.assertEqual(quick_parse("球鞋 2500", now=NOW).類別, "購物")
+        # 只因單一字元相符的名稱交給 LLM
+        for text in ["書包 890", "芍藥花 300", "拖鞋 199"]:
+            with self.subTest(text=text):
+                self.assertIsNone(quick_parse(text, now=NOW))
+
+    def test_signed_amounts_fall_back_to_llm(self):
+        for text in ["午餐 -120", "午餐-120", "退款 +120", "午餐 − 120"]:
+            with self.subTest(text=text):
+                self.assertIsNone(quick_parse(text, now=NOW))
+
+    def test_name_strips_filler_and_keeps_original_case(self):
+        record = quick_parse("買了兩杯咖啡 100", now=NOW)
+        self.assertEqual((record.名稱, record.類別), ("兩杯咖啡", "飲食"))
+        self.assertEqual(quick_parse("AA 午餐 300", now=NOW).名稱, "AA午餐")
+        self.assertEqual(quick_parse("UBER 信用卡 250", now=NOW).名稱, "UBER")
+
+    def test_removed_keywords_do_not_match(self):
+        # 含數字的名稱一律交給 LLM；悠遊卡為支付方式，儲值本身無法判斷類別
+        for text in ["3C 用品 500", "悠遊卡儲值 500"]:
+            with self.subTest(text=text):
+                self.assertIsNone(quick_parse(text, now=NOW))
+
+    def test_uses_given_time(self):
+        self.assertEqual(quick_parse("午餐 120", now=NOW).時間, "2026-02-03 12:30")
+
+    def test_multi_record_utterance(self):
+        records = quick_parse_many("早餐蛋餅45，午餐便當120，晚上捷運30", now=NOW)
+
+        self.assertEqual(
+            [(r.名稱, r.類別, r.花費) for r in records],
+            [("早餐蛋餅", "飲食", 45), ("午餐便當", "飲食", 120), ("捷運", "交通", 30)],
+        )
+        self.assertEqual(quick_parse_many("午餐 1,200", now=NOW)[0].花費, 1200)
+        self.assertEqual(len(quick_parse_many("咖啡85元, 信用卡", now=NOW)), 1)
+        # 任一段無法解析就整句交給 LLM
+        self.assertIsNone(quick_parse_many("早餐45，昨天晚餐200", now=NOW))
+
+    def test_parse_is_fast(self):
+        texts = [text for text, _ in LLM_REFERENCE] + AMBIGUOUS
+        started = time.perf_counter()
+        for _ in range(100):
+            for text in texts:
+                quick_parse(text, now=NOW)
+        per_call = (time.perf_counter() - started) / (100 * len(texts))
+        self.assertLess(per_call, 0.001)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models.schemas import AccountingRecord
+from app.services.google_api_client import GoogleAPIClient, GoogleAPIError
+from app.services.user_sheets_service import (
+    UserSheetsService,
+    row_count_cache,
+    worksheet_cache,
+)
+
+
+def _row(day: int, hour: int, name: str = "午餐"):
+    return [f"2026-03-{day:02d} {hour:02d}:00", name, "飲食", "100", "TWD", ""]
+
+
+class RecentRecordsTailReadTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        row_count_cache.clear()
+        now = datetime.now(timezone.utc)
+        self.month = now.strftime("%Y-%m")
+        self.last_month = (now.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.api.values_append.return_value = {}
+        self.service = UserSheetsService(credentials=MagicMock())
+        self.service.client = self.api
+
+    def tearDown(self):
+        worksheet_cache.clear()
+        row_count_cache.clear()
+
+    def _ranges(self):
+        return [call.args[1] for call in self.api.values_get.await_args_list]
+
+    async def test_learns_row_count_then_reads_tail(self):
+        tail = [_row(day, 12) for day in range(1, 20)] + [_row(20, 8)]
+        self.api.values_get.side_effect = [
+            {"values": [["時間"]] * 150},
+            {"values": tail},
+        ]
+
+        recent = await self.service.get_recent_records(
+            "sheet", limit=5, user_timezone="UTC"
+        )
+
+        self.assertEqual(
+            self._ranges(), [f"'{self.month}'!A:A", f"'{self.month}'!A131:F"]
+        )
+        self.assertFalse(self.api.values_batch_get.called)
+        self.assertEqual(
+            [r["時間"] for r in recent],
+            [
+                "2026-03-20 08:00",
+                "2026-03-19 12:00",
+                "2026-03-18 12:00",
+                "2026-03-17 12:00",
+                "2026-03-16 12:00",
+            ],
+        )
+
+    async def test_append_response_seeds_row_count(self):
+        worksheet_cache.set("sheet", [self.month])
+        self.api.values_append.return_value = {
+            "updates": {"updatedRange": f"'{self.month}'!A151:F151"}
+        }
+        await self.service.write_record(
+            "sheet",
+            AccountingRecord(時間=f"{self.month}-01 09:00", 名稱="咖啡", 類別="飲食", 花費=60),
+        )
+        self.api.values_get.return_value = {"values": [_row(day, 9) for day in range(1, 21)]}
+
+        await self.service.get_recent_records("sheet", limit=5, user_timezone="UTC")
+
+        self.assertEqual(self._ranges(), [f"'{self.month}'!A132:F"])
+
+    async def test_extends_into_previous_month_when_short(self):
+        row_count_cache.set("sheet", self.month, 3)
+        row_count_cache.set("sheet", self.last_month, 40)
+        self.api.values_get.side_effect = [
+            {"values": [_row(2, 9), _row(1, 9)]},
+            {"values": [_row(day, 9) for day in range(1, 21)]},
+        ]
+
+        recent = await self.service.get_recent_records(
+            "sheet", limit=5, user_timezone="UTC"
+        )
+
+        self.assertEqual(
+            self._ranges(),
+            [f"'{self.month}'!A2:F", f"'{self.last_month}'!A21:F"],
+        )
+        self.assertEqual(len(recent), 5)
+
+    async def test_stale_row_count_is_relearned(self):
+        row_count_cache.set("sheet", self.month, 150)
+        self.api.values_get.side_effect = [
+            {"values": [_row(1, 9)]},
+            {"values": [["時間"]] * 30},
+            {"values": [_row(day, 9) for day in range(1, 30)]},
+        ]
+
+        recent = await self.service.get_recent_records(
+            "sheet", limit=5, user_timezone="UTC"
+        )
+
+        self.assertEqual(
+            self._ranges(),
+            [f"'{self.month}'!A131:F", f"'{self.month}'!A:A", f"'{self.month}'!A11:F"],
+        )
+        self.assertEqual(len(recent), 5)
+
+    async def test_failed_month_is_skipped(self):
+        row_count_cache.set("sheet", self.month, 40)
+        row_count_cache.set("sheet", self.last_month, 40)
+        self.api.values_get.side_effect = [
+            GoogleAPIError(500, "Internal error"),
+            {"values": [_row(day, 9) for day in range(1, 21)]},
+        ]
+
+        recent = await self.service.get_recent_records(
+            "sheet", limit=5, user_timezone="UTC"
+        )
+
+        self.assertEqual(
+            self._ranges(),
+            [f"'{self.month}'!A21:F", f"'{self.last_month}'!A21:F"],
+        )
+        self.assertEqual(len(recent), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models.schemas import AccountingRecord
+from app.services.google_api_client import GoogleAPIClient
+from app.services.user_sheets_service import UserSheetsService, worksheet_cache
+
+HEADERS = ["時間", "名稱", "類別", "花費", "幣別", "支付方式"]
+
+
+def _batch_get(sheet_id, ranges, **render_options):
+    return {
+        "valueRanges": [
+            {"values": [HEADERS, [f"{r[1:8]}-01 12:00", "午餐", "飲食", "100", "TWD"]]}
+            for r in ranges
+        ]
+    }
+
+
+class RequestSnapshotTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        self.month = datetime.now().strftime("%Y-%m")
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.api.values_append.return_value = {}
+        self.api.spreadsheets_get.return_value = {
+            "sheets": [{"properties": {"title": self.month}}]
+        }
+        self.api.values_batch_get.side_effect = _batch_get
+        self.api.values_get.return_value = {"values": []}
+        self.service = UserSheetsService(credentials=MagicMock())
+        self.service.client = self.api
+
+    def tearDown(self):
+        worksheet_cache.clear()
+
+    def _requested_ranges(self):
+        return [
+            r for call in self.api.values_batch_get.await_args_list for r in call.args[1]
+        ]
+
+    async def test_dashboard_reads_each_month_once(self):
+        await self.service.get_monthly_stats("sheet")
+        await self.service.get_recent_records("sheet", user_timezone="UTC")
+        await self.service.get_daily_trend("sheet", days=7, user_timezone="UTC")
+        await self.service.get_monthly_stats("sheet")
+
+        ranges = self._requested_ranges()
+        self.assertEqual(len(ranges), len(set(ranges)))
+        self.assertEqual(ranges.count(f"'{self.month}'!A:F"), 1)
+        self.assertLessEqual(self.api.spreadsheets_get.await_count, 1)
+
+    async def test_concurrent_reads_share_inflight_fetch(self):
+        await asyncio.gather(
+            self.service.get_monthly_stats("sheet", month=self.month),
+            self.service.get_all_records("sheet", month=self.month),
+        )
+        self.assertEqual(self.api.values_batch_get.await_count, 1)
+
+    async def test_write_invalidates_month(self):
+        await self.service.get_monthly_stats("sheet", month=self.month)
+        await self.service.write_record(
+            "sheet",
+            AccountingRecord(時間=f"{self.month}-02 08:00", 名稱="早餐", 類別="飲食", 花費=50),
+        )
+        await self.service.get_monthly_stats("sheet", month=self.month)
+
+        self.assertEqual(self._requested_ranges().count(f"'{self.month}'!A:F"), 2)
+
+    async def test_failed_read_is_not_memoized(self):
+        self.api.values_batch_get.side_effect = RuntimeError("boom")
+        with self.assertRaises(Exception):
+            await self.service.get_all_records("sheet", month=self.month)
+
+        self.api.values_batch_get.side_effect = _batch_get
+        records = await self.service.get_all_records("sheet", month=self.month)
+        self.assertEqual(len(records), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
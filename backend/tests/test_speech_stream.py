@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api import speech
+from app.services.openai_service import OpenAIService, OpenAIServiceError
+from app.utils.sentences import split_sentences
+
+
+class _FakeStreamingResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def iter_bytes(self, chunk_size=None):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class _FakeContext:
+    def __init__(self, chunks):
+        self.response = _FakeStreamingResponse(chunks)
+        self.closed = False
+
+    async def __aenter__(self):
+        return self.response
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+
+class SplitSentencesTests(unittest.TestCase):
+    def test_splits_at_sentence_ends_and_merges_short_pieces(self):
+        text = "本月總共花了 3200 元。其中飲食最多！建議少叫外送，改成自己帶便當。加油"
+        self.assertEqual(
+            split_sentences(text, min_chars=10),
+            ["本月總共花了 3200 元。", "其中飲食最多！建議少叫外送，改成自己帶便當。", "加油"],
+        )
+
+    def test_long_text_without_punctuation_is_cut(self):
+        self.assertEqual(split_sentences("a" * 450, max_chars=200), ["a" * 200, "a" * 200, "a" * 50])
+
+
+class StreamingSpeechTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.service = OpenAIService(client=self.client)
+
+    async def test_stream_forwards_chunks(self):
+        context = _FakeContext([b"a", b"b"])
+        self.client.audio.speech.with_streaming_response.create.return_value = context
+
+        chunks = [c async for c in self.service.stream_text_to_speech("你好")]
+
+        self.assertEqual(chunks, [b"a", b"b"])
+        self.assertTrue(context.closed)
+
+    async def test_sentences_are_pipelined_in_order(self):
+        started = []
+
+        async def fake_tts(text, voice, speed):
+            started.append(text)
+            # 第二句最慢，輸出仍需維持原順序
+            await asyncio.sleep(0.05 if text.startswith("第二") else 0)
+            return text.encode()
+
+        async def fake_stream(text, voice, speed):
+            # 第一句輸出前，後續句子已開始合成
+            await asyncio.sleep(0)
+            self.assertEqual(len(started), 2)
+            yield b"first:"
+
+        self.service.text_to_speech = fake_tts
+        self.service.stream_text_to_speech = fake_stream
+        with patch("app.services.openai_service.settings.TTS_PIPELINE_DEPTH", 2):
+            chunks = [
+                c
+                async for c in self.service.stream_sentences_to_speech(
+                    "第一句：本月總共花了三千兩百元，比上個月多。"
+                    "第二句：其中飲食佔了最多，大約一千八百元。"
+                    "第三句：建議可以減少外送，改成自己帶便當。"
+                    "第四句：交通費用維持穩定，沒有明顯變化。"
+                )
+            ]
+
+        self.assertEqual(
+            b"".join(chunks).decode(),
+            "first:第二句：其中飲食佔了最多，大約一千八百元。"
+            "第三句：建議可以減少外送，改成自己帶便當。"
+            "第四句：交通費用維持穩定，沒有明顯變化。",
+        )
+
+
+class SynthesizeEndpointTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = patch.object(speech.settings, "TTS_CACHE_ENABLED", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_stream_mode_returns_streaming_response(self):
+        async def fake_stream(text, voice, speed):
+            yield b"a"
+            yield b"b"
+
+        with patch.object(speech.openai_service, "stream_sentences_to_speech", fake_stream):
+            response = await speech.synthesize_speech(
+                speech.TTSRequest(text="你好", stream=True),
+                token_valid=True,
+                if_none_match=None,
+            )
+            body = b"".join([c async for c in response.body_iterator])
+
+        self.assertEqual(response.media_type, "audio/mpeg")
+        self.assertEqual(body, b"ab")
+
+    async def test_failure_before_first_chunk_is_http_error(self):
+        async def failing_stream(text, voice, speed):
+            raise OpenAIServiceError("TTS_ERROR", "語音合成失敗")
+            yield b""
+
+        with patch.object(speech.openai_service, "stream_text_to_speech", failing_stream):
+            with self.assertRaises(speech.HTTPException) as ctx:
+                await speech.synthesize_speech(
+                    speech.TTSRequest(text="你好", stream=True, split_sentences=False),
+                    token_valid=True,
+                    if_none_match=None,
+                )
+        self.assertEqual(ctx.exception.status_code, 500)
+
+    async def test_default_mode_still_buffers(self):
+        with patch.object(
+            speech.openai_service, "text_to_speech", AsyncMock(return_value=b"mp3")
+        ):
+            response = await speech.synthesize_speech(
+                speech.TTSRequest(text="你好"), token_valid=True, if_none_match=None
+            )
+        self.assertEqual(response.body, b"mp3")
+
+
+if __name__ == "__main__":
+    unittest.main()
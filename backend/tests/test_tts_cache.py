@@ -0,0 +1,118 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from fastapi.responses import FileResponse
+
+from app.api import speech
+from app.services import tts_cache as tts_cache_module
+from app.services.tts_cache import TTSAudioCache, tts_cache_key
+
+
+class TTSAudioCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.tts = AsyncMock(side_effect=lambda text, voice, speed: text.encode() * 10)
+        patcher = patch.object(
+            tts_cache_module.openai_service, "text_to_speech", self.tts
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key_depends_on_every_parameter(self):
+        base = tts_cache_key("已記錄：咖啡 85TWD", "nova", 1.0)
+        self.assertEqual(base, tts_cache_key("已記錄：咖啡 85TWD", "nova", 1))
+        self.assertNotEqual(base, tts_cache_key("已記錄：咖啡 85TWD", "onyx", 1.0))
+        self.assertNotEqual(base, tts_cache_key("已記錄：咖啡 85TWD", "nova", 1.25))
+        self.assertNotEqual(base, tts_cache_key("已記錄：咖啡 85TWD", "nova", 1.0, "tts-1"))
+
+    async def test_concurrent_misses_share_one_synthesis(self):
+        cache = TTSAudioCache(self.tmp.name, max_bytes=10_000)
+
+        paths = await asyncio.gather(
+            cache.synthesize("你好", "nova", 1.0), cache.synthesize("你好", "nova", 1.0)
+        )
+
+        self.assertEqual(paths[0], paths[1])
+        self.assertEqual(paths[0].read_bytes(), "你好".encode() * 10)
+        self.tts.assert_awaited_once()
+
+        # 重新啟動後仍可命中
+        restarted = TTSAudioCache(self.tmp.name, max_bytes=10_000)
+        self.assertEqual(await restarted.synthesize("你好", "nova", 1.0), paths[0])
+        self.tts.assert_awaited_once()
+
+    def test_least_recently_used_files_are_evicted(self):
+        cache = TTSAudioCache(self.tmp.name, max_bytes=250, evict_grace_seconds=0)
+        a = cache.put("a" * 64, b"x" * 100)
+        cache.put("b" * 64, b"x" * 100)
+        cache.get("a" * 64)
+        cache.put("c" * 64, b"x" * 100)
+
+        self.assertTrue(a.exists())
+        self.assertIsNone(cache.get("b" * 64))
+        self.assertFalse(any(Path(self.tmp.name).glob("bb/*")))
+
+    def test_recently_used_files_are_not_evicted(self):
+        cache = TTSAudioCache(self.tmp.name, max_bytes=150, evict_grace_seconds=60)
+        a = cache.put("a" * 64, b"x" * 100)
+        cache.put("b" * 64, b"x" * 100)
+
+        self.assertTrue(a.exists())
+
+        with patch.object(tts_cache_module.time, "time", return_value=time.time() + 120):
+            cache.put("c" * 64, b"x" * 100)
+        self.assertFalse(a.exists())
+        self.assertFalse(any(Path(self.tmp.name).glob("bb/*")))
+
+    async def test_prewarm_skips_cached_phrases(self):
+        cache = TTSAudioCache(self.tmp.name, max_bytes=10_000)
+        await cache.synthesize("好的", "nova", 1.0)
+
+        self.assertEqual(await cache.prewarm(["好的", "已記錄"], "nova"), 1)
+        self.assertEqual(self.tts.await_count, 2)
+
+
+class CachedSynthesizeEndpointTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = TTSAudioCache(tmp.name, max_bytes=10_000)
+        self.tts = AsyncMock(return_value=b"mp3")
+        for patcher in (
+            patch.object(speech, "tts_cache", self.cache),
+            patch.object(speech.settings, "TTS_CACHE_ENABLED", True),
+            patch.object(tts_cache_module.openai_service, "text_to_speech", self.tts),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def _synthesize(self, if_none_match=None, **fields):
+        return await speech.synthesize_speech(
+            speech.TTSRequest(text="已記錄：咖啡 85TWD", **fields),
+            token_valid=True,
+            if_none_match=if_none_match,
+        )
+
+    async def test_served_from_file_with_etag(self):
+        first = await self._synthesize()
+        second = await self._synthesize(stream=True)
+
+        self.assertIsInstance(first, FileResponse)
+        self.assertIsInstance(second, FileResponse)
+        self.assertEqual(first.path, second.path)
+        etag = first.headers["etag"]
+        self.assertEqual(etag, f'"{tts_cache_key("已記錄：咖啡 85TWD", "nova", 1.0)}"')
+        self.assertIn("max-age", first.headers["cache-control"])
+        self.tts.assert_awaited_once()
+
+        not_modified = await self._synthesize(if_none_match=etag)
+        self.assertEqual(not_modified.status_code, 304)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.schemas import AccountingRecord
+from app.services.google_api_client import GoogleAPIClient, GoogleAPIError
+from app.services.user_sheets_service import (
+    UserSheetsService,
+    WorksheetCatalogCache,
+    worksheet_cache,
+)
+
+
+class WorksheetCatalogCacheTests(unittest.TestCase):
+    def test_ttl_expiry(self):
+        cache = WorksheetCatalogCache(ttl_seconds=10)
+        with patch("app.services.user_sheets_service.time.monotonic", return_value=0):
+            cache.set("sheet", ["2026-01"])
+        with patch("app.services.user_sheets_service.time.monotonic", return_value=5):
+            self.assertEqual(cache.get("sheet"), ["2026-01"])
+        with patch("app.services.user_sheets_service.time.monotonic", return_value=11):
+            self.assertIsNone(cache.get("sheet"))
+
+    def test_add_and_invalidate(self):
+        cache = WorksheetCatalogCache(ttl_seconds=60)
+        cache.add("sheet", "2026-01")
+        self.assertIsNone(cache.get("sheet"))
+
+        cache.set("sheet", ["2026-01"])
+        cache.add("sheet", "2026-02")
+        self.assertEqual(cache.get("sheet"), ["2026-01", "2026-02"])
+
+        cache.invalidate("sheet")
+        self.assertIsNone(cache.get("sheet"))
+
+
+class WriteRecordCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        worksheet_cache.clear()
+        self.service = UserSheetsService(credentials=MagicMock())
+        self.api = AsyncMock(spec=GoogleAPIClient)
+        self.service.client = self.api
+        self.api.values_append.return_value = {}
+        self.api.spreadsheets_get.return_value = {
+            "sheets": [{"properties": {"title": "2026-01"}}]
+        }
+        self.record = AccountingRecord(
+            時間="2026-01-15 12:30", 名稱="午餐", 類別="飲食", 花費=120
+        )
+
+    def tearDown(self):
+        worksheet_cache.clear()
+
+    async def test_second_write_skips_worksheet_lookup(self):
+        await self.service.write_record("sheet", self.record)
+        await self.service.write_record("sheet", self.record)
+
+        self.assertEqual(self.api.spreadsheets_get.call_count, 1)
+        self.assertEqual(self.api.values_append.call_count, 2)
+
+    async def test_missing_range_invalidates_and_retries(self):
+        worksheet_cache.set("sheet", ["2026-01"])
+        self.api.values_append.side_effect = [
+            GoogleAPIError(400, "Unable to parse range: '2026-01'!A:F"),
+            {},
+        ]
+        self.api.spreadsheets_get.return_value = {"sheets": []}
+
+        await self.service.write_record("sheet", self.record)
+
+        self.assertEqual(self.api.values_append.call_count, 2)
+        self.assertTrue(self.api.spreadsheets_batch_update.called)
+        self.assertEqual(worksheet_cache.get("sheet"), ["2026-01"])
+
+
+if __name__ == "__main__":
+    unittest.main()
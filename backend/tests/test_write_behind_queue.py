@@ -0,0 +1,133 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database.crud import get_pending_sheet_writes, save_google_token
+from app.database.engine import Base
+from app.models.schemas import AccountingRecord
+from app.services.user_sheets_service import UserSheetsService
+from app.services.write_behind_queue import SheetWriteQueue
+
+
+def _record(time: str, name: str, amount: float) -> AccountingRecord:
+    return AccountingRecord(時間=time, 名稱=name, 類別="飲食", 花費=amount)
+
+
+class SheetWriteQueueTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        self.SessionLocal = sessionmaker(bind=engine)
+        with self.SessionLocal() as db:
+            save_google_token(db, "u1", "stored-token", refresh_token="refresh")
+
+        self.sheets = AsyncMock(spec=UserSheetsService)
+        self.create_service = patch(
+            "app.services.write_behind_queue.create_user_sheets_service",
+            return_value=self.sheets,
+        ).start()
+        self.addCleanup(patch.stopall)
+
+    def _queue(self, window_seconds: float = 60, max_batch: int = 10, **kwargs):
+        return SheetWriteQueue(
+            window_seconds=window_seconds,
+            max_batch=max_batch,
+            session_factory=self.SessionLocal,
+            **kwargs,
+        )
+
+    def _pending(self):
+        with self.SessionLocal() as db:
+            return get_pending_sheet_writes(db)
+
+    async def test_flush_coalesces_rows_per_month(self):
+        queue = self._queue()
+        await queue.enqueue("u1", "sheet", _record("2026-01-31 23:00", "宵夜", 80))
+        await queue.enqueue("u1", "sheet", _record("2026-02-01 08:00", "早餐", 45))
+        record_id = await queue.enqueue(
+            "u1", "sheet", _record("2026-02-01 12:00", "午餐", 120)
+        )
+
+        self.assertTrue(record_id)
+        self.assertEqual(len(self._pending()), 3)
+        self.sheets.append_rows.assert_not_called()
+
+        flushed = await queue.flush_all()
+
+        self.assertEqual(flushed, 3)
+        self.assertEqual(self.sheets.append_rows.await_count, 2)
+        months = [call.args[1] for call in self.sheets.append_rows.await_args_list]
+        self.assertEqual(months, ["2026-01", "2026-02"])
+        self.assertEqual(len(self.sheets.append_rows.await_args_list[1].args[2]), 2)
+        self.assertEqual(self._pending(), [])
+
+    async def test_batch_threshold_flushes_immediately(self):
+        queue = self._queue(window_seconds=60, max_batch=2)
+        await queue.enqueue("u1", "sheet", _record("2026-02-01 08:00", "早餐", 45))
+        await queue.enqueue("u1", "sheet", _record("2026-02-01 12:00", "午餐", 120))
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        self.sheets.append_rows.assert_awaited_once()
+        self.assertEqual(self._pending(), [])
+
+    async def test_failed_append_stays_queued(self):
+        queue = self._queue()
+        self.sheets.append_rows.side_effect = RuntimeError("quota exceeded")
+        await queue.enqueue("u1", "sheet", _record("2026-02-01 08:00", "早餐", 45))
+
+        flushed = await queue.flush("sheet")
+
+        self.assertEqual(flushed, 0)
+        self.assertEqual(len(self._pending()), 1)
+
+    async def test_failed_flush_is_retried_with_backoff(self):
+        queue = self._queue(window_seconds=0, retry_seconds=0.01, max_retries=3)
+        self.sheets.append_rows.side_effect = [RuntimeError("quota exceeded"), None]
+        await queue.enqueue("u1", "sheet", _record("2026-02-01 08:00", "早餐", 45))
+
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if not self._pending():
+                break
+
+        self.assertEqual(self.sheets.append_rows.await_count, 2)
+        self.assertEqual(self._pending(), [])
+        self.assertNotIn("sheet", queue._retries)
+
+    async def test_retries_stop_after_limit_and_rows_stay_queued(self):
+        queue = self._queue(window_seconds=0, retry_seconds=0.01, max_retries=2)
+        self.sheets.append_rows.side_effect = RuntimeError("forbidden")
+        await queue.enqueue("u1", "sheet", _record("2026-02-01 08:00", "早餐", 45))
+
+        for _ in range(20):
+            await asyncio.sleep(0.02)
+
+        self.assertEqual(self.sheets.append_rows.await_count, 3)
+        self.assertEqual(len(self._pending()), 1)
+        self.assertNotIn("sheet", queue._timers)
+
+    async def test_flush_uses_stored_token_not_request_service(self):
+        queue = self._queue()
+        await queue.enqueue("u1", "sheet", _record("2026-02-01 08:00", "早餐", 45))
+
+        await queue.flush("sheet")
+
+        self.assertFalse(hasattr(queue, "_services"))
+        self.assertEqual(
+            self.create_service.call_args.kwargs["access_token"], "stored-token"
+        )
+        self.sheets.append_rows.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
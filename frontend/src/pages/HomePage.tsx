@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { toast } from 'sonner';
 import { Button } from '@/components/ui/button';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
@@ -18,11 +18,12 @@ import { pickWebVoice } from '@/utils/tts';
 import {
   createEntry,
   getAuthToken,
+  getRecordFeedback,
   getDashboardSummary,
   setUserBudget,
   isAuthenticated,
 } from '@/services/api';
-import type { AccountingRecord, DashboardSummary } from '@/services/api';
+import type { AccountingRecord, AccountingResponse, DashboardSummary } from '@/services/api';
 
 // Icon components
 function MicrophoneIcon({ className }: { className?: string }) {
@@ -187,6 +188,29 @@ export default function HomePage() {
     }
   };
 
+  // 顯示理財回饋；背景產生中時以 long polling 取得
+  const feedbackRecordRef = useRef<string | null>(null);
+  const showFeedback = async (response: AccountingResponse) => {
+    feedbackRecordRef.current = response.record_id ?? null;
+    setLastFeedback(response.feedback);
+    if (response.feedback_status !== 'pending' || !response.record_id) return;
+
+    for (let attempt = 0; attempt < 3; attempt++) {
+      try {
+        const result = await getRecordFeedback(response.record_id, 10);
+        // 期間又記了一筆，不覆蓋新記錄的回饋
+        if (feedbackRecordRef.current !== response.record_id) return;
+        if (result.status !== 'pending') {
+          setLastFeedback(result.feedback);
+          return;
+        }
+      } catch (error) {
+        console.warn('Failed to load feedback:', error);
+        return;
+      }
+    }
+  };
+
   const handleSubmit = async () => {
     if (!inputText.trim()) {
       toast.error('請輸入記帳內容');
@@ -208,7 +232,7 @@ export default function HomePage() {
       const response = await createEntry(inputText);
       if (response.success) {
         setLastResult(response.record);
-        setLastFeedback(response.feedback);
+        void showFeedback(response);
         toast.success(response.message);
 
         // Clear input
@@ -238,7 +262,7 @@ export default function HomePage() {
       const response = await createEntry(text);
       if (response.success) {
         setLastResult(response.record);
-        setLastFeedback(response.feedback);
+        void showFeedback(response);
         toast.success(response.message);
 
         // Refresh dashboard data
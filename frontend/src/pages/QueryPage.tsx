@@ -9,7 +9,7 @@ import { useOpenAITTS } from '@/hooks/useOpenAITTS';
 import { useSettings } from '@/hooks/useSettings';
 import { useSpeechSynthesis } from '@/hooks/useSpeechSynthesis';
 import { pickWebVoice } from '@/utils/tts';
-import { queryAccounting, getAuthToken, getQueryHistory } from '@/services/api';
+import { queryAccountingStream, getAuthToken, getQueryHistory } from '@/services/api';
 import type { QueryHistoryItem } from '@/services/api';
 
 // Icon components
@@ -328,18 +328,35 @@ export default function QueryPage() {
     }
 
     setIsLoading(true);
-    try {
-      const response = await queryAccounting(query);
-      if (response.success) {
-        // 新增到本地記錄最前面（後端已自動儲存）
+    // 回答以串流逐段顯示，先在記錄最前面放入臨時項目（後端會在完成時儲存）
+    const tempId = Date.now(); // 臨時 ID
+    let added = false;
+    const updateAnswer = (answer: string) => {
+      if (!added) {
+        added = true;
         const newItem: QueryHistoryItem = {
-          id: Date.now(), // 臨時 ID
+          id: tempId,
           query: query,
-          answer: response.answer,
+          answer,
           created_at: new Date().toISOString(),
         };
         setHistory((prev) => [newItem, ...prev]);
         setTotalCount((prev) => prev + 1);
+        return;
+      }
+      setHistory((prev) =>
+        prev.map((item) => (item.id === tempId ? { ...item, answer } : item))
+      );
+    };
+
+    try {
+      let partial = '';
+      const response = await queryAccountingStream(query, (delta) => {
+        partial += delta;
+        updateAnswer(partial);
+      });
+      if (response.success) {
+        updateAnswer(response.answer);
         setQueryText('');
         resetTranscript();
 
@@ -347,6 +364,10 @@ export default function QueryPage() {
         await speakMessage(response.answer);
       }
     } catch (error) {
+      if (added) {
+        setHistory((prev) => prev.filter((item) => item.id !== tempId));
+        setTotalCount((prev) => prev - 1);
+      }
       const errorMessage = error instanceof Error ? error.message : '查詢失敗';
       toast.error(errorMessage);
     } finally {
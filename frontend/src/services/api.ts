@@ -73,6 +73,49 @@ const processQueue = (error: unknown, token: string | null = null) => {
   failedQueue = [];
 };
 
+/**
+ * 以 Refresh Token 取得新的 Access Token
+ *
+ * 同時有多個請求需要刷新時只送出一次刷新請求，其餘等待結果。
+ * 刷新失敗時清除登入狀態。
+ */
+const refreshAuthSession = async (): Promise<string> => {
+  if (!refreshToken) {
+    setAuthToken(null);
+    throw new Error('登入已過期，請重新登入');
+  }
+  if (isRefreshing) {
+    // Queue the request while refreshing
+    return new Promise((resolve, reject) => {
+      failedQueue.push({ resolve: (token) => resolve(token as string), reject });
+    });
+  }
+
+  isRefreshing = true;
+  try {
+    const response = await api.post<AuthSessionResponse>('/api/auth/refresh', {
+      refresh_token: refreshToken,
+    });
+
+    const newToken = response.data.access_token;
+    setAuthSession(
+      response.data.access_token,
+      response.data.refresh_token,
+      response.data.access_token_expires_at
+    );
+
+    processQueue(null, newToken);
+    return newToken;
+  } catch (refreshError) {
+    processQueue(refreshError, null);
+    // Refresh failed, clear tokens
+    setAuthToken(null);
+    throw refreshError;
+  } finally {
+    isRefreshing = false;
+  }
+};
+
 // Response interceptor for auth errors with auto-refresh
 api.interceptors.response.use(
   (response) => response,
@@ -87,47 +130,12 @@ api.interceptors.response.use(
     ) {
       // Check if we have a refresh token
       if (refreshToken) {
-        if (isRefreshing) {
-          // Queue the request while refreshing
-          return new Promise((resolve, reject) => {
-            failedQueue.push({ resolve, reject });
-          })
-            .then((token) => {
-              originalRequest.headers.Authorization = `Bearer ${token}`;
-              return api(originalRequest);
-            })
-            .catch((err) => Promise.reject(err));
-        }
-
         originalRequest._retry = true;
-        isRefreshing = true;
-
-        try {
-          // Try to refresh the token
-          const response = await api.post<AuthSessionResponse>('/api/auth/refresh', {
-            refresh_token: refreshToken,
-          });
-
-          const newToken = response.data.access_token;
-          setAuthSession(
-            response.data.access_token,
-            response.data.refresh_token,
-            response.data.access_token_expires_at
-          );
-
-          processQueue(null, newToken);
-
-          // Retry the original request
-          originalRequest.headers.Authorization = `Bearer ${newToken}`;
-          return api(originalRequest);
-        } catch (refreshError) {
-          processQueue(refreshError, null);
-          // Refresh failed, clear tokens
-          setAuthToken(null);
-          return Promise.reject(refreshError);
-        } finally {
-          isRefreshing = false;
-        }
+        const newToken = await refreshAuthSession();
+
+        // Retry the original request
+        originalRequest.headers.Authorization = `Bearer ${newToken}`;
+        return api(originalRequest);
       } else {
         // No refresh token, clear auth
         setAuthToken(null);
@@ -155,6 +163,20 @@ export type AccountingResponse = {
   success: boolean;
   message: string;
   record: AccountingRecord;
+  records?: AccountingRecord[];
+  feedback: string | null;
+  record_id?: string | null;
+  record_ids?: string[];
+  parse_path?: 'rule' | 'cache' | 'llm';
+  feedback_status?: FeedbackStatus;
+};
+
+export type FeedbackStatus = 'ready' | 'pending' | 'failed';
+
+export type FeedbackResponse = {
+  success: boolean;
+  record_id: string;
+  status: FeedbackStatus;
   feedback: string | null;
 };
 
@@ -263,6 +285,17 @@ export const createEntry = async (text: string): Promise<AccountingResponse> =>
   return response.data;
 };
 
+// 取得背景產生的理財回饋（wait 為 long polling 最多等待秒數）
+export const getRecordFeedback = async (
+  recordId: string,
+  wait: number = 10
+): Promise<FeedbackResponse> => {
+  const response = await api.get<FeedbackResponse>(
+    `/api/accounting/record/${encodeURIComponent(recordId)}/feedback?wait=${wait}`
+  );
+  return response.data;
+};
+
 export const generateToken = async (description?: string): Promise<TokenResponse> => {
   const response = await api.post<TokenResponse>('/api/token/generate', {
     description: description || 'Frontend generated token',
@@ -405,6 +438,84 @@ export const queryAccounting = async (query: string): Promise<{ success: boolean
   };
 };
 
+/**
+ * 串流版智慧查詢（Server-Sent Events）
+ *
+ * 每收到一段回答就呼叫 onDelta，回傳完整回答。
+ * Access Token 過期（401）時刷新後重試一次；伺服器不支援串流（404、501）時
+ * 改用一般查詢。其他錯誤直接拋出，不重送查詢（避免重複呼叫 LLM）。
+ */
+export const queryAccountingStream = async (
+  query: string,
+  onDelta: (text: string) => void,
+): Promise<{ success: boolean; answer: string }> => {
+  const send = () =>
+    fetch(`${API_BASE_URL}/api/accounting/query/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Accept: 'text/event-stream',
+        ...(authToken ? { Authorization: `Bearer ${authToken}` } : {}),
+      },
+      body: JSON.stringify({ query } as QueryRequest),
+    });
+
+  let response = await send();
+  if (response.status === 401 && refreshToken) {
+    await refreshAuthSession();
+    response = await send();
+  }
+  if (response.status === 404 || response.status === 501) {
+    return queryAccounting(query);
+  }
+  if (!response.ok) {
+    if (response.status === 401) setAuthToken(null);
+    const body = await response.json().catch(() => null);
+    throw new Error(typeof body?.detail === 'string' ? body.detail : '查詢失敗');
+  }
+  if (!response.body) {
+    return queryAccounting(query);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let answer = '';
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary >= 0) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let event = 'message';
+      let data = '';
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      if (!data) continue;
+      const payload = JSON.parse(data);
+
+      if (event === 'delta') {
+        answer += payload.text;
+        onDelta(payload.text);
+      } else if (event === 'done') {
+        return { success: true, answer: payload.response };
+      } else if (event === 'error') {
+        throw new Error(payload.message || '查詢失敗');
+      }
+    }
+  }
+
+  return { success: answer.length > 0, answer };
+};
+
 // ========================================
 // Query History API
 // ========================================
@@ -648,6 +759,7 @@ export type DashboardSummary = {
   recent_records: RecentRecord[];
   daily_trend: DailyTrend[];
   budget: BudgetStatus;
+  section_status?: Record<string, "ok" | "timeout" | "error">;
 };
 
 export type DashboardSummaryResponse = {